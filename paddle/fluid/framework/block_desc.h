@@ -97,7 +97,11 @@ class BlockDesc {
 
   void RemoveOpInternal(const OpDesc *op_desc);
 
-  void RemoveVar(const std::string &name) { vars_.erase(name); }
+  void RemoveVar(const std::string &name) {
+    if (vars_.erase(name)) {
+      ++version_;
+    }
+  }
 
   std::vector<OpDesc *> AllOps() const;
 
@@ -113,10 +117,16 @@ class BlockDesc {
 
   void MoveFrom(BlockDesc *block);
 
+  // The version is increased whenever an op or a var is added to or removed
+  // from the block, so that a mirror of the block, e.g. the Python Block,
+  // can tell whether it is still in sync without comparing all ops.
+  uint64_t Version() const { return version_; }
+
  private:
   ProgramDesc *prog_;       // not_own
   proto::BlockDesc *desc_;  // not_own
   bool need_update_;
+  uint64_t version_{0};
 
   std::deque<std::unique_ptr<OpDesc>> ops_;
   std::unordered_map<std::string, std::unique_ptr<VarDesc>> vars_;
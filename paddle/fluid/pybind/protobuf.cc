@@ -154,6 +154,7 @@ void BindBlockDesc(pybind11::module *m) {
       .def("all_vars", &pd::BlockDesc::AllVars,
            pybind11::return_value_policy::reference)
       .def("op_size", &pd::BlockDesc::OpSize)
+      .def("_version", &pd::BlockDesc::Version)
       .def("op", &pd::BlockDesc::Op, pybind11::return_value_policy::reference)
       .def("serialize_to_string", SerializeMessage<pd::BlockDesc>)
       .def("_move_from", &pd::BlockDesc::MoveFrom);
@@ -1365,6 +1365,12 @@ All parameter, weight, gradient are variables in Paddle.
            R"DOC(
            Delete all sub-scopes of the current scope.
            )DOC")
+      .def("_delete_kid",
+           [](Scope &self, Scope *kid) { self.DeleteScope(kid); },
+           py::arg("kid"),
+           R"DOC(
+           Delete the sub-scope :code:`kid` of the current scope.
+           )DOC")
       .def("_kids", &Scope::kids);
 
   m.def("Scope",
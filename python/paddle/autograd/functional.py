@@ -13,8 +13,10 @@
 # limitations under the License.
 
 import contextlib
+import numpy as np
 import paddle
 from ..fluid import framework
+from ..fluid.data_feeder import convert_dtype
 from ..fluid.dygraph import grad
 from ..tensor.creation import assign
 from ..tensor import reshape, zeros_like, to_tensor
@@ -235,16 +237,90 @@ def jvp(func, inputs, v=None, create_graph=False, allow_unused=False):
             allow_unused=allow_unused) as [xs, v, grad_fn, return_fn]:
         outputs = func(*xs)
         ys = _tensors(outputs, "outputs")
-        ys_grad = [zeros_like(y) for y in ys]
-        xs_grad = grad_fn(ys, xs, ys_grad, create_graph=True)
-        ys_grad = grad_fn(xs_grad, ys_grad, v)
+        if len(ys) == 1 and isinstance(ys[0], paddle.Tensor) and int(
+                np.prod(ys[0].shape)) == 1:
+            # The Jacobian of a single element output is one row, so the
+            # JVP is the inner product of its gradient with `v`, which
+            # takes one backward pass instead of a double backward.
+            xs_grad = grad_fn(ys, xs)
+            ys_grad = [_inner_product(xs_grad, v, ys[0].shape)]
+        else:
+            ys_grad = [zeros_like(y) for y in ys]
+            xs_grad = grad_fn(ys, xs, ys_grad, create_graph=True)
+            ys_grad = grad_fn(xs_grad, ys_grad, v)
         outputs, ys_grad = return_fn(outputs), return_fn(ys_grad)
 
     return outputs, ys_grad
 
 
+def _inner_product(xs_grad, v, shape):
+    if v is not None:
+        assert len(xs_grad) == len(v), (
+            f'The argument {v} is expected to be of the same size as the input. '
+            f'Here the input gradient is {xs_grad}, and `v` is {v}.')
+    products = []
+    for i, x_grad in enumerate(xs_grad):
+        if x_grad is None:
+            continue
+        products.append(
+            paddle.sum(x_grad if v is None else x_grad * v[i]))
+    if len(products) == 0:
+        return None
+    return reshape(paddle.add_n(products), shape=shape)
+
+
+def _vectorized_jacobian(func, inputs, outputs, create_graph, allow_unused,
+                         chunk_size):
+    # The rows of a Jacobian block are the VJPs of one-hot cotangents. They
+    # are computed by one backward pass over `func` evaluated on the inputs
+    # replicated along a new leading axis, one replica for each row.
+    jacobian = tuple()
+    for i, output in enumerate(outputs):
+        numel = int(np.prod(output.shape))
+        step = numel if chunk_size is None else chunk_size
+        jac_i = list([] for _ in range(len(inputs)))
+        for start in range(0, numel, step):
+            size = min(step, numel - start)
+            batched_inputs = [
+                paddle.expand(
+                    paddle.unsqueeze(
+                        x, axis=0), shape=[size] + x.shape) for x in inputs
+            ]
+            batched_output = _tensors(func(*batched_inputs), "outputs")[i]
+            if batched_output.shape != [size] + output.shape:
+                raise ValueError(
+                    "The function should compute each sample of a batch of "
+                    "inputs independently when vectorize=True, but the "
+                    "output with shape %s becomes %s for a batch of %d "
+                    "samples." % (output.shape, batched_output.shape, size))
+            cotangent = np.zeros(
+                [size, numel], dtype=convert_dtype(output.dtype))
+            cotangent[np.arange(size), np.arange(start, start + size)] = 1
+            rows = grad(
+                batched_output,
+                batched_inputs,
+                to_tensor(cotangent.reshape(batched_output.shape)),
+                create_graph=create_graph,
+                allow_unused=allow_unused)
+            for j in range(len(inputs)):
+                jac_i[j].append(
+                    reshape(
+                        rows[j], shape=[size, -1])
+                    if isinstance(rows[j], paddle.Tensor) else None)
+        jacobian += (tuple(
+            paddle.concat(
+                jac_i_j, axis=0) if isinstance(jac_i_j[0], paddle.Tensor) else
+            None for jac_i_j in jac_i), )
+    return jacobian
+
+
 @framework.dygraph_only
-def jacobian(func, inputs, create_graph=False, allow_unused=False):
+def jacobian(func,
+             inputs,
+             create_graph=False,
+             allow_unused=False,
+             vectorize=False,
+             chunk_size=None):
     ''' 
     .. note::
         **This API is ONLY available in the imperative mode.**
@@ -264,6 +340,17 @@ def jacobian(func, inputs, create_graph=False, allow_unused=False):
             some Tensors of `inputs` are unreachable in the graph. Error would
             be raised if allow_unused=False, and None would be returned as
             their gradients if allow_unused=True. Default False.
+        vectorize (bool, optional): whether to compute a block of rows of the
+            Jacobian matrix with one backward pass instead of one backward
+            pass for each row. It requires ``func`` to accept inputs with an
+            extra leading batch axis and to compute each sample of the batch
+            independently, e.g. built from elementwise and batched matrix
+            operations. Default False.
+        chunk_size (int, optional): the maximum number of rows computed with
+            one backward pass when ``vectorize`` is True. It bounds the memory
+            used by the batched inputs, which is ``chunk_size`` times of the
+            memory of ``inputs``. Default None, which computes all rows of an
+            output with one backward pass.
     Returns:
         Jacobian (Tensor or nested tuple of Tensors): if function ``func``
         takes a Tensor as inputs and returns a Tensor as outputs, Jacobian
@@ -353,28 +440,37 @@ def jacobian(func, inputs, create_graph=False, allow_unused=False):
             #         [0., 0., 0., 2.]]), None))
 
     '''
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError("chunk_size should be a positive integer, but "
+                         "received %s." % chunk_size)
     inputs = _tensors(inputs, "inputs")
     outputs = _tensors(func(*inputs), "outputs")
     fin_size = len(inputs)
     fout_size = len(outputs)
-    flat_outputs = tuple(reshape(output, shape=[-1]) for output in outputs)
-    jacobian = tuple()
-    for i, flat_output in enumerate(flat_outputs):
-        jac_i = list([] for _ in range(fin_size))
-        for k in range(len(flat_output)):
-            row_k = grad(
-                flat_output[k],
-                inputs,
-                create_graph=create_graph,
-                retain_graph=True,
-                allow_unused=allow_unused)
-            for j in range(fin_size):
-                jac_i[j].append(
-                    reshape(
-                        row_k[j], shape=[-1])
-                    if isinstance(row_k[j], paddle.Tensor) else None)
-        jacobian += (tuple(
-            _stack_tensor_or_return_none(jac_i_j) for jac_i_j in jac_i), )
+    if vectorize:
+        jacobian = _vectorized_jacobian(func, inputs, outputs, create_graph,
+                                        allow_unused, chunk_size)
+    else:
+        flat_outputs = tuple(
+            reshape(
+                output, shape=[-1]) for output in outputs)
+        jacobian = tuple()
+        for i, flat_output in enumerate(flat_outputs):
+            jac_i = list([] for _ in range(fin_size))
+            for k in range(len(flat_output)):
+                row_k = grad(
+                    flat_output[k],
+                    inputs,
+                    create_graph=create_graph,
+                    retain_graph=True,
+                    allow_unused=allow_unused)
+                for j in range(fin_size):
+                    jac_i[j].append(
+                        reshape(
+                            row_k[j], shape=[-1])
+                        if isinstance(row_k[j], paddle.Tensor) else None)
+            jacobian += (tuple(
+                _stack_tensor_or_return_none(jac_i_j) for jac_i_j in jac_i), )
     if fin_size == 1 and fout_size == 1:
         return jacobian[0][0]
     elif fin_size == 1 and fout_size != 1:
@@ -386,7 +482,12 @@ def jacobian(func, inputs, create_graph=False, allow_unused=False):
 
 
 @framework.dygraph_only
-def hessian(func, inputs, create_graph=False, allow_unused=False):
+def hessian(func,
+            inputs,
+            create_graph=False,
+            allow_unused=False,
+            vectorize=False,
+            chunk_size=None):
     ''' 
     .. note::
         **This API is ONLY available in the imperative mode.**
@@ -406,6 +507,12 @@ def hessian(func, inputs, create_graph=False, allow_unused=False):
             some Tensors of `inputs` are unreachable in the graph. Error would
             be raised if allow_unused=False, and None would be returned as
             their gradients if allow_unused=True. Default False.
+        vectorize (bool, optional): whether to compute a block of rows of the
+            Hessian matrix with one backward pass, see ``jacobian``. For a
+            batch of inputs, ``func`` should return a Tensor with the shape
+            of ``[batch_size]`` or ``[batch_size, 1]``. Default False.
+        chunk_size (int, optional): the maximum number of rows computed with
+            one backward pass when ``vectorize`` is True. Default None.
     Returns:
         Hessian (Tensor or a tuple of tuple of Tensors): if function ``func``
         takes a Tensor as ``inputs``, Hessian will be a single Tensor containing
@@ -497,18 +604,25 @@ def hessian(func, inputs, create_graph=False, allow_unused=False):
     ], "The function to compute Hessian matrix should return a Tensor with a single element"
 
     def jac_func(*ins):
+        # The vectorized jacobian calls jac_func on batched inputs, where the
+        # gradients of the summed outputs are the gradients of each sample.
         grad_inputs = grad(
-            outputs,
+            func(*ins) if vectorize else outputs,
             ins,
             create_graph=True,
             retain_graph=True,
             allow_unused=allow_unused)
         return tuple(
-            _replace_none_with_zero_tensor(grad_inputs[i], inputs[i])
-            for i in range(len(inputs)))
+            _replace_none_with_zero_tensor(grad_inputs[i], ins[i])
+            for i in range(len(ins)))
 
     return jacobian(
-        jac_func, inputs, create_graph=create_graph, allow_unused=allow_unused)
+        jac_func,
+        inputs,
+        create_graph=create_graph,
+        allow_unused=allow_unused,
+        vectorize=vectorize,
+        chunk_size=chunk_size)
 
 
 @framework.dygraph_only
@@ -12,11 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+
 import paddle
 from paddle.fluid.framework import dygraph_only
 from paddle.fluid import core
 __all__ = []
 
+# the (pack_hook, unpack_hook) pairs applied to the tensors saved for backward
+_saved_tensors_hooks_stack = []
+
+
+@contextlib.contextmanager
+def _saved_tensors_hooks(pack_hook, unpack_hook):
+    """
+    Inside this context, each tensor passed to ``save_for_backward`` is
+    replaced by ``pack_hook(tensor)``, and ``saved_tensor`` returns
+    ``unpack_hook(packed)`` for it. The innermost hooks are applied.
+    """
+    _saved_tensors_hooks_stack.append((pack_hook, unpack_hook))
+    try:
+        yield
+    finally:
+        _saved_tensors_hooks_stack.pop()
+
 
 class PyLayerContext(object):
     """
@@ -83,7 +102,16 @@ class PyLayerContext(object):
                         return grad
 
         """
-        self.container = tensors
+        if not _saved_tensors_hooks_stack:
+            self.container = tensors
+            return
+
+        pack_hook, unpack_hook = _saved_tensors_hooks_stack[-1]
+        self._unpack_hook = unpack_hook
+        self._packed = tuple(isinstance(t, core.VarBase) for t in tensors)
+        self.container = tuple(
+            pack_hook(t) if packed else t
+            for t, packed in zip(tensors, self._packed))
 
     def saved_tensor(self):
         """
@@ -116,7 +144,12 @@ class PyLayerContext(object):
                         return grad
         """
 
-        return self.container
+        unpack_hook = getattr(self, '_unpack_hook', None)
+        if unpack_hook is None:
+            return self.container
+        return tuple(
+            unpack_hook(t) if packed else t
+            for t, packed in zip(self.container, self._packed))
 
 
 def with_mateclass(meta, *bases):
@@ -16,10 +16,13 @@ from .fs import LocalFS  # noqa: F401
 from .fs import HDFSClient  # noqa: F401
 from .ps_util import DistributedInfer  # noqa: F401
 from .recompute import recompute  # noqa: F401
+from .recompute_planner import plan_recompute  # noqa: F401
+from .activation_offload import offload_activations  # noqa: F401
 
 from . import log_util  # noqa: F401
 from . import hybrid_parallel_util  # noqa: F401
 
 __all__ = [  #noqa
-    "LocalFS", "recompute", "DistributedInfer", "HDFSClient"
+    "LocalFS", "recompute", "plan_recompute", "offload_activations",
+    "DistributedInfer", "HDFSClient"
 ]
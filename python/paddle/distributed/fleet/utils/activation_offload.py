@@ -0,0 +1,142 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+
+import paddle
+from paddle.fluid import core
+from paddle.fluid.data_feeder import check_type
+from paddle.autograd.py_layer import _saved_tensors_hooks
+from .recompute_planner import _nbytes
+
+__all__ = []
+
+
+def _host_place(place):
+    # pinned memory makes the copies between host and device asynchronous
+    if place.is_gpu_place():
+        return core.CUDAPinnedPlace()
+    if place.is_cpu_place() or place.is_cuda_pinned_place():
+        return None
+    return core.CPUPlace()
+
+
+class _OffloadedTensor(object):
+    def __init__(self, index, tensor):
+        self.index = index
+        self.place = tensor.place
+        self.stop_gradient = tensor.stop_gradient
+        self.host = None
+        self.device = None
+
+
+class ActivationOffloader(object):
+    """
+    Offloads the tensors saved for backward to host memory, and prefetches
+    them back to device in the reverse order of saving, with at most
+    `prefetch_window` tensors copied back ahead of use.
+    """
+
+    def __init__(self, prefetch_window=2, min_bytes=0):
+        self.prefetch_window = prefetch_window
+        self.min_bytes = min_bytes
+        self.offloaded_bytes = 0
+        # the tensors not copied back yet, in the order of saving
+        self._offloaded = []
+        self._in_flight = set()
+        self._cursor = -1
+
+    def pack(self, tensor):
+        host_place = _host_place(tensor.place)
+        if host_place is None or _nbytes(tensor) < self.min_bytes:
+            return tensor
+        handle = _OffloadedTensor(len(self._offloaded), tensor)
+        handle.host = tensor._copy_to(host_place, False)
+        self._offloaded.append(handle)
+        self._cursor = handle.index
+        self.offloaded_bytes += _nbytes(tensor)
+        return handle
+
+    def _load(self, handle, blocking):
+        handle.device = handle.host._copy_to(handle.place, blocking)
+        handle.device.stop_gradient = handle.stop_gradient
+        handle.host = None
+        self._offloaded[handle.index] = None
+
+    def unpack(self, handle):
+        if not isinstance(handle, _OffloadedTensor):
+            return handle
+        if handle.device is None:
+            self._load(handle, True)
+        self._in_flight.discard(handle.index)
+
+        # backward uses the saved tensors in the reverse order of forward
+        self._cursor = min(self._cursor, handle.index - 1)
+        while len(self._in_flight) < self.prefetch_window and \
+                self._cursor >= 0:
+            prefetched = self._offloaded[self._cursor]
+            if prefetched is not None:
+                self._load(prefetched, False)
+                self._in_flight.add(self._cursor)
+            self._cursor -= 1
+        return handle.device
+
+
+@contextlib.contextmanager
+def offload_activations(prefetch_window=2, min_bytes=0):
+    """
+    Inside this context, the tensors saved for backward by PyLayer, including
+    the inputs of `recompute`, are offloaded to host memory asynchronously in
+    forward. In backward, they are prefetched back to device in the reverse
+    order of forward, where at most `prefetch_window` tensors are copied ahead
+    of use to overlap the copies with computation. Tensors already in host
+    memory, as in CPU training, are kept as is.
+
+    Tensors saved by the operators inside a PyLayer are not offloaded, so the
+    layers to offload should be run by `recompute`, which keeps only its
+    inputs for backward.
+
+    Args:
+        prefetch_window(int, optional): the most tensors prefetched to device
+            before used in backward. Default 2.
+        min_bytes(int, optional): tensors smaller than this are kept on
+            device. Default 0.
+
+    Returns:
+        ActivationOffloader: the offloader, whose `offloaded_bytes` is the
+            bytes of tensors offloaded.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+            from paddle.distributed.fleet.utils import recompute, offload_activations
+
+            blocks = [paddle.nn.Linear(10, 10) for _ in range(4)]
+            x = paddle.randn([4, 10])
+            x.stop_gradient = False
+            with offload_activations(prefetch_window=2):
+                y = x
+                for block in blocks:
+                    y = recompute(block, y, preserve_rng_state=False)
+            paddle.mean(y).backward()
+    """
+    check_type(prefetch_window, 'prefetch_window', int, 'offload_activations')
+    if prefetch_window < 0:
+        raise ValueError(
+            "prefetch_window should be non-negative, but received {}.".format(
+                prefetch_window))
+    offloader = ActivationOffloader(prefetch_window, min_bytes)
+    with _saved_tensors_hooks(offloader.pack, offloader.unpack):
+        yield offloader
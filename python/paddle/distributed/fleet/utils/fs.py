@@ -20,6 +20,8 @@ from datetime import datetime
 
 import re
 import copy
+import json
+import threading
 import errno
 import time
 import logging
@@ -1145,3 +1147,332 @@ class HDFSClient(FS):
             file_list.append({'path': file_path, 'size': file_size})
 
         return file_list
+
+
+class HDFSSessionClient(HDFSClient):
+    """
+    A tool of HDFS which runs all the commands over one long-lived helper
+    process instead of starting a `hadoop fs` process per call, and caches
+    the listed metadata for `meta_ttl` seconds.
+
+    The helper is not shipped with Paddle and has to be provided by the
+    user, typically a small program keeping one hadoop FileSystem client
+    alive. It is started by `helper_cmd` and must follow this protocol: it
+    reads one json request `{"cmd": ..., "redirect_stderr": ...}` per line
+    from its stdin, runs the `hadoop fs` shell command in "cmd" (e.g.
+    "ls /user") and writes one json response `{"ret": ..., "out": [...]}`
+    per line to its stdout, where "ret" is the exit code of the command and
+    "out" its output lines, in the order of requests, so that many commands
+    can be pipelined. Failed commands are retried as `HDFSClient` does,
+    waiting `sleep_inter` between retries. Without `helper_cmd`, commands
+    are run as `HDFSClient` does, but still benefit from the metadata cache.
+
+    Args:
+        hadoop_home(str): Hadoop home.
+        configs(dict): Hadoop config. It is a dictionary and needs to contain the
+            keys: "fs.default.name" and "hadoop.job.ugi".
+        helper_cmd(str|list, optional): The command to start the helper process.
+            Default is None.
+        meta_ttl(float, optional): Seconds the metadata of a listed directory
+            is cached. Changes made by other clients may be invisible within
+            it. Default is 10.
+
+    Examples:
+
+        .. code-block:: text
+
+            from paddle.distributed.fleet.utils.fs import HDFSSessionClient
+            hadoop_home = "/home/client/hadoop-client/hadoop/"
+
+            configs = {
+                "fs.default.name": "hdfs://xxx.hadoop.com:54310",
+                "hadoop.job.ugi": "hello,hello123"
+            }
+
+            # a user provided helper following the protocol above
+            client = HDFSSessionClient(hadoop_home, configs,
+                                       helper_cmd="./my_hdfs_helper")
+            client.ls_dir("hdfs:/test_hdfs_client")
+            client.close()
+    """
+
+    def __init__(
+            self,
+            hadoop_home,
+            configs,
+            time_out=5 * 60 * 1000,  # ms
+            sleep_inter=1000,  # ms
+            helper_cmd=None,
+            meta_ttl=10.0):
+        super(HDFSSessionClient, self).__init__(hadoop_home, configs, time_out,
+                                                sleep_inter)
+        self._helper_cmd = helper_cmd
+        self._helper = None
+        self._helper_pid = None
+        self._helper_lock = threading.Lock()
+
+        self._meta_ttl = meta_ttl
+        self._meta_lock = threading.Lock()
+        # path -> (time, dirs, files) of the listed directories
+        self._listing_cache = {}
+
+    def _get_helper(self):
+        # a forked process can't share the pipes of its parent
+        if self._helper is not None and self._helper_pid == os.getpid() and \
+                self._helper.poll() is None:
+            return self._helper
+
+        self._helper = subprocess.Popen(
+            self._helper_cmd,
+            shell=isinstance(self._helper_cmd, str),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            universal_newlines=True)
+        self._helper_pid = os.getpid()
+        return self._helper
+
+    def close(self):
+        """
+        Stop the helper process.
+        """
+        with self._helper_lock:
+            if self._helper is not None and self._helper_pid == os.getpid():
+                try:
+                    self._helper.stdin.close()
+                    self._helper.wait()
+                except (IOError, OSError):
+                    self._helper.kill()
+            self._helper = None
+
+    def _run_cmds(self, cmds, redirect_stderr=False, retry_times=5):
+        """
+        Run cmds pipelined over the helper, return a list of (ret, lines).
+        """
+        if self._helper_cmd is None:
+            return [
+                super(HDFSSessionClient, self)._run_cmd(cmd, redirect_stderr,
+                                                        retry_times)
+                for cmd in cmds
+            ]
+
+        results = self._send_cmds(cmds, redirect_stderr)
+        for _ in range(retry_times):
+            failed = [i for i, (ret, _) in enumerate(results) if ret != 0]
+            if not failed:
+                break
+            time.sleep(self._sleep_inter / 1000.0)
+            retried = self._send_cmds([cmds[i] for i in failed],
+                                      redirect_stderr)
+            for i, result in zip(failed, retried):
+                results[i] = result
+
+        for cmd, (ret, _) in zip(cmds, results):
+            if ret == 134:
+                raise FSShellCmdAborted(cmd)
+        return results
+
+    def _send_cmds(self, cmds, redirect_stderr):
+        with self._helper_lock:
+            helper = self._get_helper()
+            try:
+                for cmd in cmds:
+                    helper.stdin.write(
+                        json.dumps({
+                            "cmd": cmd,
+                            "redirect_stderr": redirect_stderr
+                        }) + "\n")
+                helper.stdin.flush()
+
+                results = []
+                for cmd in cmds:
+                    line = helper.stdout.readline()
+                    if not line:
+                        raise IOError("helper exited")
+                    r = json.loads(line)
+                    results.append((int(r["ret"]), r["out"]))
+            except (IOError, OSError, ValueError) as e:
+                helper.kill()
+                self._helper = None
+                raise ExecuteError("{} {}".format(cmds, e))
+        return results
+
+    def _run_cmd(self, cmd, redirect_stderr=False, retry_times=5):
+        return self._run_cmds([cmd], redirect_stderr, retry_times)[0]
+
+    def _norm(self, fs_path):
+        return fs_path.rstrip("/") or "/"
+
+    def _cache_listing(self, fs_path, dirs, files):
+        with self._meta_lock:
+            self._listing_cache[self._norm(fs_path)] = (time.time(), dirs,
+                                                        files)
+
+    def _cached_listing(self, fs_path):
+        with self._meta_lock:
+            item = self._listing_cache.get(self._norm(fs_path))
+        if item is None or time.time() - item[0] > self._meta_ttl:
+            return None
+        return item[1], item[2]
+
+    def _invalidate(self, *fs_paths):
+        with self._meta_lock:
+            for fs_path in fs_paths:
+                fs_path = self._norm(fs_path)
+                # drop the path, its descendants and its ancestors, since
+                # e.g. `mkdir -p` may create the missing ancestors
+                for k in list(self._listing_cache.keys()):
+                    if k == fs_path or k.startswith(fs_path + "/") or \
+                            fs_path.startswith(k.rstrip("/") + "/"):
+                        del self._listing_cache[k]
+
+    def _lookup(self, fs_path):
+        """
+        Return 'd', 'f' or 'n' (not exists) from the cached metadata, or
+        None if unknown.
+        """
+        if self._cached_listing(fs_path) is not None:
+            return 'd'
+
+        fs_path = self._norm(fs_path)
+        if "/" not in fs_path:
+            return None
+        parent, name = fs_path.rsplit("/", 1)
+        listing = self._cached_listing(parent or "/")
+        if listing is None:
+            return None
+        dirs, files = listing
+        if name in dirs:
+            return 'd'
+        if name in files:
+            return 'f'
+        return 'n'
+
+    def _parse_ls(self, fs_path, lines):
+        """
+        Return (is_dir, dirs, files) from the output of `ls fs_path`.
+        """
+        entries = []
+        for line in lines:
+            arr = line.split()
+            if len(arr) != 8:
+                continue
+            entries.append((arr[0][0] == 'd', arr[7]))
+
+        if len(entries) == 1 and not entries[0][0] and \
+                self._norm(entries[0][1]) == self._norm(fs_path):
+            return False, [], []
+
+        dirs = [os.path.basename(p) for is_dir, p in entries if is_dir]
+        files = [os.path.basename(p) for is_dir, p in entries if not is_dir]
+        return True, dirs, files
+
+    def _handle_exist_result(self, fs_path, cmd, ret, out):
+        if ret != 0:
+            for l in out:
+                if "No such file or directory" in l:
+                    return False
+            raise ExecuteError(cmd)
+
+        is_dir, dirs, files = self._parse_ls(fs_path, out)
+        if is_dir:
+            self._cache_listing(fs_path, dirs, files)
+        return True
+
+    @_handle_errors()
+    def is_exist(self, fs_path):
+        """
+        Whether the remote HDFS path exists, answered from the cached
+        metadata when possible.
+
+        Args:
+            fs_path(str): The hdfs file path.
+
+        Returns:
+            Bool: Whether it's is file or directory, return true if the path exists,
+            otherwise return false.
+        """
+        t = self._lookup(fs_path)
+        if t is not None:
+            return t != 'n'
+
+        cmd = "ls {} ".format(fs_path)
+        ret, out = self._run_cmd(cmd, redirect_stderr=True)
+        return self._handle_exist_result(fs_path, cmd, ret, out)
+
+    @_handle_errors()
+    def batch_is_exist(self, fs_paths):
+        """
+        Whether the remote HDFS paths exist, the unknown ones are queried
+        pipelined in one batch.
+
+        Args:
+            fs_paths(list): The hdfs file paths.
+
+        Returns:
+            List: A list of bool.
+        """
+        results = [self._lookup(p) for p in fs_paths]
+        unknown = [p for p, t in zip(fs_paths, results) if t is None]
+        cmds = ["ls {} ".format(p) for p in unknown]
+        outs = dict(
+            zip(unknown, zip(cmds, self._run_cmds(
+                cmds, redirect_stderr=True)))) if cmds else {}
+
+        exists = []
+        for p, t in zip(fs_paths, results):
+            if t is not None:
+                exists.append(t != 'n')
+            else:
+                cmd, (ret, out) = outs[p]
+                exists.append(self._handle_exist_result(p, cmd, ret, out))
+        return exists
+
+    def _ls_dir(self, fs_path):
+        listing = self._cached_listing(fs_path)
+        if listing is not None:
+            return list(listing[0]), list(listing[1])
+
+        dirs, files = super(HDFSSessionClient, self)._ls_dir(fs_path)
+        self._cache_listing(fs_path, dirs, files)
+        return list(dirs), list(files)
+
+    def _is_dir(self, fs_path):
+        t = self._lookup(fs_path)
+        if t in ('d', 'f'):
+            return t == 'd'
+        return super(HDFSSessionClient, self)._is_dir(fs_path)
+
+    def upload_dir(self, local_dir, dest_dir, overwrite=False):
+        self._invalidate(dest_dir)
+        super(HDFSSessionClient, self).upload_dir(local_dir, dest_dir,
+                                                  overwrite)
+        self._invalidate(dest_dir)
+
+    def upload(self, local_path, fs_path, multi_processes=1, overwrite=False):
+        self._invalidate(fs_path)
+        super(HDFSSessionClient, self).upload(local_path, fs_path,
+                                              multi_processes, overwrite)
+        self._invalidate(fs_path)
+
+    def mkdirs(self, fs_path):
+        super(HDFSSessionClient, self).mkdirs(fs_path)
+        self._invalidate(fs_path)
+
+    def mv(self, fs_src_path, fs_dst_path, overwrite=False, test_exists=True):
+        try:
+            return super(HDFSSessionClient, self).mv(
+                fs_src_path, fs_dst_path, overwrite, test_exists)
+        finally:
+            self._invalidate(fs_src_path, fs_dst_path)
+
+    def delete(self, fs_path):
+        try:
+            return super(HDFSSessionClient, self).delete(fs_path)
+        finally:
+            self._invalidate(fs_path)
+
+    def touch(self, fs_path, exist_ok=True):
+        try:
+            return super(HDFSSessionClient, self).touch(fs_path, exist_ok)
+        finally:
+            self._invalidate(fs_path)
@@ -20,41 +20,60 @@ from paddle import framework
 import paddle
 from paddle.fluid import core
 from paddle.fluid.dygraph.parallel import _split_tensors, sync_params_buffers, build_groups
+from paddle.fluid.dygraph.layers import _FlatParameterStorage
 from collections import OrderedDict
 from .log_util import logger
 
 __all__ = []
 
 
+def _all_reduce_coalesced_grad(coalesced_grad, comm_group):
+    # need to div nranks
+    nranks = paddle.distributed.get_world_size(
+    ) if comm_group is None else comm_group.nranks
+    div_factor = paddle.to_tensor(nranks, dtype=coalesced_grad.dtype)
+    paddle.fluid.framework._dygraph_tracer().trace_op(
+        type="elementwise_div",
+        inputs={'X': coalesced_grad,
+                'Y': div_factor},
+        outputs={'Out': coalesced_grad},
+        attrs={'axis': -1})
+
+    paddle.distributed.all_reduce(coalesced_grad, group=comm_group)
+
+
 def _apply_collective_grads(parameters, comm_group):
     grad_var_set = set()
     grad_vars = []
     sparse_grad_vars = []
 
+    # The gradients of the parameters flattened by Layer.flatten_parameters
+    # are views of one contiguous tensor, which is all-reduced in place
+    # without coalescing and splitting while they are still its views.
+    parameters = [
+        param for param in parameters
+        if param.trainable and (param._grad_ivar() is not None)
+    ]
+    flat_storages, parameters = _FlatParameterStorage.split(
+        parameters, [param._grad_ivar() for param in parameters])
+    for storage in flat_storages:
+        _all_reduce_coalesced_grad(storage.flat_grad, comm_group)
+
     for param in parameters:
-        if param.trainable and (param._grad_ivar() is not None):
-            g_var = param._grad_ivar()
-            assert not g_var._is_sparse(
-            ), "Now, it doesn't support sparse parameters"
-            grad_vars.append(g_var)
-            assert g_var not in grad_var_set
-            grad_var_set.add(g_var)
+        g_var = param._grad_ivar()
+        assert not g_var._is_sparse(
+        ), "Now, it doesn't support sparse parameters"
+        grad_vars.append(g_var)
+        assert g_var not in grad_var_set
+        grad_var_set.add(g_var)
+
+    if len(grad_vars) == 0:
+        return
 
     coalesced_grads_and_vars = build_groups(grad_vars, 128 * 1024 * 1024)
 
     for coalesced_grad, _, _ in coalesced_grads_and_vars:
-        # need to div nranks
-        nranks = paddle.distributed.get_world_size(
-        ) if comm_group is None else comm_group.nranks
-        div_factor = paddle.to_tensor(nranks, dtype=coalesced_grad.dtype)
-        paddle.fluid.framework._dygraph_tracer().trace_op(
-            type="elementwise_div",
-            inputs={'X': coalesced_grad,
-                    'Y': div_factor},
-            outputs={'Out': coalesced_grad},
-            attrs={'axis': -1})
-
-        paddle.distributed.all_reduce(coalesced_grad, group=comm_group)
+        _all_reduce_coalesced_grad(coalesced_grad, comm_group)
 
     _split_tensors(coalesced_grads_and_vars)
 
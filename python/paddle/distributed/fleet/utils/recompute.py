@@ -62,12 +62,13 @@ def swith_rng_state(rng_state):
 
 class RecomputeFunction(PyLayer):
     @staticmethod
-    def forward(ctx, run_function, preserve_rng_state, *args):
+    def forward(ctx, run_function, preserve_rng_state, offload, *args):
         check_recompute_necessary(args)
 
         # store for recomputing 
         ctx.run_function = run_function
         ctx.preserve_rng_state = preserve_rng_state
+        ctx.offload = offload
 
         # NOTE the number of outputs of backward() should be equal to the number of tensors in forward()'s input
         # the order of tensors in backward()'s output should be the same as tensors in forward()'s input
@@ -76,9 +77,15 @@ class RecomputeFunction(PyLayer):
         # save input for backward
         ctx.inputs = []
         ctx.tensor_indices = []
+        ctx.tensor_places = []
         tensor_inputs = []
         for i, arg in enumerate(args):
             if paddle.is_tensor(arg):
+                ctx.tensor_places.append(arg.place)
+                if offload:
+                    state = arg.stop_gradient
+                    arg = arg.cpu()
+                    arg.stop_gradient = state
                 tensor_inputs.append(arg)
                 ctx.tensor_indices.append(i)
                 ctx.inputs.append(None)
@@ -120,8 +127,13 @@ class RecomputeFunction(PyLayer):
             # Restore inputs
             inputs = list(ctx.inputs)
             tensor_indices = ctx.tensor_indices
-            tensors = ctx.saved_tensor()
+            tensors = list(ctx.saved_tensor())
             for i, idx in enumerate(tensor_indices):
+                if ctx.offload:
+                    state = tensors[i].stop_gradient
+                    tensors[i] = tensors[i]._copy_to(ctx.tensor_places[i],
+                                                     True)
+                    tensors[i].stop_gradient = state
                 inputs[idx] = tensors[i]
 
             # paddle.enable_grad()
@@ -188,6 +200,7 @@ def recompute(function, *args, **kwargs):
         intermediate activations will be released to save memory in forward stage and will be recomputed 
         in backward stage for gradient calculation.
         preserve_rng_state(bool, optional):  if preserve the RNG state of forward and restore it in backward. 
+        offload(bool, optional): if store the tensor inputs in host memory between forward and backward. Default False.
         args: inputs to the function
 
     Returns:
@@ -195,8 +208,9 @@ def recompute(function, *args, **kwargs):
     """
     # Hack to mix *args with **kwargs in a python 2.7-compliant way
     preserve = kwargs.pop('preserve_rng_state', True)
+    offload = kwargs.pop('offload', False)
     if kwargs:
         raise ValueError("Unexpected keyword arguments: " + ",".join(
             arg for arg in kwargs))
 
-    return RecomputeFunction.apply(function, preserve, *args)
+    return RecomputeFunction.apply(function, preserve, offload, *args)
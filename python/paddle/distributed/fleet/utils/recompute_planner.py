@@ -0,0 +1,349 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import contextlib
+import time
+
+import numpy as np
+
+import paddle
+from paddle.fluid import framework
+from paddle.fluid.data_feeder import convert_dtype
+from paddle.fluid.layers.utils import flatten
+from paddle.nn import Layer, Dropout, Dropout2D, Dropout3D, AlphaDropout
+from .recompute import recompute, logger
+
+__all__ = []
+
+KEEP = 'keep'
+RECOMPUTE = 'recompute'
+OFFLOAD = 'offload'
+
+# the layers whose outputs depend on the RNG state
+_RANDOM_LAYERS = (Dropout, Dropout2D, Dropout3D, AlphaDropout)
+
+# the number of plans kept for each prefix of layers in planning
+_MAX_FRONT = 256
+
+_LayerProfile = collections.namedtuple(
+    "_LayerProfile", ["input_bytes", "activation_bytes", "forward_time",
+                      "input_requires_grad", "is_random"])
+
+
+def _nbytes(x):
+    return sum(
+        int(np.prod(t.shape)) * np.dtype(convert_dtype(t.dtype)).itemsize
+        for t in flatten(x) if paddle.is_tensor(t))
+
+
+def _synchronize():
+    if 'gpu:' in paddle.get_device():
+        paddle.device.cuda.synchronize()
+
+
+def _requires_grad(x):
+    return any(not t.stop_gradient for t in flatten(x) if paddle.is_tensor(t))
+
+
+@contextlib.contextmanager
+def _eval_mode(layers):
+    # Profiles in eval mode, so that the running statistics of BatchNorm are
+    # not updated and dropout does not advance the RNG state.
+    tracer = framework._dygraph_tracer()
+    train_mode = tracer._train_mode
+    training = [(sublayer, sublayer.training)
+                for layer in layers
+                for sublayer in layer.sublayers(include_self=True)]
+    for layer in layers:
+        layer.eval()
+    try:
+        yield
+    finally:
+        for sublayer, flag in training:
+            sublayer.training = flag
+        tracer._train_mode = train_mode
+
+
+def _profile_layers(layers, x):
+    # The activations kept for backward are estimated by the outputs of all
+    # leaf layers, as most operators keep their inputs for gradients.
+    with _eval_mode(layers):
+        return _profile_layers_impl(layers, x)
+
+
+def _profile_layers_impl(layers, x):
+    profiles = []
+    for layer in layers:
+        leaves = [
+            sublayer for sublayer in layer.sublayers(include_self=True)
+            if len(sublayer.sublayers()) == 0
+        ]
+        activation_bytes = [0]
+
+        def _hook(sublayer, inputs, outputs):
+            activation_bytes[0] += _nbytes(outputs)
+
+        helpers = [leaf.register_forward_post_hook(_hook) for leaf in leaves]
+        _synchronize()
+        begin = time.time()
+        y = layer(x)
+        _synchronize()
+        forward_time = time.time() - begin
+        for helper in helpers:
+            helper.remove()
+
+        profiles.append(
+            _LayerProfile(
+                input_bytes=_nbytes(x),
+                activation_bytes=max(activation_bytes[0], _nbytes(y)),
+                forward_time=forward_time,
+                input_requires_grad=_requires_grad(x),
+                is_random=any(
+                    isinstance(leaf, _RANDOM_LAYERS) for leaf in leaves)))
+        x = y
+    return profiles
+
+
+def _copy_time_per_byte(x):
+    # the time to copy a tensor to host memory and back
+    x = [t for t in flatten(x) if paddle.is_tensor(t)][0]
+    _synchronize()
+    begin = time.time()
+    x.cpu()._copy_to(x.place, True)
+    _synchronize()
+    return (time.time() - begin) / max(_nbytes(x), 1)
+
+
+def _solve(profiles, memory_budget, max_transient, offload, copy_time):
+    # Minimizes the recompute time with a dynamic programming over layers,
+    # keeping the plans of each prefix on the Pareto front of the memory kept
+    # through forward and backward and the recompute time. Segments recomputed
+    # are limited to `max_transient` bytes of activations, which are allocated
+    # again while recomputing in backward.
+    num_layers = len(profiles)
+    budget = memory_budget - max_transient
+    if budget < 0:
+        return None
+    preserve_rng = 'gpu:' in paddle.get_device()
+
+    # fronts[i] holds (memory, time, previous plan, segment) of layers[:i]
+    fronts = [[(0, 0., None, None)]]
+    for end in range(1, num_layers + 1):
+        candidates = [(end - 1, KEEP, profiles[end - 1].activation_bytes, 0.)]
+        activation_bytes, forward_time = 0, 0.
+        for start in reversed(range(end)):
+            profile = profiles[start]
+            activation_bytes += profile.activation_bytes
+            forward_time += profile.forward_time
+            if profile.is_random and not preserve_rng:
+                break
+            if activation_bytes > max_transient:
+                break
+            # PyLayer outputs need grad only if its inputs need grad
+            if not profile.input_requires_grad:
+                continue
+            candidates.append(
+                (start, RECOMPUTE, profile.input_bytes, forward_time))
+            if offload:
+                candidates.append((start, OFFLOAD, 0, forward_time +
+                                   copy_time * profile.input_bytes))
+
+        plans = sorted(
+            (plan[0] + memory, plan[1] + time_cost, plan,
+             (start, end, strategy))
+            for start, strategy, memory, time_cost in candidates
+            for plan in fronts[start] if plan[0] + memory <= budget)
+        front = []
+        for plan in plans:
+            if not front or plan[1] < front[-1][1]:
+                front.append(plan)
+        if len(front) > _MAX_FRONT:
+            index = np.linspace(0, len(front) - 1, _MAX_FRONT).astype('int64')
+            front = [front[i] for i in index]
+        fronts.append(front)
+
+    if not fronts[-1]:
+        return None
+    plan = min(fronts[-1], key=lambda plan: plan[1])
+    segments = []
+    while plan[3] is not None:
+        segments.append(plan[3])
+        plan = plan[2]
+
+    merged_segments = []
+    for start, end, strategy in reversed(segments):
+        if strategy == KEEP and merged_segments and \
+                merged_segments[-1][2] == KEEP:
+            start = merged_segments.pop()[0]
+        merged_segments.append((start, end, strategy))
+    return merged_segments
+
+
+def _estimate(profiles, segments, copy_time):
+    peak_memory, transient, recompute_time = 0, 0, 0.
+    for start, end, strategy in segments:
+        activation_bytes = sum(p.activation_bytes
+                               for p in profiles[start:end])
+        forward_time = sum(p.forward_time for p in profiles[start:end])
+        if strategy == KEEP:
+            peak_memory += activation_bytes
+            continue
+        transient = max(transient, activation_bytes)
+        recompute_time += forward_time
+        if strategy == RECOMPUTE:
+            peak_memory += profiles[start].input_bytes
+        else:
+            recompute_time += copy_time * profiles[start].input_bytes
+    return peak_memory + transient, recompute_time
+
+
+class RecomputePlan(Layer):
+    """
+    Runs a sequence of layers as segments planned by `plan_recompute`, where
+    each segment is run as is, recomputed in backward, or recomputed in
+    backward with its inputs offloaded to host memory.
+    """
+
+    def __init__(self, layers, segments, peak_memory, step_time):
+        super(RecomputePlan, self).__init__()
+        self.layers = layers
+        self.segments = segments
+        self.peak_memory = peak_memory
+        self.step_time = step_time
+        children = list(layers.children())
+        # the RNG state is only preserved for segments using it
+        self._random_segments = [
+            'gpu:' in paddle.get_device() and any(
+                isinstance(sublayer, _RANDOM_LAYERS)
+                for layer in children[start:end]
+                for sublayer in layer.sublayers(include_self=True))
+            for start, end, _ in segments
+        ]
+
+    def _run_function(self, start, end):
+        layers = list(self.layers.children())[start:end]
+
+        def _run(x):
+            for layer in layers:
+                x = layer(x)
+            return x
+
+        return _run
+
+    def forward(self, x):
+        for (start, end, strategy), is_random in zip(self.segments,
+                                                     self._random_segments):
+            function = self._run_function(start, end)
+            # the outputs of recompute need no grad if its inputs need no
+            # grad, and the parameters of the segment would get no gradients
+            if strategy == KEEP or not self.training or \
+                    not _requires_grad(x):
+                x = function(x)
+            else:
+                x = recompute(
+                    function,
+                    x,
+                    preserve_rng_state=is_random,
+                    offload=strategy == OFFLOAD)
+        return x
+
+    def report(self):
+        """
+        Returns:
+            dict: The segments, the estimated peak memory in bytes of the
+                activations kept for backward, and the estimated time in
+                seconds of a training step.
+        """
+        return {
+            'segments': list(self.segments),
+            'peak_memory': self.peak_memory,
+            'step_time': self.step_time
+        }
+
+    def extra_repr(self):
+        return ', '.join('{}:{} {}'.format(*segment)
+                         for segment in self.segments)
+
+
+def plan_recompute(layers, x, memory_budget, offload=False):
+    """
+    Plans which layers to keep activations of, to recompute, or to recompute
+    with inputs offloaded to host memory, so that the activations kept for
+    backward fit into `memory_budget` with the least time of recomputation.
+    The plan is made by a profiling forward pass on `x`, which measures the
+    size of activations and forward time of each layer. The pass is run in
+    eval mode, so that it does not update the running statistics of
+    normalization layers or advance the RNG state of dropout, and the
+    training mode of `layers` is restored afterwards.
+
+    The plan depends on whether `x` needs grad, as a segment is only
+    recomputed if its input needs grad. At run time, a segment whose inputs
+    need no grad, e.g. the first one on ordinary data, is run without
+    recompute whatever planned, otherwise its parameters would get no
+    gradients. So the plan made on `x` needing grad may keep more
+    activations than estimated when run on data needing no grad.
+
+    Args:
+        layers(Sequential|LayerList): the layers run in sequence, where each
+            layer takes the output of the previous one.
+        x(Tensor): the input of the first layer for profiling.
+        memory_budget(int): the bytes of activations allowed to be kept
+            for backward.
+        offload(bool, optional): if offloading inputs of segments to host
+            memory is allowed. Default False.
+
+    Returns:
+        RecomputePlan: a layer running `layers` as planned, whose `report()`
+            returns the segments, the estimated peak memory and step time.
+    """
+    children = list(layers.children())
+    profiles = _profile_layers(children, x)
+    copy_time = _copy_time_per_byte(x) if offload else 0.
+
+    # the largest activations of a recomputed segment
+    transients = sorted(
+        set(
+            sum(p.activation_bytes for p in profiles[start:end])
+            for end in range(len(profiles) + 1) for start in range(end)))
+    transients = [0] + [
+        transients[i]
+        for i in np.linspace(0, len(transients) - 1, 16).astype('int64')
+    ]
+
+    best = None
+    for max_transient in sorted(set(transients)):
+        segments = _solve(profiles, memory_budget, max_transient, offload,
+                          copy_time)
+        if segments is None:
+            continue
+        peak_memory, recompute_time = _estimate(profiles, segments,
+                                                copy_time)
+        if peak_memory > memory_budget:
+            continue
+        if best is None or (recompute_time, peak_memory) < best[:2]:
+            best = (recompute_time, peak_memory, segments)
+    if best is None:
+        raise ValueError(
+            "No recompute plan fits into memory_budget {} bytes, while the "
+            "inputs of layers take {} bytes.".format(
+                memory_budget, [p.input_bytes for p in profiles]))
+
+    recompute_time, peak_memory, segments = best
+    # backward takes about twice the time of forward
+    step_time = 3 * sum(p.forward_time for p in profiles) + recompute_time
+    logger.info(
+        "[Recompute]: plan {} with estimated peak memory {} bytes and step "
+        "time {:.3f} s.".format(segments, peak_memory, step_time))
+    return RecomputePlan(layers, segments, peak_memory, step_time)
@@ -18,6 +18,7 @@ from .proto import framework_pb2
 from paddle.fluid import framework as framework
 from paddle.fluid import program_guard
 from . import core
+import bisect
 import collections
 import copy
 import six
@@ -488,25 +489,68 @@ def _addup_repetitive_outputs_(op_descs, block_idx):
     renamed_vars = collections.defaultdict(list)
     renamed_var_start_idx = collections.defaultdict(list)
     var_device = collections.defaultdict(str)
+    # def-use index of the gradient vars, so that renaming a var only visits
+    # the ops using it instead of all the ops in a range.
+    #   grad_var_ops: var name -> sorted idx of the visited op_descs using it
+    #   grad_var_pending_ops: var name -> pending sum/add op_descs using it
+    grad_var_ops = collections.defaultdict(list)
+    grad_var_pending_ops = collections.defaultdict(list)
+    op_device_attr_name = core.op_proto_and_checker_maker.kOpDeviceAttrName()
+
+    def _index_op_(index, op_desc, key):
+        for name in set(op_desc.input_arg_names()) | set(
+                op_desc.output_arg_names()):
+            if "@GRAD" in name:
+                index[name].append(key)
+
+    def _accumulate_gradients_(var_name, idx):
+        pending_ops = pending_sum_ops.setdefault(idx, [])
+        num_pending_ops = len(pending_ops)
+        if len(renamed_vars[var_name]) > _MAX_ADD_NUM_:
+            _accumulate_gradients_by_sum_op_(var_name, renamed_vars,
+                                             pending_sum_ops, idx,
+                                             var_device[var_name])
+        else:
+            _accumulate_gradients_by_add_ops_(var_name, renamed_vars,
+                                              pending_sum_ops, idx,
+                                              var_device[var_name])
+        for pending_op in pending_ops[num_pending_ops:]:
+            _index_op_(grad_var_pending_ops, pending_op, pending_op)
+
+    def _rename_indexed_args_(var_name, new_name, begin_idx):
+        # same as _rename_arg_(op_descs, var_name, new_name, begin_idx, idx)
+        # and _rename_arg_(pending_sum_ops, var_name, new_name), as only the
+        # op_descs before idx are indexed yet.
+        op_idxs = grad_var_ops[var_name]
+        begin = bisect.bisect_left(op_idxs, begin_idx)
+        renamed_op_idxs = op_idxs[begin:]
+        del op_idxs[begin:]
+        for i in renamed_op_idxs:
+            op_descs[i]._rename_input(var_name, new_name)
+            op_descs[i]._rename_output(var_name, new_name)
+        if renamed_op_idxs:
+            grad_var_ops[new_name] = sorted(grad_var_ops[new_name] +
+                                            renamed_op_idxs)
+
+        pending_ops = grad_var_pending_ops.pop(var_name, [])
+        for pending_op in pending_ops:
+            pending_op._rename_input(var_name, new_name)
+            pending_op._rename_output(var_name, new_name)
+        if pending_ops:
+            grad_var_pending_ops[new_name].extend(pending_ops)
+
     for idx, op_desc in enumerate(op_descs):
-        op_device_attr_name = core.op_proto_and_checker_maker.kOpDeviceAttrName(
-        )
         op_device = ""
         if op_desc.has_attr(op_device_attr_name):
             op_device = op_desc.attr(op_device_attr_name)
-        for var_name in op_desc.input_arg_names():
+        input_arg_names = op_desc.input_arg_names()
+        for var_name in input_arg_names:
             if "@GRAD" not in var_name:
                 continue
             if len(renamed_vars[var_name]) > 1:
-                if len(renamed_vars[var_name]) > _MAX_ADD_NUM_:
-                    _accumulate_gradients_by_sum_op_(var_name, renamed_vars,
-                                                     pending_sum_ops, idx,
-                                                     var_device[var_name])
-                else:
-                    _accumulate_gradients_by_add_ops_(var_name, renamed_vars,
-                                                      pending_sum_ops, idx,
-                                                      var_device[var_name])
+                _accumulate_gradients_(var_name, idx)
 
+        input_arg_names = set(input_arg_names)
         for param_idx, param_name in enumerate(op_desc.output_names()):
             arg_names = op_desc.output(param_name)
             for arg_idx, var_name in enumerate(arg_names):
@@ -515,7 +559,7 @@ def _addup_repetitive_outputs_(op_descs, block_idx):
                 # if "@RENAME@" in var_name:
                 #    continue
                 if var_name == core.empty_var_name(
-                ) or var_name in op_desc.input_arg_names():
+                ) or var_name in input_arg_names:
                     # empty variable or inplace op
                     continue
                 if len(renamed_vars[var_name]) == 0:
@@ -533,9 +577,8 @@ def _addup_repetitive_outputs_(op_descs, block_idx):
                         #                             new_name, 0, idx)
                         # rename arg from idx of the first appearance
                         # in backward, not always from 0
-                        _rename_arg_(op_descs, var_name, new_name,
-                                     renamed_var_start_idx[var_name], idx)
-                        _rename_arg_(pending_sum_ops, var_name, new_name)
+                        _rename_indexed_args_(var_name, new_name,
+                                              renamed_var_start_idx[var_name])
 
                         for p in op_desc.output_names()[:param_idx]:
                             p_arg_names = op_desc.output(p)
@@ -559,6 +602,8 @@ def _addup_repetitive_outputs_(op_descs, block_idx):
                     # record the latest device
                     var_device[var_name] = op_device
 
+        _index_op_(grad_var_ops, op_desc, idx)
+
     for var_name, inputs in six.iteritems(renamed_vars):
         if len(renamed_vars[var_name]) > 1:
             if len(renamed_vars[var_name]) > _MAX_ADD_NUM_:
@@ -677,14 +722,14 @@ def _find_not_need_ops(grad_op_descs, forward_ops, input_grad_names_set):
     var_versions = dict()
 
     def _create_node(name):
-        if name not in var_versions.keys():
+        if name not in var_versions:
             var_versions[name] = [Var(name)]
         else:
             var_versions[name].append(Var(name))
         return var_versions[name][-1]
 
     def _create_or_get_last_version_node(name):
-        if name not in var_versions.keys():
+        if name not in var_versions:
             var_versions[name] = [Var(name)]
         return var_versions[name][-1]
 
@@ -726,16 +771,22 @@ def _find_not_need_ops(grad_op_descs, forward_ops, input_grad_names_set):
     # they are connected to backward computational graphs, and if they are
     # not, list them in not_need_op_descs
     for special_op_node in special_op_nodes:
+        # an op is visited once, its outputs are ready the first time it is
+        # visited and visiting it again would not change ready_vars.
         op_list = [special_op_node]
+        visited_ops = set(op_list)
         ready_vars = set(special_op_node.inputs)
         remove_ops = True
-        candidate_ops = [special_op_node]
+        candidate_ops = collections.deque(op_list)
         while len(candidate_ops) > 0:
-            op_node = candidate_ops.pop(0)
+            op_node = candidate_ops.popleft()
             if _all_in_set_(op_node.inputs, ready_vars):
                 for out_var in op_node.outputs:
-                    candidate_ops.extend(out_var.pendding_ops)
-                    op_list.extend(out_var.pendding_ops)
+                    for pending_op in out_var.pendding_ops:
+                        if pending_op not in visited_ops:
+                            visited_ops.add(pending_op)
+                            candidate_ops.append(pending_op)
+                            op_list.append(pending_op)
                 ready_vars.update(op_node.outputs)
             else:
                 remove_ops = False
@@ -1165,7 +1216,11 @@ def _append_backward_ops_(block,
                     is_append_grad = True
                     break
 
-                if _some_in_set_(input_grad_names, input_grad_names_set):
+                # input_grad_names_set holds str names already, so test the
+                # membership directly rather than by _some_in_set_ which
+                # copies the whole set per call.
+                if any(name in input_grad_names_set
+                       for name in input_grad_names):
                     grad_op_descs.append(op_desc)
                     is_append_grad = True
                     for name in op_desc.output_arg_names():
@@ -1809,21 +1864,29 @@ def _find_op_path_(block,
     if op_path_dict is None:
         op_path_dict = dict()
 
-    relevant_op_flags = [True] * len(block.ops)
+    ops = block.ops
+    relevant_op_flags = [True] * len(ops)
+    # The arg names of every op are fetched from its desc once. They are str
+    # already, so the membership is tested directly rather than by
+    # _some_in_set_, which copies the whole growing name set for each op.
+    op_input_names = [op.desc.input_arg_names() for op in ops]
+    op_output_names = [op.desc.output_arg_names() for op in ops]
+
+    def _some_in_(names, name_set):
+        return any(name in name_set for name in names)
 
     # All the inputs of the block are used if inputs is empty,
     if inputs:
-        for i, op in enumerate(block.ops):
-            if _some_in_set_(
-                    op.desc.input_arg_names(),
-                    input_names) and core.has_non_empty_grad_op_maker(op.type):
-                for name in op.desc.output_arg_names():
+        for i, op in enumerate(ops):
+            if _some_in_(op_input_names[i], input_names) and \
+                    core.has_non_empty_grad_op_maker(op.type):
+                for name in op_output_names[i]:
                     if name not in no_grad_set:
                         input_names.add(name)
             else:
                 relevant_op_flags[i] = False
 
-    for i, op in reversed(list(enumerate(block.ops))):
+    for i, op in reversed(list(enumerate(ops))):
         if op.has_attr("sub_block"):
             sub_block_id = op._block_attr_id("sub_block")
             sub_block = block.program.block(sub_block_id)
@@ -1833,10 +1896,9 @@ def _find_op_path_(block,
                                                  sub_block_target_names)
             op_path_dict[sub_block_id] = sub_block_path
 
-        if _some_in_set_(
-                op.desc.output_arg_names(),
-                output_names) and core.has_non_empty_grad_op_maker(op.type):
-            for name in op.desc.input_arg_names():
+        if _some_in_(op_output_names[i], output_names) and \
+                core.has_non_empty_grad_op_maker(op.type):
+            for name in op_input_names[i]:
                 if name not in no_grad_set:
                     output_names.add(name)
         else:
@@ -1845,18 +1907,18 @@ def _find_op_path_(block,
     if is_while:
         # If block is while block, dealing with op specifically again.
         # TODO(liym27): Consider special types of ops.
-        for i, op in reversed(list(enumerate(block.ops))):
+        for i in reversed(range(len(ops))):
             if relevant_op_flags[i] == False \
-                    and _some_in_set_(op.desc.output_arg_names(), output_names):
+                    and _some_in_(op_output_names[i], output_names):
                 relevant_op_flags[i] = True
 
-    op_path = [
-        block.ops[i] for i in range(len(block.ops)) if relevant_op_flags[i]
-    ]
+    op_path = [ops[i] for i in range(len(ops)) if relevant_op_flags[i]]
 
     if inputs:
-        for op in op_path:
-            for name in op.desc.input_arg_names():
+        for i in range(len(ops)):
+            if not relevant_op_flags[i]:
+                continue
+            for name in op_input_names[i]:
                 if name not in input_names and block.vars[name].stop_gradient:
                     no_grad_set.add(name)
 
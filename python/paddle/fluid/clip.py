@@ -434,20 +434,39 @@ class ClipGradByGlobalNorm(ClipGradBase):
 
     @imperative_base.no_grad
     def _dygraph_clip(self, params_grads):
+        from .dygraph.layers import _FlatParameterStorage
         params_and_grads = []
         sum_square_list = []
         sum_square_list_fp16 = []
         sum_square_list_fp32 = []
+
+        # The gradients of the parameters flattened by
+        # Layer.flatten_parameters are views of one contiguous tensor, which
+        # is clipped as a whole while they are still its views.
+        clipped = [
+            (p, g) for p, g in params_grads
+            if g is not None and getattr(p, 'need_clip', True) is not False
+        ]
+        flat_storages, _ = _FlatParameterStorage.split(
+            [p for p, _ in clipped], [g for _, g in clipped])
+        flat_param_ids = set(
+            id(param) for storage in flat_storages
+            for param in storage.params)
+        merge_grads = [storage.flat_grad for storage in flat_storages]
         for p, g in params_grads:
             if g is None:
                 continue
             if getattr(p, 'need_clip', True) is False:
                 continue
+            if id(p) in flat_param_ids:
+                continue
             merge_grad = g
             if g.type == core.VarDesc.VarType.SELECTED_ROWS:
                 merge_grad = layers.merge_selected_rows(g)
                 merge_grad = layers.get_tensor_from_selected_rows(merge_grad)
+            merge_grads.append(merge_grad)
 
+        for merge_grad in merge_grads:
             sum_square = _squared_l2_norm(merge_grad)
             if sum_square.dtype == core.VarDesc.VarType.FP16:
                 sum_square_list_fp16.append(sum_square)
@@ -487,12 +506,24 @@ class ClipGradByGlobalNorm(ClipGradBase):
             x=max_global_norm,
             y=layers.elementwise_max(
                 x=global_norm_var, y=max_global_norm))
+        flat_new_grads = dict()
+        for storage in flat_storages:
+            clip_input = (clip_var.astype('float16') if storage.dtype ==
+                          core.VarDesc.VarType.FP16 else clip_var)
+            new_flat_grad = layers.elementwise_mul(
+                x=storage.flat_grad, y=clip_input)
+            for param, new_grad in zip(storage.params,
+                                       storage.views(new_flat_grad)):
+                flat_new_grads[id(param)] = new_grad
         for p, g in params_grads:
             if g is None:
                 continue
             if getattr(p, 'need_clip', True) is False:
                 params_and_grads.append((p, g))
                 continue
+            if id(p) in flat_new_grads:
+                params_and_grads.append((p, flat_new_grads[id(p)]))
+                continue
             # TODO(wangxi): use inplace elementwise_mul
             clip_input = (clip_var.astype('float16')
                           if g.dtype == core.VarDesc.VarType.FP16 else clip_var)
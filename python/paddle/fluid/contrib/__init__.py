@@ -36,6 +36,8 @@ from . import optimizer
 from .optimizer import *
 from . import sparsity
 from .sparsity import *
+from . import inference_server
+from .inference_server import *
 
 __all__ = []
 __all__ += decoder.__all__
@@ -47,3 +49,4 @@ __all__ += ['mixed_precision']
 __all__ += layers.__all__
 __all__ += optimizer.__all__
 __all__ += sparsity.__all__
+__all__ += inference_server.__all__
@@ -0,0 +1,240 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import time
+import threading
+import numpy as np
+from concurrent.futures import Future
+from six.moves import queue
+
+from .. import core
+from ..executor import Executor, scope_guard
+from ..framework import _get_paddle_place
+
+__all__ = ['ConcurrentInferenceExecutor']
+
+# put into the request queue to stop a worker
+_STOP = object()
+
+
+class _Request(object):
+    def __init__(self, values):
+        self.values = values
+        self.batch_size = values[0].shape[0] if values else 0
+        self.future = Future()
+
+    def batch_signature(self):
+        # requests can be batched only if they agree on all dims but the 1st
+        return tuple((v.dtype, v.shape[1:]) for v in self.values)
+
+
+class ConcurrentInferenceExecutor(object):
+    """
+    A thread-safe executor to serve concurrent inference requests of a model
+    saved by `paddle.static.save_inference_model` in one process.
+
+    The parameters are loaded once into a scope shared by all workers. Every
+    worker runs the program prepared by `Executor.prepare` in its own child
+    scope of the shared one, so the parameters are shared read-only and the
+    activations are kept apart. The requests queued within `max_latency_ms`
+    are concatenated along the first dim and run as one batch, as long as
+    their other dims and dtypes agree and the batch has at most
+    `max_batch_size` rows.
+
+    Args:
+        path_prefix(str): The path prefix of the inference model.
+        place(CPUPlace|str, optional): The place to run. Default is CPUPlace.
+        num_workers(int, optional): The number of worker threads. Default is 4.
+        max_batch_size(int, optional): The max number of rows of a batch, 1
+            disables batching. Default is 32.
+        max_latency_ms(float, optional): How long a worker waits for more
+            requests to batch with the first one. Default is 5.
+        max_queue_size(int, optional): The max number of pending requests,
+            `submit` blocks when the queue is full. Default is 1024.
+        **kwargs: The other arguments of `paddle.static.load_inference_model`.
+
+    Examples:
+        .. code-block:: python
+
+            import numpy as np
+            import paddle
+            from paddle.fluid.contrib import ConcurrentInferenceExecutor
+
+            paddle.enable_static()
+            server = ConcurrentInferenceExecutor("./infer_model/model")
+            future = server.submit([np.ones([1, 4], dtype='float32')])
+            out, = future.result()
+            server.close()
+    """
+
+    def __init__(self,
+                 path_prefix,
+                 place=None,
+                 num_workers=4,
+                 max_batch_size=32,
+                 max_latency_ms=5,
+                 max_queue_size=1024,
+                 **kwargs):
+        from paddle.static import load_inference_model
+        if num_workers < 1:
+            raise ValueError("num_workers should be at least 1, but got {}".
+                             format(num_workers))
+        self._place = core.CPUPlace() if place is None else _get_paddle_place(
+            place)
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_latency = max_latency_ms / 1000.0
+
+        self._scope = core.Scope()
+        exe = Executor(self._place)
+        with scope_guard(self._scope):
+            program, feed_names, fetch_targets = load_inference_model(
+                path_prefix, exe, **kwargs)
+        self.feed_names = feed_names
+        self.program = program
+
+        self._prepared = []
+        for _ in range(num_workers):
+            worker_exe = Executor(self._place)
+            self._prepared.append(
+                worker_exe.prepare(
+                    program,
+                    feed_names,
+                    fetch_list=fetch_targets,
+                    scope=self._scope))
+
+        self._requests = queue.Queue(max_queue_size)
+        self._closed = False
+        self._workers = []
+        for prepared in self._prepared:
+            worker = threading.Thread(target=self._work, args=(prepared, ))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, feed):
+        """
+        Queue an inference request.
+
+        Args:
+            feed(dict|list|tuple): A dict which maps the feed names to numpy
+                arrays, or a list of numpy arrays in the order of the feed
+                names of the model.
+
+        Returns:
+            concurrent.futures.Future: The future of the list of fetched
+            numpy arrays.
+        """
+        if self._closed:
+            raise RuntimeError("ConcurrentInferenceExecutor is closed.")
+        if isinstance(feed, dict):
+            values = [np.asarray(feed[name]) for name in self.feed_names]
+        else:
+            if len(feed) != len(self.feed_names):
+                raise ValueError(
+                    "Expect {} feed values for {}, but received {}.".format(
+                        len(self.feed_names), self.feed_names, len(feed)))
+            values = [np.asarray(value) for value in feed]
+        request = _Request(values)
+        self._requests.put(request)
+        return request.future
+
+    def run(self, feed):
+        """
+        Run an inference request and wait for its results.
+        """
+        return self.submit(feed).result()
+
+    def close(self):
+        """
+        Stop the workers after the pending requests are done, and release
+        the scopes of the workers.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._requests.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        for prepared in self._prepared:
+            prepared.close()
+
+    def _next_batch(self, first):
+        """
+        Collect the requests which can be batched with `first` until the
+        batch is full or the latency window ends. Return the batch and the
+        request taken from the queue but not batched, if any.
+        """
+        batch = [first]
+        rows = first.batch_size
+        if self._max_batch_size <= 1 or not first.values:
+            return batch, None
+        signature = first.batch_signature()
+        deadline = time.time() + self._max_latency
+        while rows < self._max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if (request is _STOP or
+                    request.batch_signature() != signature or
+                    rows + request.batch_size > self._max_batch_size):
+                return batch, request
+            batch.append(request)
+            rows += request.batch_size
+        return batch, None
+
+    def _run_batch(self, prepared, batch):
+        if len(batch) == 1:
+            return [prepared.run(batch[0].values)]
+
+        values = [
+            np.concatenate([r.values[i] for r in batch])
+            for i in range(len(self.feed_names))
+        ]
+        outs = prepared.run(values)
+        rows = sum(r.batch_size for r in batch)
+        if any(np.ndim(out) == 0 or out.shape[0] != rows for out in outs):
+            # the outputs can not be split by rows, so run them one by one
+            return [prepared.run(r.values) for r in batch]
+
+        results = []
+        offset = 0
+        for r in batch:
+            results.append(
+                [out[offset:offset + r.batch_size] for out in outs])
+            offset += r.batch_size
+        return results
+
+    def _work(self, prepared):
+        pending = None
+        while True:
+            request = pending if pending is not None else self._requests.get()
+            pending = None
+            if request is _STOP:
+                return
+            batch, pending = self._next_batch(request)
+            try:
+                results = self._run_batch(prepared, batch)
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+                continue
+            for r, result in zip(batch, results):
+                r.future.set_result(result)
@@ -0,0 +1,82 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Latency percentiles of ConcurrentInferenceExecutor under many concurrent
+clients sending single-sample requests.
+
+    python benchmark_inference_server.py
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import paddle
+from paddle.fluid.contrib import ConcurrentInferenceExecutor
+
+
+def _save_model(path_prefix):
+    main_program = paddle.static.Program()
+    startup_program = paddle.static.Program()
+    with paddle.static.program_guard(main_program, startup_program):
+        x = paddle.static.data(name='x', shape=[None, 16], dtype='float32')
+        out = paddle.static.nn.fc(x, 8)
+    exe = paddle.static.Executor(paddle.CPUPlace())
+    exe.run(startup_program)
+    paddle.static.save_inference_model(
+        path_prefix, [x], [out], exe, program=main_program)
+
+
+def main(num_workers=4, num_clients=8, num_requests=50):
+    paddle.enable_static()
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path_prefix = os.path.join(temp_dir, "model")
+        _save_model(path_prefix)
+        server = ConcurrentInferenceExecutor(
+            path_prefix, num_workers=num_workers, max_batch_size=16)
+        latencies = []
+        lock = threading.Lock()
+
+        def _client():
+            x = np.random.random([1, 16]).astype('float32')
+            for _ in range(num_requests):
+                begin = time.time()
+                server.run([x])
+                with lock:
+                    latencies.append(time.time() - begin)
+
+        clients = [
+            threading.Thread(target=_client) for _ in range(num_clients)
+        ]
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        server.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("%d workers, %d clients: p50 latency %.2f ms, p99 latency %.2f ms" %
+          (num_workers, num_clients, np.percentile(latencies, 50) * 1000,
+           np.percentile(latencies, 99) * 1000))
+
+
+if __name__ == '__main__':
+    main()
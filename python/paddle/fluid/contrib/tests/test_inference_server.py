@@ -0,0 +1,108 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import paddle
+from paddle.fluid.contrib import ConcurrentInferenceExecutor
+
+paddle.enable_static()
+
+
+class TestConcurrentInferenceExecutor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path_prefix = os.path.join(self.temp_dir, "model")
+        main_program = paddle.static.Program()
+        startup_program = paddle.static.Program()
+        with paddle.static.program_guard(main_program, startup_program):
+            x = paddle.static.data(name='x', shape=[None, 16], dtype='float32')
+            out = paddle.static.nn.fc(x, 8)
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        exe.run(startup_program)
+        paddle.static.save_inference_model(
+            self.path_prefix, [x], [out], exe, program=main_program)
+
+        self.program, _, self.fetch_targets = \
+            paddle.static.load_inference_model(self.path_prefix, exe)
+        self.exe = exe
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _expected(self, x):
+        res, = self.exe.run(self.program,
+                            feed={'x': x},
+                            fetch_list=self.fetch_targets)
+        return res
+
+    def test_results(self):
+        server = ConcurrentInferenceExecutor(
+            self.path_prefix, num_workers=2, max_batch_size=8)
+        inputs = [
+            np.random.random([i % 3 + 1, 16]).astype('float32')
+            for i in range(20)
+        ]
+        futures = [server.submit([x]) for x in inputs]
+        for x, future in zip(inputs, futures):
+            out, = future.result()
+            self.assertTrue(np.allclose(out, self._expected(x), atol=1e-5))
+        self.assertTrue(
+            np.allclose(
+                server.run({
+                    'x': inputs[0]
+                })[0], self._expected(inputs[0]), atol=1e-5))
+        server.close()
+        self.assertRaises(RuntimeError, server.submit, [inputs[0]])
+
+    def test_concurrent_clients(self):
+        # each client gets the results of its own inputs, while the requests
+        # of all clients are run concurrently by the workers
+        server = ConcurrentInferenceExecutor(
+            self.path_prefix, num_workers=4, max_batch_size=16)
+        num_clients, num_requests = 8, 20
+        inputs = [[
+            np.random.random([i % 3 + 1, 16]).astype('float32')
+            for i in range(num_requests)
+        ] for _ in range(num_clients)]
+        expected = [[self._expected(x) for x in xs] for xs in inputs]
+        mismatches = []
+
+        def _client(k):
+            for x, y in zip(inputs[k], expected[k]):
+                out, = server.run([x])
+                if out.shape != y.shape or not np.allclose(out, y, atol=1e-5):
+                    mismatches.append(k)
+
+        clients = [
+            threading.Thread(
+                target=_client, args=(k, )) for k in range(num_clients)
+        ]
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        server.close()
+        self.assertEqual(mismatches, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
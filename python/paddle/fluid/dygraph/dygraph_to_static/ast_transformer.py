@@ -67,13 +67,9 @@ class DygraphToStaticAst(gast.NodeTransformer):
         self.translator_logger.log_transformed_code(log_level, self.root,
                                                     transformer.__name__)
 
-    def transfer_from_node_type(self, node_wrapper):
-        self.translator_logger.log(
-            1, "Source code: \n{}".format(ast_to_source_code(self.root)))
-        # Generic transformation
-        self.visit(node_wrapper.node)
-
-        transformers = [
+    @staticmethod
+    def get_transformers():
+        return [
             BasicApiTransformer,  # Basic Api
             TensorShapeTransformer,  # Tensor.shape -> layers.shape(Tensor)
             ListTransformer,  # List used in control flow
@@ -90,7 +86,20 @@ class DygraphToStaticAst(gast.NodeTransformer):
             GradTransformer,  # transform paddle.grad to paddle.gradients
         ]
 
-        for index, transformer in enumerate(transformers):
+    @classmethod
+    def get_transformer_names(cls):
+        """
+        Return the names of the transformers in the order they are applied.
+        """
+        return [transformer.__name__ for transformer in cls.get_transformers()]
+
+    def transfer_from_node_type(self, node_wrapper):
+        self.translator_logger.log(
+            1, "Source code: \n{}".format(ast_to_source_code(self.root)))
+        # Generic transformation
+        self.visit(node_wrapper.node)
+
+        for index, transformer in enumerate(self.get_transformers()):
             self._apply(transformer, node_wrapper, log_level=index + 1)
 
         self.translator_logger.log_transformed_code(
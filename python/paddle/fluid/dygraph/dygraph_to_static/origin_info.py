@@ -16,6 +16,7 @@ from __future__ import print_function
 
 import collections
 import inspect
+import six
 
 from paddle.utils import gast
 from paddle.fluid import core
@@ -187,6 +188,59 @@ def create_and_update_origin_info_map(transformed_node,
     return origin_info_map
 
 
+def _get_source_offsets(func):
+    """
+    Returns the file path of func, and the line and column offsets of its
+    source in the file.
+    """
+    func = unwrap(func)
+    source_lines, begin_lineno = inspect.getsourcelines(func)
+    begin_line = source_lines[0]
+    col_offset = len(begin_line) - len(begin_line.lstrip())
+    return inspect.getsourcefile(func), begin_lineno - 1, col_offset
+
+
+def dump_origin_info_map(origin_info_map, func):
+    """
+    Dumps the original information map of a static function transformed by
+    func into picklable tuples. The locations of the dygraph code are stored
+    relative to the source of func, so that the map is still right after the
+    source of func moves in its file.
+
+    Args:
+        origin_info_map(dict): The original information map returned by `create_and_update_origin_info_map` with `is_global=False`.
+        func(Callable): The dygraph function of the map.
+
+    Returns:
+        A list of tuples (static_lineno, lineno, col_offset, function_name, source_code).
+    """
+    _, lineno_offset, col_offset = _get_source_offsets(func)
+    dumped = []
+    for static_loc, origin_info in six.iteritems(origin_info_map):
+        location = origin_info.location
+        dumped.append((static_loc[1], location.lineno - lineno_offset,
+                       location.col_offset - col_offset,
+                       origin_info.function_name, origin_info.source_code))
+    return dumped
+
+
+def load_origin_info_map(dumped, static_func, func):
+    """
+    Restores the original information map dumped by `dump_origin_info_map`
+    for static_func transformed by func, and updates the global map with it.
+
+    Returns:
+        The global original information map.
+    """
+    filepath, lineno_offset, col_offset = _get_source_offsets(func)
+    static_filepath = inspect.getsourcefile(static_func)
+    for static_lineno, lineno, col, function_name, source_code in dumped:
+        loc = Location(filepath, lineno + lineno_offset, col + col_offset)
+        global_origin_info_map[(static_filepath, static_lineno)] = OriginInfo(
+            loc, function_name, source_code)
+    return global_origin_info_map
+
+
 def attach_origin_info(ast_node, func):
     """
     Attach original source information to AST node according corresponding function.
@@ -15,18 +15,29 @@
 from __future__ import print_function
 
 import collections
-from paddle.utils import gast
+import copy
+import hashlib
 import inspect
+import os
+import pickle
 import six
+import sys
 import textwrap
 import threading
+import warnings
 import weakref
+import numpy as np
+
+import paddle
+from paddle.utils import gast
 
+from paddle.fluid import core
 from paddle.fluid import framework
 from paddle.fluid import in_dygraph_mode
 from paddle.fluid.dygraph import layers
 from paddle.fluid.data_feeder import check_type
 from paddle.fluid.layers.utils import flatten
+from paddle.fluid.layers.utils import pack_sequence_as
 from paddle.fluid.dygraph.base import param_guard
 from paddle.fluid.dygraph.base import switch_to_static_graph
 from paddle.fluid.dygraph.dygraph_to_static import DygraphToStaticAst
@@ -34,6 +45,8 @@ from paddle.fluid.dygraph.dygraph_to_static import error
 from paddle.fluid.dygraph.dygraph_to_static import logging_utils
 from paddle.fluid.dygraph.dygraph_to_static.origin_info import attach_origin_info
 from paddle.fluid.dygraph.dygraph_to_static.origin_info import create_and_update_origin_info_map
+from paddle.fluid.dygraph.dygraph_to_static.origin_info import dump_origin_info_map
+from paddle.fluid.dygraph.dygraph_to_static.origin_info import load_origin_info_map
 from paddle.fluid.dygraph.dygraph_to_static.origin_info import update_op_callstack_with_origin_info
 from paddle.fluid.dygraph.dygraph_to_static.partial_program import partial_program_from
 from paddle.fluid.dygraph.dygraph_to_static.utils import ast_to_func
@@ -43,6 +56,7 @@ from paddle.fluid.dygraph.dygraph_to_static.utils import input_specs_compatible
 from paddle.fluid.dygraph.dygraph_to_static.utils import type_name
 from paddle.fluid.dygraph.dygraph_to_static.utils import unwrap
 from paddle.fluid.dygraph.dygraph_to_static.utils import make_hashable
+from paddle.fluid.dygraph.dygraph_to_static.utils import source_to_func
 from paddle.fluid.dygraph.dygraph_to_static.function_spec import FunctionSpec
 from paddle.fluid.dygraph.dygraph_to_static.function_spec import get_buffers, get_parameters
 from paddle.fluid.wrapped_decorator import signature_safe_contextmanager
@@ -53,10 +67,61 @@ __all__ = ['ProgramTranslator', 'convert_to_static']
 # Once exceeding the threshold, we will raise warning to users to make sure the conversion is as expected.
 MAX_TRACED_PROGRAM_COUNT = 10
 
+# The number of the latest call signatures guarded by each StaticFunction to
+# skip building the CacheKey.
+MAX_GUARDED_SIGNATURE_COUNT = 8
+
+# The python values which are guarded by their values in call signatures.
+_GUARDED_VALUE_TYPES = (bool, float, type(None)) + six.integer_types + \
+    six.string_types
+
+
+def _get_ast_cache_path(cache_dir, source_code):
+    """
+    The cache file of the transformed source of a function, which is keyed by
+    the source code of the function, the transformers, and the versions of
+    Paddle and Python.
+    """
+    key = hashlib.sha256()
+    key.update(source_code.encode("utf-8"))
+    key.update(
+        repr((DygraphToStaticAst.get_transformer_names(), paddle.__version__,
+              paddle.__git_commit__, sys.version_info[:2])).encode())
+    return os.path.join(cache_dir, "ast_cache_{}.pkl".format(key.hexdigest()))
+
+
+def _load_ast_cache(cache_path):
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        warnings.warn("Failed to load the dygraph_to_static cache {}: {}".
+                      format(cache_path, e))
+        return None
+
+
+def _save_ast_cache(cache_path, source, origin_info):
+    cache_dir = os.path.dirname(cache_path)
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    # write to a temp file first, so that a concurrent reader never sees a
+    # partial file
+    tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"source": source, "origin_info": origin_info}, f)
+    os.replace(tmp_path, cache_path)
+
 
 class FunctionCache(object):
     """
     Caches the transformed functions to avoid redundant conversions of the same function.
+
+    If the environment variable `FLAGS_DY2STATIC_CACHE_DIR` is set, the
+    transformed source of the functions is also saved in the directory, and
+    reused by the later processes converting the functions with the same
+    source code.
     """
 
     def __init__(self):
@@ -107,6 +172,16 @@ class FunctionCache(object):
         #  Consider this case: source_code in self._code_to_ast_caches,
         #  but actually they are methods in different classes.
         #  Maybe use (__class__, source_code) as key
+        cache_dir = os.environ.get("FLAGS_DY2STATIC_CACHE_DIR", None)
+        cache_path = None
+        if cache_dir and source_code not in self._code_to_ast_caches:
+            cache_path = _get_ast_cache_path(cache_dir, source_code)
+            cached = _load_ast_cache(cache_path)
+            if cached is not None:
+                static_func, _ = source_to_func(cached["source"], func)
+                load_origin_info_map(cached["origin_info"], static_func, func)
+                return static_func
+
         if source_code in self._code_to_ast_caches:
             root_wrapper = self._code_to_ast_caches[source_code]
         else:
@@ -118,7 +193,13 @@ class FunctionCache(object):
         # Get static function from AST
         static_func, file_name = ast_to_func(root_wrapper.node, func)
 
-        create_and_update_origin_info_map(root_wrapper.node, static_func)
+        origin_info_map = create_and_update_origin_info_map(
+            root_wrapper.node, static_func, is_global=False)
+        if cache_path is not None:
+            with open(file_name, "r", encoding="utf-8") as f:
+                source = f.read()
+            _save_ast_cache(cache_path, source,
+                            dump_origin_info_map(origin_info_map, func))
         return static_func
 
     def exist(self, func):
@@ -211,6 +292,45 @@ class CacheKey(object):
             self.input_kwargs_with_spec, self.class_instance)
 
 
+def _guard_signature(args, kwargs):
+    """
+    Returns a cheap signature of the inputs of a call, which holds the nest
+    structure of the inputs, the shapes and dtypes of the tensors, and the
+    values of the python scalars. The calls with the same signature have the
+    same CacheKey, as CacheKey hashes the same information.
+
+    Returns None if any input can not be guarded cheaply, e.g. it is an
+    arbitrary python object, and then the CacheKey should be built.
+    """
+    signature = []
+
+    def _visit(x):
+        if isinstance(x, core.VarBase):
+            signature.append((core.VarBase, tuple(x.shape), x.dtype))
+        elif isinstance(x, np.ndarray):
+            signature.append((np.ndarray, x.shape, x.dtype))
+        elif isinstance(x, _GUARDED_VALUE_TYPES):
+            signature.append((type(x), x))
+        elif isinstance(x, (list, tuple)):
+            signature.append((type(x), len(x)))
+            for item in x:
+                if not _visit(item):
+                    return False
+        elif isinstance(x, dict):
+            keys = sorted(x.keys())
+            signature.append((type(x), tuple(keys)))
+            for key in keys:
+                if not _visit(x[key]):
+                    return False
+        else:
+            return False
+        return True
+
+    if not _visit(args) or not _visit(kwargs):
+        return None
+    return tuple(signature)
+
+
 def unwrap_decorators(func):
     """
     Unwraps a decorated function and returns the decorator list and inner target.
@@ -331,11 +451,23 @@ class StaticFunction(object):
                     self.dygraph_function))
 
         # 2. trace ops from dygraph layers and cache the generated program.
+        # Note: The guards are only used without input_spec, in which case all
+        # the tensors are described by their shapes and dtypes in CacheKey.
+        signature = None
+        if self._function_spec.input_spec is None:
+            signature = _guard_signature(args, kwargs)
         args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
 
         try:
-            concrete_program, partial_program_layer = self.get_concrete_program(
-                *args, **kwargs)
+            guarded = self._program_cache.get_guarded(
+                signature) if signature is not None else None
+            if guarded is not None:
+                concrete_program, partial_program_layer = guarded
+            else:
+                concrete_program, partial_program_layer = self.get_concrete_program(
+                    *args, **kwargs)
+                if signature is not None:
+                    self._program_cache.guard(signature)
 
             # 3. synchronize self.training attribute.
             if isinstance(self._class_instance, layers.Layer):
@@ -408,9 +540,17 @@ class StaticFunction(object):
 
     def get_traced_count(self):
         """
-        Returns the number of traced programs for the decorated function.
+        Returns the number of traced programs for the decorated function,
+        including the ones evicted from the program cache.
+        """
+        return self._program_cache.stats()["traced"]
+
+    def get_cache_stats(self):
+        """
+        Returns the statistics of the program cache of the decorated function,
+        see `ProgramCache.stats`.
         """
-        return len(self._program_cache)
+        return self._program_cache.stats()
 
     @property
     def code(self):
@@ -697,13 +837,95 @@ def _extract_indeed_params_buffers(class_instance):
     return params + buffers
 
 
+def _get_env_int(name, default):
+    env_val = os.environ.get(name, None)
+    if env_val is None or env_val == '':
+        return default
+    return int(env_val)
+
+
 class ProgramCache(object):
     """
     Wrapper class for the program functions defined by dygraph function.
+
+    Args:
+        max_size(int, optional): The max number of cached programs, the least
+            recently used one is evicted when exceeding it, and 0 means
+            unbounded. Default is `FLAGS_DY2STATIC_MAX_CACHED_PROGRAMS`, or 0.
+        relax_dim_threshold(int, optional): Once the tensors fed to an input
+            of a function without `input_spec` have more than this number of
+            distinct sizes on an axis, the axis is relaxed to a dynamic (None)
+            dim in the following traces of the input, so all the sizes share
+            one program. 0 means never relaxing. Default is
+            `FLAGS_DY2STATIC_RELAX_DIM_THRESHOLD`, or 0.
     """
 
-    def __init__(self):
+    def __init__(self, max_size=None, relax_dim_threshold=None):
         self._caches = collections.OrderedDict()
+        if max_size is None:
+            max_size = _get_env_int("FLAGS_DY2STATIC_MAX_CACHED_PROGRAMS", 0)
+        if relax_dim_threshold is None:
+            relax_dim_threshold = _get_env_int(
+                "FLAGS_DY2STATIC_RELAX_DIM_THRESHOLD", 0)
+        self._max_size = max_size
+        self._relax_dim_threshold = relax_dim_threshold
+        # The latest traced key, which is returned by `last()`.
+        self._last_key = None
+        # {(id(function_spec), input index, rank, axis): set of sizes}
+        self._dim_sizes = collections.defaultdict(set)
+        # The keys of `_dim_sizes` relaxed to dynamic dims.
+        self._relaxed_dims = set()
+        self._traced_count = 0
+        self._hit_count = 0
+        self._evicted_count = 0
+        # The key of the latest lookup, which is guarded by `guard`.
+        self._last_lookup_key = None
+        # {call signature: CacheKey} of the latest call signatures, see
+        # `_guard_signature`.
+        self._guards = collections.OrderedDict()
+        self._guard_hit_count = 0
+
+    def _relax_input_spec(self, cache_key):
+        """
+        Records the sizes of each axis of the InputSpecs in cache_key, and
+        replaces the InputSpecs having relaxed axes with the copies whose
+        sizes of the relaxed axes are -1.
+        """
+        if self._relax_dim_threshold <= 0 or \
+                cache_key.function_spec.input_spec is not None:
+            # NOTE: the InputSpecs from `input_spec` are owned by users.
+            return
+        specs = [
+            cache_key.input_args_with_spec, cache_key.input_kwargs_with_spec
+        ]
+        flat_specs = flatten(specs)
+        relaxed = False
+        for idx, spec in enumerate(flat_specs):
+            if not isinstance(spec, paddle.static.InputSpec):
+                continue
+            shape = list(spec.shape)
+            for axis, size in enumerate(shape):
+                if size == -1:
+                    continue
+                dim = (id(cache_key.function_spec), idx, len(shape), axis)
+                if dim not in self._relaxed_dims:
+                    sizes = self._dim_sizes[dim]
+                    sizes.add(size)
+                    if len(sizes) <= self._relax_dim_threshold:
+                        continue
+                    del self._dim_sizes[dim]
+                    self._relaxed_dims.add(dim)
+                    logging_utils.log(
+                        1, "Relax axis {} of input {} of {} to a dynamic dim.".
+                        format(axis, idx, cache_key.function_spec))
+                shape[axis] = -1
+            if tuple(shape) != tuple(spec.shape):
+                flat_specs[idx] = copy.copy(spec)
+                flat_specs[idx].shape = tuple(shape)
+                relaxed = True
+        if relaxed:
+            cache_key.input_args_with_spec, cache_key.input_kwargs_with_spec = \
+                pack_sequence_as(specs, flat_specs)
 
     def _build_once(self, cache_key):
         concrete_program = ConcreteProgram.from_func_spec(
@@ -719,18 +941,65 @@ class ProgramCache(object):
             raise ValueError('type(item) should be CacheKey, but received %s' %
                              type_name(item))
 
+        self._relax_input_spec(item)
+        self._last_lookup_key = item
         if item not in self._caches:
             self._caches[item] = self._build_once(item)
+            self._last_key = item
+            self._traced_count += 1
             # Note: raise warnings if number of traced program is more than `max_tracing_count`
             current_tracing_count = len(self._caches)
             if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
                 logging_utils.warn(
                     "Current traced program number: {} > `max_tracing_count`:{}. Too much cached programs will bring expensive overhead. "
-                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors.".
+                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors. "
+                    "Set FLAGS_DY2STATIC_RELAX_DIM_THRESHOLD to share programs among shapes, or FLAGS_DY2STATIC_MAX_CACHED_PROGRAMS to bound the cached programs.".
                     format(current_tracing_count, MAX_TRACED_PROGRAM_COUNT))
+            if self._max_size > 0 and len(self._caches) > self._max_size:
+                evicted_key, _ = self._caches.popitem(last=False)
+                self._evicted_count += 1
+                # the guards must not keep the evicted programs alive
+                for signature in [
+                        signature
+                        for signature, key in six.iteritems(self._guards)
+                        if key == evicted_key
+                ]:
+                    del self._guards[signature]
+        else:
+            self._hit_count += 1
+            if self._max_size > 0:
+                self._caches.move_to_end(item)
 
         return self._caches[item]
 
+    def guard(self, signature):
+        """
+        Guards the CacheKey of the latest lookup by the call signature it is
+        built from, so the following calls with the same signature get the
+        programs by `get_guarded` without building the CacheKey. Only the
+        latest `MAX_GUARDED_SIGNATURE_COUNT` signatures are guarded.
+        """
+        if self._last_lookup_key not in self._caches:
+            return
+        self._guards[signature] = self._last_lookup_key
+        self._guards.move_to_end(signature)
+        if len(self._guards) > MAX_GUARDED_SIGNATURE_COUNT:
+            self._guards.popitem(last=False)
+
+    def get_guarded(self, signature):
+        """
+        Returns the programs guarded by signature, or None if it is not
+        guarded. A hit also refreshes the recency of the programs.
+        """
+        key = self._guards.get(signature)
+        if key is None:
+            return None
+        self._guards.move_to_end(signature)
+        self._guard_hit_count += 1
+        if self._max_size > 0:
+            self._caches.move_to_end(key)
+        return self._caches[key]
+
     def get_program(self, item):
         if not isinstance(item, CacheKey):
             raise ValueError(
@@ -745,12 +1014,33 @@ class ProgramCache(object):
     def last(self):
         assert len(
             self._caches) >= 1, "No valid cached program in ProgramCache."
-        key = next(reversed(self._caches.keys()))
+        # NOTE: the latest traced program is never evicted, as it is the
+        # most recently used one when it is traced.
+        key = self._last_key
+        if key not in self._caches:
+            key = next(reversed(self._caches.keys()))
         return key, self._caches[key]
 
     def __len__(self):
         return len(self._caches)
 
+    def stats(self):
+        """
+        Returns a dict of the statistics of the cache, including the number
+        of traced, cached and evicted programs, the number of hits by
+        CacheKey and by guarded call signature, the number of guarded
+        signatures, and the number of relaxed axes.
+        """
+        return {
+            "traced": self._traced_count,
+            "cached": len(self._caches),
+            "hits": self._hit_count,
+            "guard_hits": self._guard_hit_count,
+            "guarded": len(self._guards),
+            "evicted": self._evicted_count,
+            "relaxed_dims": len(self._relaxed_dims),
+        }
+
     def concrete_programs(self):
         return [cp for key, (cp, _) in six.iteritems(self._caches)]
 
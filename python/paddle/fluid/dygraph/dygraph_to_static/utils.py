@@ -479,14 +479,21 @@ def ast_to_func(ast_root, dyfunc, delete_on_exit=True):
     TODO: If only decorate one of inner function instead of decorating the main
     function, the other inner functions are invisible for the decorated function.
     """
+    source = ast_to_source_code(ast_root)
+    source = _inject_import_statements() + source
+    return source_to_func(source, dyfunc, delete_on_exit)
+
+
+def source_to_func(source, dyfunc, delete_on_exit=True):
+    """
+    Load the module source generated by `ast_to_func` from a temp file, and
+    return the callable object of dyfunc in it and the temp file name.
+    """
 
     def remove_if_exit(filepath):
         if os.path.exists(filepath):
             os.remove(filepath)
 
-    source = ast_to_source_code(ast_root)
-    source = _inject_import_statements() + source
-
     f = tempfile.NamedTemporaryFile(
         mode='w', suffix='.py', delete=False, encoding='utf-8')
     with f:
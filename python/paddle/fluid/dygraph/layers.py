@@ -62,6 +62,198 @@ def _addindent(string, indent):
     return s1[0] + '\n' + '\n'.join(s2)
 
 
+def _coalesce_tensors(inputs, outputs, fused_output, copy_data):
+    framework._dygraph_tracer().trace_op(
+        type='coalesce_tensor',
+        inputs={'Input': inputs},
+        outputs={'Output': outputs,
+                 'FusedOutput': fused_output},
+        attrs={
+            'copy_data': copy_data,
+            'use_align': False,
+            'dtype': inputs[0].dtype
+        },
+        stop_gradient=True)
+
+
+def _zero_inplace(tensor):
+    # fill_constant keeps the allocation of tensor, so the views of a
+    # contiguous tensor stay views.
+    core.ops.fill_constant(tensor, 'value', 0.0, 'force_cpu', False, 'dtype',
+                           tensor.dtype, 'str_value', '0.0', 'shape',
+                           tensor.shape)
+
+
+class _FlatParameterStorage(object):
+    """
+    The values and the gradients of parameters with the same dtype stored
+    in two contiguous tensors, and the parameters and their gradients are
+    views of them. See `Layer.flatten_parameters`.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.dtype = params[0].dtype
+        self.numel = sum(int(np.prod(param.shape)) for param in params)
+        self.flat_param = framework.ParamBase(
+            shape=[self.numel],
+            dtype=self.dtype,
+            name=unique_name.generate("flat_param"))
+        self.flat_grad = framework._varbase_creator(
+            name=unique_name.generate("flat_param_grad"),
+            dtype=self.dtype,
+            persistable=True)
+        _coalesce_tensors(params, params, self.flat_param, copy_data=True)
+
+        # The gradients are set to initialized and non-empty tensors, so
+        # that backward accumulates into them in place instead of moving
+        # new tensors in.
+        grads = []
+        for param in params:
+            grad = param._grad_ivar()
+            param._set_grad_ivar(
+                paddle.zeros_like(param) if grad is None else paddle.assign(
+                    grad))
+            grads.append(param._grad_ivar())
+        _coalesce_tensors(grads, grads, self.flat_grad, copy_data=True)
+        for param in params:
+            param._flat_storage = self
+
+    def __deepcopy__(self, memo):
+        # ParamBase deep copies its attributes when it is copied, but the
+        # copy is not a view of the storage and drops the storage anyway.
+        return self
+
+    def clear_grad(self):
+        _zero_inplace(self.flat_grad)
+
+    def holds_grads(self, grads):
+        """
+        Returns whether grads, in the order of the parameters, are still the
+        views of flat_grad, so that flat_grad holds their values. They are
+        not if a gradient is replaced by a new tensor, e.g. by clipping or
+        regularization, or by a backward after `clear_gradient`.
+        """
+        if not all(grad is not None and
+                   grad.value().get_tensor()._is_initialized()
+                   for grad in grads):
+            return False
+        place = _get_device()
+        offset = self.flat_grad.value().get_tensor()._mutable_data(place,
+                                                                   self.dtype)
+        itemsize = core.size_of_dtype(self.dtype)
+        for param, grad in zip(self.params, grads):
+            if grad.value().get_tensor()._mutable_data(place,
+                                                       self.dtype) != offset:
+                return False
+            offset += int(np.prod(param.shape)) * itemsize
+        return True
+
+    def views(self, flat_tensor):
+        """
+        Returns the tensors sharing memory with flat_tensor, which has the
+        same numel as the storage, in the shapes of the parameters.
+        """
+        views = [
+            framework._varbase_creator(dtype=self.dtype) for _ in self.params
+        ]
+        _coalesce_tensors(self.params, views, flat_tensor, copy_data=False)
+        return views
+
+    @staticmethod
+    def split(params, grads=None):
+        """
+        Returns the storages all of whose parameters are in params, and the
+        parameters in params which don't belong to these storages. If grads,
+        the gradients of params, are given, the storages not holding them
+        are left out, and their parameters are returned as the others.
+        """
+        counts = collections.OrderedDict()
+        for param in params:
+            storage = getattr(param, '_flat_storage', None)
+            if storage is not None:
+                counts[storage] = counts.get(storage, 0) + 1
+        storages = [
+            storage for storage, count in counts.items()
+            if count == len(storage.params)
+        ]
+        if grads is not None:
+            grad_of = dict(
+                (id(param), grad) for param, grad in zip(params, grads))
+            storages = [
+                storage for storage in storages
+                if storage.holds_grads(
+                    [grad_of[id(param)] for param in storage.params])
+            ]
+        others = [
+            param for param in params
+            if getattr(param, '_flat_storage', None) not in storages
+        ]
+        return storages, others
+
+
+@no_grad
+def _clear_gradients(params):
+    storages, params = _FlatParameterStorage.split(
+        params, [param._grad_ivar() for param in params])
+    for storage in storages:
+        storage.clear_grad()
+    for param in params:
+        if getattr(param, '_flat_storage', None) is not None:
+            # clear_gradient marks the gradient empty, and the next backward
+            # would replace the view with a new tensor.
+            grad = param._grad_ivar()
+            if grad is not None and grad.value().get_tensor(
+            )._is_initialized():
+                _zero_inplace(grad)
+        else:
+            param.clear_gradient()
+
+
+class _StructureDict(collections.OrderedDict):
+    """ An OrderedDict holding the parameters, buffers, sublayers or state
+    dict hooks of a Layer. Modifying any of them bumps the shared version,
+    which invalidates the cached traversals of all Layers. """
+
+    version = 0
+
+    def __setitem__(self, key, value):
+        super(_StructureDict, self).__setitem__(key, value)
+        _StructureDict.version += 1
+
+    def __delitem__(self, key):
+        super(_StructureDict, self).__delitem__(key)
+        _StructureDict.version += 1
+
+    def pop(self, *args):
+        _StructureDict.version += 1
+        return super(_StructureDict, self).pop(*args)
+
+    def popitem(self, *args, **kwargs):
+        _StructureDict.version += 1
+        return super(_StructureDict, self).popitem(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        _StructureDict.version += 1
+        return super(_StructureDict, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super(_StructureDict, self).update(*args, **kwargs)
+        _StructureDict.version += 1
+
+    def move_to_end(self, *args, **kwargs):
+        super(_StructureDict, self).move_to_end(*args, **kwargs)
+        _StructureDict.version += 1
+
+    def clear(self):
+        super(_StructureDict, self).clear()
+        _StructureDict.version += 1
+
+
+_STRUCTURE_ATTRS = ('_parameters', '_buffers', '_sub_layers',
+                    '_state_dict_hooks')
+
+
 class HookRemoveHelper(object):
     """ A HookRemoveHelper that can be used to remove hook. """
 
@@ -107,12 +299,14 @@ class Layer(core.Layer):
         self._dtype = dtype
         self._init_in_dynamic_mode = framework.in_dygraph_mode()
 
-        self._parameters = collections.OrderedDict()
+        self._parameters = _StructureDict()
         # Buffers the variable (not parameter) created in layer
-        self._buffers = collections.OrderedDict()
+        self._buffers = _StructureDict()
         self._non_persistable_buffer_names_set = set()
-        self._sub_layers = collections.OrderedDict()
+        self._sub_layers = _StructureDict()
         self._loaddict_holder = collections.OrderedDict()
+        # Flattened parameters, buffers and sublayers, see `_traversal`
+        self._traversal_cache = {}
 
         # Record generated op_descs in this layer
         self._op_recorder = LayerOpsRecoder(ops=[], hooks=[])
@@ -126,7 +320,7 @@ class Layer(core.Layer):
 
         self._casted_by_pure_fp16 = False
 
-        self._state_dict_hooks = collections.OrderedDict()
+        self._state_dict_hooks = _StructureDict()
 
     def train(self):
         """
@@ -525,6 +719,21 @@ class Layer(core.Layer):
             dtype=dtype,
             type=core.VarDesc.VarType.LOD_TENSOR)
 
+    def _traversal(self, key, build):
+        # The traversals of the sublayer tree are cached until the parameters,
+        # buffers or sublayers of any Layer change, so that the optimizer and
+        # the training loop can call `parameters()` every step cheaply.
+        cache = self.__dict__.get('_traversal_cache', None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, '_traversal_cache', cache)
+        version = _StructureDict.version
+        cached = cache.get(key, None)
+        if cached is None or cached[0] != version:
+            cached = (version, build())
+            cache[key] = cached
+        return cached[1]
+
     def parameters(self, include_sublayers=True):
         """Returns a list of all Parameters from current layer and its sub-layers.
 
@@ -540,11 +749,11 @@ class Layer(core.Layer):
             print(linear.parameters())  # print linear_0.w_0 and linear_0.b_0
 
         """
-        ret = [
-            param
-            for _, param in self.named_parameters(
-                include_sublayers=include_sublayers)
-        ]
+        ret = list(
+            self._traversal(('parameters', include_sublayers), lambda: tuple(
+                param
+                for _, param in self.named_parameters(
+                    include_sublayers=include_sublayers))))
         return ret
 
     def children(self):
@@ -626,10 +835,11 @@ class Layer(core.Layer):
                 print(mylayer.sublayers())  # [<paddle.nn.layer.common.Linear object at 0x7f44b58977d0>, <paddle.nn.layer.common.Dropout object at 0x7f44b58978f0>]
 
         """
-        ret = [
-            layer
-            for _, layer in self.named_sublayers(include_self=include_self)
-        ]
+        ret = list(
+            self._traversal(('sublayers', include_self), lambda: tuple(
+                layer
+                for _, layer in self.named_sublayers(
+                    include_self=include_self))))
         return ret
 
     def named_parameters(self, prefix='', include_sublayers=True):
@@ -656,18 +866,26 @@ class Layer(core.Layer):
                     print(name, param)
 
         """
-        params_set = set()
+        named_parameters = self._traversal(
+            ('named_parameters', prefix, include_sublayers),
+            lambda: tuple(
+                self._named_members('_parameters', prefix, include_sublayers)))
+        for name, param in named_parameters:
+            yield name, param
+
+    def _named_members(self, attr, prefix, include_sublayers):
+        members_set = set()
         named_sublayers = self.named_sublayers(
             prefix=prefix,
             include_self=True) if include_sublayers else zip([prefix], [self])
         for layer_prefix, sublayer in named_sublayers:
-            params = sublayer._parameters.items()
-            for key, param in params:
-                if param is None or param in params_set:
+            members = getattr(sublayer, attr).items()
+            for key, member in members:
+                if member is None or member in members_set:
                     continue
-                params_set.add(param)
+                members_set.add(member)
                 name = layer_prefix + ('.' if layer_prefix else '') + key
-                yield name, param
+                yield name, member
 
     def named_sublayers(self, prefix='', include_self=False, layers_set=None):
         """
@@ -695,7 +913,14 @@ class Layer(core.Layer):
 
         """
         if layers_set is None:
-            layers_set = set()
+            for p, l in self._traversal(
+                ('named_sublayers', prefix, include_self), lambda: tuple(
+                    self.named_sublayers(
+                        prefix=prefix,
+                        include_self=include_self,
+                        layers_set=set()))):
+                yield p, l
+            return
         if include_self and self not in layers_set:
             layers_set.add(self)
             yield prefix, self
@@ -797,11 +1022,11 @@ class Layer(core.Layer):
                 print(linear.buffers())     # == print([linear.buf_name])
 
         """
-        ret = [
-            buffer
-            for _, buffer in self.named_buffers(
-                include_sublayers=include_sublayers)
-        ]
+        ret = list(
+            self._traversal(('buffers', include_sublayers), lambda: tuple(
+                buffer
+                for _, buffer in self.named_buffers(
+                    include_sublayers=include_sublayers))))
         return ret
 
     def named_buffers(self, prefix='', include_sublayers=True):
@@ -840,18 +1065,12 @@ class Layer(core.Layer):
                     print(name, buffer)
 
         """
-        buffers_set = set()
-        named_sublayers = self.named_sublayers(
-            prefix=prefix,
-            include_self=True) if include_sublayers else zip([prefix], [self])
-        for layer_prefix, sublayer in named_sublayers:
-            buffers = sublayer._buffers.items()
-            for key, buffer in buffers:
-                if buffer is None or buffer in buffers_set:
-                    continue
-                buffers_set.add(buffer)
-                name = layer_prefix + ('.' if layer_prefix else '') + key
-                yield name, buffer
+        named_buffers = self._traversal(
+            ('named_buffers', prefix, include_sublayers),
+            lambda: tuple(
+                self._named_members('_buffers', prefix, include_sublayers)))
+        for name, buffer in named_buffers:
+            yield name, buffer
 
     def clear_gradients(self):
         """
@@ -877,9 +1096,67 @@ class Layer(core.Layer):
                 linear.clear_gradients()
 
         """
-        for p in self.parameters():
-            if p.trainable:
-                p.clear_gradient()
+        _clear_gradients([p for p in self.parameters() if p.trainable])
+
+    @framework.dygraph_only
+    def flatten_parameters(self, include_sublayers=True):
+        """
+        Rebinds the trainable parameters of this layer and their gradients
+        as views of one contiguous tensor per dtype, so that zeroing the
+        gradients, clipping them by global norm and all-reducing them run
+        one op on each contiguous tensor instead of one op per parameter.
+
+        The parameters without gradients get zero gradients, and sparse
+        gradients are accumulated into the dense views. Parameters on
+        other places than the current one, and the parameters already
+        flattened are skipped. The gradients must be cleared by
+        ``clear_gradients`` of the layer or ``clear_grad`` of the optimizer
+        afterwards, ``Tensor.clear_gradient`` releases the views.
+
+        Parameters:
+            include_sublayers(bool, optional): Whether to flatten the parameters of the sublayers. Default: True.
+
+        Returns:
+            None
+
+        Examples:
+            .. code-block:: python
+
+                import paddle
+
+                model = paddle.nn.Sequential(
+                    paddle.nn.Linear(10, 10), paddle.nn.Linear(10, 1))
+                model.flatten_parameters()
+                clip = paddle.nn.ClipGradByGlobalNorm(clip_norm=1.0)
+                sgd = paddle.optimizer.SGD(learning_rate=0.1,
+                                           parameters=model.parameters(),
+                                           grad_clip=clip)
+                loss = paddle.mean(model(paddle.rand([4, 10])))
+                loss.backward()
+                sgd.step()
+                sgd.clear_grad()
+        """
+        place = _get_device()
+        params_groups = collections.OrderedDict()
+        for param in self.parameters(include_sublayers):
+            if not param.trainable or getattr(param, '_flat_storage',
+                                              None) is not None:
+                continue
+            if not param.place._equals(place):
+                continue
+            if param.dtype not in (core.VarDesc.VarType.FP32,
+                                   core.VarDesc.VarType.FP64,
+                                   core.VarDesc.VarType.FP16):
+                continue
+            # coalesce_tensor has no float16 kernel on CPU
+            if param.dtype == core.VarDesc.VarType.FP16 and \
+                    not param.place.is_gpu_place():
+                continue
+            params_groups.setdefault(param.dtype, []).append(param)
+
+        with no_grad():
+            for params in params_groups.values():
+                _FlatParameterStorage(params)
 
     def _build_once(self, *args, **kwargs):
         pass
@@ -1089,10 +1366,14 @@ class Layer(core.Layer):
             self._op_recorder.hooks.append(post_hook_helper)
 
     def __getstate__(self):
-        return self.__dict__
+        state = self.__dict__.copy()
+        # the cached versions are meaningless in another process
+        state.pop('_traversal_cache', None)
+        return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
+        self.__dict__['_traversal_cache'] = {}
 
     def __getattr__(self, name):
         if '_parameters' in self.__dict__:
@@ -1190,6 +1471,9 @@ class Layer(core.Layer):
                         # it will be remarked as a buffer with same `persistable` attribute.
                         _buffers[name] = None
                 else:
+                    if name in _STRUCTURE_ATTRS and isinstance(value, dict):
+                        value = _StructureDict(value)
+                        _StructureDict.version += 1
                     object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
@@ -1286,6 +1570,12 @@ class Layer(core.Layer):
         """
 
         if destination is None:
+            key = ('state_dict', include_sublayers, structured_name_prefix,
+                   include_non_persistable_buffer)
+            items = self._traversal(
+                key, lambda: self._state_dict_items(*key[1:]))
+            if items is not None:
+                return collections.OrderedDict(items)
             destination = collections.OrderedDict()
         for name, data in self._parameters.items():
             if data is not None:
@@ -1316,6 +1606,19 @@ class Layer(core.Layer):
 
         return destination
 
+    def _state_dict_items(self, include_sublayers, structured_name_prefix,
+                          include_non_persistable_buffer):
+        # state dict hooks may return different tensors on each call
+        layers = self.sublayers(
+            include_self=True) if include_sublayers else [self]
+        if any(len(layer._state_dict_hooks) > 0 for layer in layers):
+            return None
+        return tuple(
+            self._state_dict_impl(
+                collections.OrderedDict(), include_sublayers,
+                structured_name_prefix, include_non_persistable_buffer)
+            .items())
+
     def to_static_state_dict(self,
                              destination=None,
                              include_sublayers=True,
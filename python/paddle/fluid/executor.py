@@ -19,6 +19,8 @@ import os
 import multiprocessing
 import sys
 import warnings
+import weakref
+import collections
 import numpy as np
 from .wrapped_decorator import signature_safe_contextmanager
 import six
@@ -32,6 +34,7 @@ from .. import compat as cpt
 from .trainer_factory import TrainerFactory
 from .trainer_factory import FetchHandlerMonitor
 import copy
+import functools
 from . import framework
 from .incubate.checkpoint import auto_checkpoint as acp
 
@@ -395,8 +398,19 @@ def _is_enable_standalone_executor():
     return flag
 
 
+def _get_executor_cache_capacity():
+    """
+    The max number of entries of each program cache in Executor, which is
+    set by `FLAGS_EXECUTOR_CACHE_CAPACITY`, and 0 means unbounded.
+    """
+    env_val = os.environ.get('FLAGS_EXECUTOR_CACHE_CAPACITY', None)
+    if env_val is None or env_val == '':
+        return 128
+    return int(env_val)
+
+
 def _get_strong_program_cache_key(program, feed, fetch_list):
-    return str(id(program)) + _get_program_cache_key(feed, fetch_list)
+    return (id(program), ) + _get_program_cache_key(feed, fetch_list)
 
 
 def _get_program_cache_key(feed, fetch_list):
@@ -407,7 +421,8 @@ def _get_program_cache_key(feed, fetch_list):
         for i, each in enumerate(feed):
             feed_var_names += list(each.keys())
     fetch_var_names = list(map(_to_name_str, fetch_list))
-    return str(feed_var_names + fetch_var_names)
+    # keep feed and fetch names apart, so that they never collide
+    return tuple(feed_var_names), tuple(fetch_var_names)
 
 
 def _as_lodtensor(data, place, dtype=None):
@@ -579,11 +594,93 @@ class _StandaloneExecutor(object):
         return res
 
 
+class _LRUCache(object):
+    """
+    A dict-like cache which keeps at most `capacity` entries and evicts the
+    least recently used one when it is full. `on_evict(key, value)` is
+    called for every entry evicted by capacity or by `evict`.
+    """
+
+    def __init__(self, capacity=None, on_evict=None):
+        self._capacity = capacity if capacity and capacity > 0 else None
+        self._on_evict = on_evict
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getitem__(self, key):
+        return self._entries[key]
+
+    def __setitem__(self, key, value):
+        if key in self._entries:
+            del self._entries[key]
+        self._entries[key] = value
+        while self._capacity is not None and len(
+                self._entries) > self._capacity:
+            self.evict(next(iter(self._entries)))
+
+    def keys(self):
+        return list(self._entries.keys())
+
+    def get(self, key, default=None):
+        if key not in self._entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        value = self._entries.pop(key)
+        self._entries[key] = value
+        return value
+
+    def pop(self, key, default=None):
+        """
+        Remove the entry of key without calling `on_evict`.
+        """
+        return self._entries.pop(key, default)
+
+    def evict(self, key):
+        if key not in self._entries:
+            return
+        value = self._entries.pop(key)
+        self.evictions += 1
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'capacity': self._capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def _evict_collected_program(executor_ref, program_id):
+    executor = executor_ref()
+    if executor is not None:
+        executor._evict_program(program_id)
+
+
+def _evict_run_cache_entry(executor_ref, is_scope, key, value):
+    # refers to the executor weakly, so that its caches do not keep it in a
+    # reference cycle
+    executor = executor_ref()
+    if executor is not None:
+        executor._evict_run_cache(key, value if is_scope else None)
+
+
 class _ExecutorCache(object):
-    def __init__(self, place):
-        # {Program : _StandaloneExecutor}
+    def __init__(self, place, capacity=None):
+        # {id(Program) : _StandaloneExecutor}
         self._place = place
-        self._cached_executors = {}
+        self._cached_executors = _LRUCache(capacity)
 
     def run(self, program, feed, fetch_list, return_numpy=True):
         new_exe = self._get_exe_from_cache(program)
@@ -597,11 +694,147 @@ class _ExecutorCache(object):
         assert isinstance(
             program, Program), "Required type(Program), but received {}".format(
                 type(program).__name__)
-        if program not in self._cached_executors:
+        new_exe = self._cached_executors.get(id(program))
+        if new_exe is None:
             new_exe = _StandaloneExecutor(self._place, program)
-            self._cached_executors[program] = new_exe
+            self._cached_executors[id(program)] = new_exe
 
-        return self._cached_executors[program]
+        return new_exe
+
+
+class _PreparedProgram(object):
+    """
+    The feed and fetch plumbing of a program prepared by `Executor.prepare`,
+    which is validated once and reused by every `run`. The numpy inputs are
+    written into reusable LoDTensors instead of creating new ones.
+    """
+
+    def __init__(self, executor, program, feed_names, fetch_list, scope,
+                 feed_var_name, fetch_var_name, return_numpy):
+        self._executor = executor
+        self._place = executor.place
+        self._parent_scope = scope
+        self._feed_var_name = feed_var_name
+        self._fetch_var_name = fetch_var_name
+        self._return_numpy = return_numpy
+        self._feed_names = list(feed_names)
+
+        feed = dict((name, None) for name in self._feed_names)
+        self._program = executor._add_feed_fetch_ops(
+            program=program,
+            feed=feed,
+            fetch_list=fetch_list,
+            feed_var_name=feed_var_name,
+            fetch_var_name=fetch_var_name)
+        fetch_list_str = list(map(_to_name_str, fetch_list))
+        self._ctx = executor._default_executor.prepare(
+            self._program.desc, 0, fetch_list_str, False)
+        self._scope = scope.new_scope()
+        executor._default_executor.create_variables(self._program.desc,
+                                                    self._scope, 0)
+        # The fetch holder is persistable and thus created in the root scope,
+        # create a local one so that the programs prepared in different
+        # scopes never write the same holder when run concurrently.
+        self._scope.var(fetch_var_name).get_fetch_list()
+
+        # {feed name : (col, var, numpy dtype, reusable LoDTensor)}
+        slots = {}
+        global_block = self._program.global_block()
+        for op in global_block.ops:
+            if op.desc.type() != 'feed':
+                break
+            name = op.desc.output('Out')[0]
+            var = global_block.var(name)
+            np_dtype = None
+            if var.dtype != core.VarDesc.VarType.STRINGS:
+                np_dtype = np.dtype(convert_dtype(var.dtype))
+            slots[name] = (op.desc.attr('col'), var, np_dtype,
+                           core.LoDTensor())
+        self._slots = [slots.get(name, None) for name in self._feed_names]
+
+    def _set_feed(self, slot, value):
+        col, var, np_dtype, tensor = slot
+        if np_dtype is None or isinstance(value, core.LoDTensor):
+            if np_dtype is not None:
+                check_feed_shape_type(var, value)
+        elif not isinstance(value, np.ndarray):
+            value = _as_lodtensor(value, self._place, var.dtype)
+            check_feed_shape_type(var, value)
+        else:
+            if var.desc.need_check_feed():
+                if not dimension_is_compatible_with(value.shape, var.shape):
+                    raise ValueError(
+                        'The fed Variable %r should have dimensions = %d, '
+                        'shape = %r, but received fed shape %r on each device'
+                        % (var.name, len(var.shape), var.shape,
+                           list(value.shape)))
+                if value.dtype != np_dtype:
+                    raise ValueError(
+                        'The data type of fed Variable %r must be %r, but '
+                        'received %r' % (var.name, np_dtype.name,
+                                         value.dtype.name))
+            tensor.set(value, self._place)
+            value = tensor
+        core.set_feed_variable(self._scope, value, self._feed_var_name, col)
+
+    def run(self, feed):
+        """
+        Run the prepared program.
+
+        Args:
+            feed(dict|list|tuple): The inputs, either a dict which maps the
+                feed names to values, or a list of values in the order of
+                the feed names given to `Executor.prepare`.
+
+        Returns:
+            List: The fetched results, in the same format as `Executor.run`.
+        """
+        from paddle.optimizer.lr import LRScheduler
+        if isinstance(feed, dict):
+            missing = [name for name in self._feed_names if name not in feed]
+            if missing:
+                raise ValueError("The feed of {} is missing.".format(missing))
+            values = [feed[name] for name in self._feed_names]
+        else:
+            if len(feed) != len(self._feed_names):
+                raise ValueError(
+                    "Expect {} feed values for {}, but received {}.".format(
+                        len(self._feed_names), self._feed_names, len(feed)))
+            values = feed
+
+        for slot, value in zip(self._slots, values):
+            if slot is not None:
+                self._set_feed(slot, value)
+
+        program = self._program
+        if hasattr(program, 'lr_sheduler'):
+            assert isinstance(program.lr_sheduler,
+                              LRScheduler), "must be LRScheduler"
+            lr_sheduler = program.lr_sheduler
+            lr_var = program.global_block().vars[lr_sheduler._var_name]
+            data = np.array([lr_sheduler()]).astype(
+                convert_dtype(lr_var.dtype))
+            tensor = core.get_variable_tensor(self._scope,
+                                              lr_sheduler._var_name)
+            tensor.set(data, self._place)
+
+        self._executor._default_executor.run_prepared_ctx(
+            self._ctx, self._scope, False, False, False)
+        arr = self._scope.find_var(self._fetch_var_name).get_fetch_list()
+        tensors = arr._move_to_list()
+        if self._return_numpy:
+            return as_numpy(tensors)
+        return tensors
+
+    def close(self):
+        """
+        Release the scope of the prepared program, which can not be run
+        after that.
+        """
+        if self._scope is not None:
+            self._parent_scope._delete_kid(self._scope)
+            self._scope = None
+            self._ctx = None
 
 
 class Executor(object):
@@ -685,16 +918,29 @@ class Executor(object):
             self.place = expected_place
         else:
             self.place = framework._get_paddle_place(place)
-        self.program_caches = dict()
-        self.ctx_caches = dict()
-        self.scope_caches = dict()
+        # NOTE: the cached program, ctx and scope of a key are evicted
+        # together, since the ctx refers to the desc of the cached program.
+        capacity = _get_executor_cache_capacity()
+        self_ref = weakref.ref(self)
+        self.program_caches = _LRUCache(
+            capacity,
+            functools.partial(_evict_run_cache_entry, self_ref, False))
+        self.ctx_caches = _LRUCache(
+            capacity,
+            functools.partial(_evict_run_cache_entry, self_ref, False))
+        self.scope_caches = _LRUCache(
+            capacity, functools.partial(_evict_run_cache_entry, self_ref, True))
         self.var_caches = dict()
-        self.pruned_program_caches = dict()
+        self.pruned_program_caches = _LRUCache(capacity)
         p = core.Place()
         p.set_place(self.place)
         self._default_executor = core.Executor(p)
         self._closed = False
-        self.pruned_program_scope_caches = dict()
+        self.pruned_program_scope_caches = _LRUCache(capacity)
+        # {cache key : the parent of the cached scope}
+        self._cached_scope_parents = dict()
+        # ids of the programs whose collection evicts their cache entries
+        self._tracked_programs = set()
         self._prepare_to_run_called = False
 
         self._auto_checkpoint_name = unique_name.generate(
@@ -702,7 +948,55 @@ class Executor(object):
 
         # NOTE: Whether to use experimental executor `StandaloneExecutor`.
         self._enable_interpreter_core = _is_enable_standalone_executor()
-        self._executor_cache = _ExecutorCache(self.place)
+        self._executor_cache = _ExecutorCache(self.place, capacity)
+
+    def _track_program(self, program):
+        """
+        Evict the cache entries keyed by the id of program once it is
+        collected, so that a new program reusing the id never hits them.
+        """
+        program_id = id(program)
+        if program_id in self._tracked_programs:
+            return
+        self._tracked_programs.add(program_id)
+        finalizer = weakref.finalize(program, _evict_collected_program,
+                                     weakref.ref(self), program_id)
+        # scopes may have been released at exit
+        finalizer.atexit = False
+
+    def _evict_program(self, program_id):
+        self._tracked_programs.discard(program_id)
+        for cache in (self.program_caches, self.ctx_caches,
+                      self.scope_caches, self.pruned_program_caches,
+                      self.pruned_program_scope_caches):
+            for key in cache.keys():
+                if key[0] == program_id:
+                    cache.evict(key)
+        self._executor_cache._cached_executors.evict(program_id)
+
+    def _evict_run_cache(self, key, scope=None):
+        self.program_caches.pop(key)
+        self.ctx_caches.pop(key)
+        scope = self.scope_caches.pop(key, scope)
+        parent = self._cached_scope_parents.pop(key, None)
+        if scope is not None and parent is not None:
+            parent._delete_kid(scope)
+
+    def _cache_stats(self):
+        """
+        Return the size, capacity, hits, misses and evictions of every
+        program cache, which is useful to monitor a long-running service.
+        """
+        return {
+            'program_caches': self.program_caches.stats(),
+            'ctx_caches': self.ctx_caches.stats(),
+            'scope_caches': self.scope_caches.stats(),
+            'pruned_program_caches': self.pruned_program_caches.stats(),
+            'pruned_program_scope_caches':
+            self.pruned_program_scope_caches.stats(),
+            'executor_caches':
+            self._executor_cache._cached_executors.stats(),
+        }
 
     def _get_scope_cache(self, program_cache_key):
         return self.scope_caches.get(program_cache_key, None)
@@ -809,6 +1103,72 @@ class Executor(object):
         ]
         return outs
 
+    def prepare(self,
+                program=None,
+                feed_names=None,
+                fetch_list=None,
+                scope=None,
+                feed_var_name='feed',
+                fetch_var_name='fetch',
+                return_numpy=True):
+        """
+        Prepare the program for running repeatedly with the same feed names
+        and fetch list. The feed and fetch operators, the feed variables and
+        the execution context are created and checked once, and the returned
+        handle only writes the inputs into reusable tensors on every run,
+        which reduces the overhead of running small batches, e.g. in online
+        serving.
+
+        Args:
+            program(Program, optional): The program to be prepared. If this
+                parameter is not set, the default main program is used.
+            feed_names(list|tuple, optional): The names of the variables to
+                be fed. Default is None, which means nothing is fed.
+            fetch_list(list, optional): The Variables or the names of
+                Variables to be fetched. Default is None.
+            scope(Scope, optional): The parent scope of the scope in which
+                the program runs. Default is the global scope.
+            feed_var_name(str, optional): The name of the feed holder
+                variable. Default is 'feed'.
+            fetch_var_name(str, optional): The name of the fetch holder
+                variable. Default is 'fetch'.
+            return_numpy(bool, optional): Whether to convert the fetched
+                results to numpy.ndarray. Default is True.
+
+        Returns:
+            A handle whose ``run(feed)`` runs the program, where ``feed`` is
+            a dict or a list of values in the order of ``feed_names``. Call
+            its ``close()`` to release the scope it holds.
+
+        Examples:
+            .. code-block:: python
+
+              import numpy as np
+              import paddle
+
+              paddle.enable_static()
+              exe = paddle.static.Executor(paddle.CPUPlace())
+              x = paddle.static.data(name='x', shape=[None, 4], dtype='float32')
+              out = paddle.scale(x, scale=2.0)
+
+              prepared = exe.prepare(feed_names=['x'], fetch_list=[out])
+              for _ in range(10):
+                  res, = prepared.run([np.ones([2, 4], dtype='float32')])
+              prepared.close()
+        """
+        if program is None:
+            program = default_main_program()
+        if not isinstance(program, Program):
+            raise TypeError(
+                "Executor.prepare requires Program as its Parameter. But you "
+                "passed in %s" % (type(program)))
+        if scope is None:
+            scope = global_scope()
+        fetch_list = self._check_fetch_list(fetch_list)
+        return _PreparedProgram(self, program, feed_names or [], fetch_list,
+                                scope, feed_var_name, fetch_var_name,
+                                return_numpy)
+
     def _split_optimize_ops_in_fetch_list(self, fetch_list):
         """
         Split optimize_ops from fetch_list, which provided to specify program prunning.
@@ -1297,6 +1657,7 @@ class Executor(object):
         # NOTE: This is an experimental feature. If `export FLAGS_USE_STANDALONE_EXECUTOR=1 `,
         # use StandaloneExecutor to run the program.
         if self._enable_interpreter_core and not program._is_start_up_program_:
+            self._track_program(program)
             return self._executor_cache.run(program, feed, fetch_list,
                                             return_numpy)
 
@@ -1308,21 +1669,22 @@ class Executor(object):
         if optimize_ops:
             use_prune = True
         if use_prune:
+            self._track_program(program)
             cache_key = _get_strong_program_cache_key(program, feed,
                                                       _origin_fetch_list)
             cached_pruned_program = self._get_pruned_program_cache(cache_key)
             if cached_pruned_program is None:
                 if isinstance(program, compiler.CompiledProgram):
                     program_scope_cache = self._get_pruned_program_scope_cache(
-                        str(id(_origin_program)))
+                        (id(_origin_program), ))
                     # copy the original program, so it can be cached.
                     program = copy.copy(program)
                     # share the local scopes for same original CompiledProgram.
                     program._share_vars_from = program_scope_cache
                     if self._get_pruned_program_scope_cache(
-                            str(id(_origin_program))) is None:
+                            (id(_origin_program), )) is None:
                         self._add_pruned_program_scope_cache(
-                            str(id(_origin_program)), program)
+                            (id(_origin_program), ), program)
                 pruned_program = self._prune_program(program, feed, fetch_list,
                                                      optimize_ops)
                 self._add_pruned_program_cache(cache_key, pruned_program)
@@ -1425,6 +1787,7 @@ class Executor(object):
                 % (type(fetch_var_name)))
 
         if use_program_cache:
+            self._track_program(program)
             cache_key = _get_strong_program_cache_key(program, feed, fetch_list)
             cached_program = self._get_program_cache(cache_key)
             cached_ctx = self._get_ctx_cache(cache_key)
@@ -1450,6 +1813,7 @@ class Executor(object):
                                                         cached_scope, 0)
                 self._add_ctx_cache(cache_key, cached_ctx)
                 self._add_scope_cache(cache_key, cached_scope)
+                self._cached_scope_parents[cache_key] = scope
             program = cached_program
             ctx = cached_ctx
             scope = cached_scope
@@ -1729,6 +2093,7 @@ class Executor(object):
         assert program._pipeline_opt is not None
         assert dataset is None, "dataset should be None for pipeline mode"
 
+        self._track_program(program)
         cache_key = _get_strong_program_cache_key(program, None, fetch_list)
         ctx = self._get_ctx_cache(cache_key)
         if use_program_cache and ctx is not None:
@@ -992,6 +992,7 @@ class Variable(object):
         self.desc = self.block.desc.find_var(cpt.to_bytes(name))
 
         if self.desc is None:
+            version = self.block.desc._version()
             self.desc = self.block.desc.var(cpt.to_bytes(name))
             is_new_var = True
 
@@ -1059,10 +1060,26 @@ class Variable(object):
                 pass
 
         self.block.vars[name] = self
+        if is_new_var:
+            self.block._mark_synced(version)
         self.op = None
         self.stop_gradient = stop_gradient
         self.is_data = is_data
 
+    @property
+    def op(self):
+        """
+        The Operator which generates this Variable, if any.
+        """
+        if self._op is None and self.block._deferred_op_descs is not None:
+            # the op of a cloned var is set when the Operators are created
+            self.block._materialize_ops()
+        return self._op
+
+    @op.setter
+    def op(self, op):
+        self._op = op
+
     def detach(self):
         """
         Returns a new Variable, detached from the current graph.
@@ -2877,9 +2894,60 @@ class Block(object):
     def __init__(self, program, idx):
         self.desc = program.desc.block(idx)
         self.vars = collections.OrderedDict()  # var_name --> var
-        self.ops = list()  # operator list
+        self._ops = list()  # operator list
         self.program = program
         self.removed_vars = collections.OrderedDict()
+        # the version of desc which vars and ops are in sync with, see
+        # `_sync_with_cpp`
+        self._synced_version = None
+        # the op descs whose Operators are not created yet, see `_defer_ops`
+        self._deferred_op_descs = None
+        self._deferred_version = None
+
+    @property
+    def ops(self):
+        if self._deferred_op_descs is not None:
+            self._materialize_ops()
+        return self._ops
+
+    @ops.setter
+    def ops(self, ops):
+        self._deferred_op_descs = None
+        self._ops = ops
+
+    def _defer_ops(self):
+        """
+        Create the Operators of the ops in desc on the first access of
+        `ops` instead of now, which saves the time of creating programs
+        from a desc, e.g. by clone or prune, whose ops are not all visited
+        from Python. It can only be called on a block without Operators.
+        """
+        assert len(self._ops) == 0
+        self._deferred_op_descs = [
+            self.desc.op(i) for i in six.moves.range(self.desc.op_size())
+        ]
+        self._deferred_version = self.desc._version()
+
+    def _materialize_ops(self):
+        op_descs = self._deferred_op_descs
+        self._deferred_op_descs = None
+        if self.desc._version() != self._deferred_version:
+            # skip the ops removed from desc behind the Python side, the ops
+            # added are synced by `_sync_with_cpp` as usual
+            alive = set(
+                id(self.desc.op(i))
+                for i in six.moves.range(self.desc.op_size()))
+            op_descs = [d for d in op_descs if id(d) in alive]
+        self._ops.extend(Operator(self, d) for d in op_descs)
+
+    def _mark_synced(self, version, num_changes=1):
+        """
+        Mark the Python side in sync with the desc again after mirroring
+        `num_changes` changes made to the desc at `version`. If it was not
+        in sync before, the next `_sync_with_cpp` still does a full sync.
+        """
+        if self._synced_version == version:
+            self._synced_version = version + num_changes
 
     def __str__(self):
         return self._to_readable_code()
@@ -3176,8 +3244,10 @@ class Block(object):
     def _remove_var(self, name, sync=True):
         if sync == True:
             self._sync_with_cpp()
+        version = self.desc._version()
         self.desc._remove_var(cpt.to_bytes(name))
         del self.vars[name]
+        self._mark_synced(version)
 
     def create_parameter(self, *args, **kwargs):
         global_block = self.program.global_block()
@@ -3250,6 +3320,7 @@ class Block(object):
         else:
             from paddle.fluid.dygraph.base import param_guard
 
+            version = self.desc._version()
             op_desc = self.desc.append_op()
             # NOTE(Aurelius84): In case of @to_static, all VarBase(s) should
             # be converted into Variable(s) with same name and block location.
@@ -3266,6 +3337,7 @@ class Block(object):
                     attrs=kwargs.get("attrs", None))
 
             self.ops.append(op)
+            self._mark_synced(version)
 
         return op
 
@@ -3293,9 +3365,11 @@ class Block(object):
         Returns:
             Operator: the insert Operator.
         """
+        version = self.desc._version()
         op_desc = self.desc._insert_op(index)
         op = Operator(block=self, desc=op_desc, *args, **kwargs)
         self.ops.insert(index, op)
+        self._mark_synced(version)
         return op
 
     def _remove_op(self, index, sync=True):
@@ -3310,8 +3384,14 @@ class Block(object):
         """
         if sync == True:
             self._sync_with_cpp()
+        # create the deferred Operators before changing the desc, otherwise
+        # they would be created without the removed op, which is removed
+        # from them once more below
+        ops = self.ops
+        version = self.desc._version()
         self.desc._remove_op(index, index + 1)
-        del self.ops[index]
+        del ops[index]
+        self._mark_synced(version)
 
     def _slice_ops(self, start, end):
         """
@@ -3339,6 +3419,7 @@ class Block(object):
                                        if attrs else {},
                                        kwargs.get("stop_gradient", False))
         else:
+            version = self.desc._version()
             op_desc = self.desc._prepend_op()
             op = Operator(
                 self,
@@ -3348,6 +3429,7 @@ class Block(object):
                 outputs=kwargs.get("outputs", None),
                 attrs=kwargs.get("attrs", None))
             self.ops.insert(0, op)
+            self._mark_synced(version)
 
         return op
 
@@ -3355,7 +3437,15 @@ class Block(object):
         """
         Sync from the desc on the c++ end. This method is used to synchronize
         the c++ desc instance generated by backward.
+
+        The desc counts the ops and vars added or removed as its version, and
+        the mutators of Block mirror their changes on both ends, so nothing
+        is done if the desc is not changed behind the Python side.
         """
+        version = self.desc._version()
+        if version == self._synced_version:
+            return
+
         # sync variables from cpp
         for var in self.desc.all_vars():
             if not self.has_var(var.name()):
@@ -3382,56 +3472,27 @@ class Block(object):
             if not self.desc.find_var(cpt.to_bytes(var)):
                 self.vars.pop(var)
 
-        # sync operators from cpp
-        ops_in_cpp = []
-        for op_idx in range(0, self.desc.op_size()):
-            ops_in_cpp.append(self.desc.op(op_idx))
-
-        if len(self.ops) != 0:
-            first_op_in_python = self.ops[0].desc
-            last_op_in_python = self.ops[len(self.ops) - 1].desc
-            start_index = None
-            end_index = None
-            for index in range(len(ops_in_cpp)):
-                if first_op_in_python == ops_in_cpp[index]:
-                    start_index = index
-                if last_op_in_python == ops_in_cpp[index]:
-                    end_index = index
-            assert start_index is not None
-            assert end_index is not None
-            assert start_index <= end_index
-        else:
-            start_index = 0
-            end_index = -1
-
-        # sync ops append to the head of cpp_ops
-        for index in range((start_index - 1 - 1), -1, -1):
-            op_desc = ops_in_cpp[index]
-            op = Operator(self, op_desc)
-            self.ops.insert(0, op)
-
-        # sync ops append to the end of cpp_ops
-        for index in range((end_index + 1), len(ops_in_cpp)):
-            op_desc = ops_in_cpp[index]
-            op = Operator(self, op_desc)
-            self.ops.append(op)
-
-        # sync ops removed from c++ end
-        if end_index != -1 and end_index < len(self.ops):
-            ops_in_cpp_index = 0
-            ops_in_python_index = 0
-            while ops_in_python_index < len(
-                    self.ops) and ops_in_cpp_index < len(ops_in_cpp):
-                if self.ops[ops_in_python_index].desc != ops_in_cpp[
-                        ops_in_cpp_index]:
-                    del self.ops[ops_in_python_index]
-                else:
-                    ops_in_cpp_index += 1
-                    ops_in_python_index += 1
-
-        assert len(self.ops) == len(ops_in_cpp)
-        for index in range(len(self.ops)):
-            assert self.ops[index].desc == ops_in_cpp[index]
+        if (self._deferred_op_descs is not None and
+                version == self._deferred_version):
+            # the deferred ops are still all the ops in desc
+            self._synced_version = version
+            return
+
+        # sync operators from cpp. An OpDesc is returned by the same Python
+        # object as long as an Operator holds it, so the Operators are
+        # matched to the ops in cpp by the id of their desc.
+        ops_in_python = dict((id(op.desc), op) for op in self.ops)
+        synced_ops = []
+        for op_idx in range(self.desc.op_size()):
+            op_desc = self.desc.op(op_idx)
+            op = ops_in_python.get(id(op_desc), None)
+            if op is None:
+                op = Operator(self, op_desc)
+            synced_ops.append(op)
+        # update in place, since the list may be referred elsewhere
+        self.ops[:] = synced_ops
+
+        self._synced_version = version
 
     def _copy_param_info_from(self, other):
         """
@@ -4390,6 +4451,38 @@ class IrGraph(object):
             desc._set_attr(name, val)
 
 
+def _inference_optimize_desc(desc, prune_read_op=True):
+    """
+    Adjust a ProgramDesc for inference in place, see
+    `Program._inference_optimize`.
+    """
+    # remove all readers and the read_op if exist
+    read_op_idx = 0
+    root_block = desc.block(0)
+    if prune_read_op:
+        while True:
+            if read_op_idx >= root_block.op_size() or root_block.op(
+                    read_op_idx).type() == 'read':
+                break
+            read_op_idx += 1
+        if read_op_idx < root_block.op_size():
+            root_block._remove_op(0, read_op_idx + 1)
+        for var in root_block.all_vars():
+            if var.type() == core.VarDesc.VarType.READER:
+                root_block._remove_var(cpt.to_bytes(var.name()))
+
+    # change all `is_test` attributes to True
+    for i in six.moves.range(desc.num_blocks()):
+        block = desc.block(i)
+        for j in six.moves.range(block.op_size()):
+            op = block.op(j)
+            if op.has_attr('is_test'):
+                op._set_attr('is_test', True)
+            if op.type() == "batch_norm":
+                # Remove the output ReserveSpace of batch_norm if exists.
+                op.remove_output("ReserveSpace")
+
+
 class Program(object):
     """
     Create Python Program.  It has at least one :ref:`api_guide_Block_en`, when the
@@ -4574,6 +4667,8 @@ class Program(object):
         for idx in range(block_num):
             block = self.blocks[idx]
             block.vars.clear()
+            # the deferred ops are dropped without creating their Operators
+            block._deferred_op_descs = None
             block.ops.clear()
 
         for idx in range(block_num):
@@ -4592,14 +4687,9 @@ class Program(object):
                 kwargs['block'] = block
                 clazz(**kwargs)
 
-        # then append op
-        for idx in range(block_num):
-            block = self.blocks[idx]
-            block_desc = self.desc.block(idx)
-            for op_idx in range(block_desc.op_size()):
-                op_desc = block_desc.op(op_idx)
-                op = Operator(block=block, desc=op_desc)
-                block.ops.append(op)
+        # then the ops, whose Operators are created on first access
+        for block in self.blocks:
+            block._defer_ops()
 
     def global_seed(self, seed=0):
         """
@@ -5043,15 +5133,13 @@ class Program(object):
 
         pruned_origin_block_id_map = None
         if for_test:
-            forward_prog = Program()
-            forward_prog.desc, pruned_origin_block_id_map = core.prune_backward(
+            p = Program()
+            p.desc, pruned_origin_block_id_map = core.prune_backward(
                 self.desc)
-            forward_prog.blocks = [
-                Block(forward_prog, i)
-                for i in six.moves.range(forward_prog.desc.num_blocks())
-            ]
-            forward_prog._sync_with_cpp()
-            p = forward_prog._inference_optimize(prune_read_op=False)
+            # the pruned desc is owned by p only, so it is changed for
+            # inference in place rather than copied again
+            _inference_optimize_desc(p.desc, prune_read_op=False)
+            p._create_blocks_from_desc()
         else:
             p = Program()
             p.current_block_idx = self.current_block_idx
@@ -5060,6 +5148,8 @@ class Program(object):
             p.blocks = [
                 Block(p, i) for i in six.moves.range(self.desc.num_blocks())
             ]
+            for block in p.blocks:
+                block._defer_ops()
 
             p._current_role = self._current_role
             p.__op_role_var = self.__op_role_var
@@ -5128,20 +5218,35 @@ class Program(object):
                     "str, but received %s." % type(var))
 
         # find out all variables that can be generated or updated with given feed
+        global_block = self.global_block()
+        feeded_var_names_set = set(feeded_var_names)
         generatable_vars = set()
-
-        for idx, op in enumerate(self.global_block().ops):
+        for op in global_block.ops:
             runnable_op = True
             for name in op.input_arg_names:
-                if not self.global_block().has_var(name):
+                if not global_block.has_var(name):
                     continue
-                if self.global_block().var(name).persistable:
+                if global_block.var(name).persistable:
                     continue
-                if name not in generatable_vars.union(feeded_var_names):
+                if name not in generatable_vars and name not in feeded_var_names_set:
                     runnable_op = False
                     break
             if runnable_op:
-                generatable_vars = generatable_vars.union(op.output_arg_names)
+                generatable_vars.update(op.output_arg_names)
+
+        # index the op that generates each variable in one pass, instead of
+        # scanning all ops for every target.
+        # NOTE(zhiqiu): Skip optimize op except for optimize op in targets,
+        # since optimize op generates parameters.
+        target_op_ids = set(id(t) for t in targets if isinstance(t, Operator))
+        op_idx_map = {}
+        generating_op_idx = {}
+        for idx, op in enumerate(global_block.ops):
+            op_idx_map[id(op)] = idx
+            if op._is_optimize_op() and id(op) not in target_op_ids:
+                continue
+            for name in op.output_arg_names:
+                generating_op_idx[name] = idx
 
         targets_idx = []
         for t in targets:
@@ -5159,7 +5264,7 @@ class Program(object):
                 # (1) the variable is leaf, it has no op that generates it;
                 # (2) the variable is not leaf, and we need to prune the op that generates it.
                 # In both cases, wo can just skip target_op of that it.
-                if name in feeded_var_names:
+                if name in feeded_var_names_set:
                     # however if the var is also updated by a runnable op, will shall keep it
                     if name not in generatable_vars:
                         continue
@@ -5168,31 +5273,18 @@ class Program(object):
                 # variable maybe has been changed, so t.op is not reliable
                 # and we need to find the current op that generate this
                 # variable here.
-                target_op = None
-                global_block = self.global_block()
-                for idx, op in enumerate(global_block.ops):
-                    if name in op.output_arg_names:
-                        # NOTE(zhiqiu): Find op that generate target name.
-                        # Skip optimize op except for optimize op in targets,
-                        # since optimize op generates parameters.
-                        if op._is_optimize_op() and op not in targets:
-                            continue
-                        else:
-                            target_op = op
-
-                if target_op is not None:
-                    targets_idx.append([target_op.block.idx, target_op.idx])
+                if name in generating_op_idx:
+                    targets_idx.append([0, generating_op_idx[name]])
+            elif t.block is global_block and id(t) in op_idx_map:
+                targets_idx.append([0, op_idx_map[id(t)]])
             else:
                 targets_idx.append([t.block.idx, t.idx])
 
         res = Program()
         res.desc, pruned_origin_block_id_map = core.prune(self.desc,
-                                                          set(feeded_var_names),
+                                                          feeded_var_names_set,
                                                           targets_idx)
-        res.blocks = [
-            Block(res, i) for i in six.moves.range(res.desc.num_blocks())
-        ]
-        res._sync_with_cpp()
+        res._create_blocks_from_desc()
 
         res._copy_param_info_from(self)
         res._copy_data_info_from(self, pruned_origin_block_id_map)
@@ -5223,36 +5315,8 @@ class Program(object):
         """
         res = Program()
         res.desc = core.ProgramDesc(self.desc)
-
-        # remove all readers and the read_op if exist
-        read_op_idx = 0
-        root_block = res.desc.block(0)
-        if prune_read_op:
-            while True:
-                if read_op_idx >= root_block.op_size() or root_block.op(
-                        read_op_idx).type() == 'read':
-                    break
-                read_op_idx += 1
-            if read_op_idx < root_block.op_size():
-                root_block._remove_op(0, read_op_idx + 1)
-            for var in root_block.all_vars():
-                if var.type() == core.VarDesc.VarType.READER:
-                    root_block._remove_var(cpt.to_bytes(var.name()))
-
-        # change all `is_test` attributes to True
-        for i in six.moves.range(res.desc.num_blocks()):
-            block = res.desc.block(i)
-            for j in six.moves.range(block.op_size()):
-                op = block.op(j)
-                if op.has_attr('is_test'):
-                    op._set_attr('is_test', True)
-                if op.type() == "batch_norm":
-                    # Remove the output ReserveSpace of batch_norm if exists.
-                    op.remove_output("ReserveSpace")
-        res.blocks = [
-            Block(res, i) for i in six.moves.range(res.desc.num_blocks())
-        ]
-        res._sync_with_cpp()
+        _inference_optimize_desc(res.desc, prune_read_op)
+        res._create_blocks_from_desc()
         return res
 
     def _remove_training_info(self, clip_extra=True):
@@ -5389,8 +5453,7 @@ class Program(object):
         """
         p = Program()
         p.desc = core.ProgramDesc(binary_str)
-        p.blocks = [Block(p, i) for i in six.moves.range(p.desc.num_blocks())]
-        p._sync_with_cpp()
+        p._create_blocks_from_desc()
         return p
 
     @staticmethod
@@ -5406,8 +5469,7 @@ class Program(object):
         """
         p = Program()
         p.desc = desc
-        p.blocks = [Block(p, i) for i in six.moves.range(p.desc.num_blocks())]
-        p._sync_with_cpp()
+        p._create_blocks_from_desc()
         return p
 
     @property
@@ -5595,6 +5657,18 @@ class Program(object):
         """
         self.current_block_idx = self.current_block().parent_idx
 
+    def _create_blocks_from_desc(self):
+        """
+        Create the Blocks of a new desc of this program. The Operators are
+        created on the first access of the ops of each block.
+        """
+        self.blocks = [
+            Block(self, i) for i in six.moves.range(self.desc.num_blocks())
+        ]
+        for block in self.blocks:
+            block._defer_ops()
+        self._sync_with_cpp()
+
     def _sync_with_cpp(self):
         """
         Synchronize Python instance to its binding C++ object instance.
@@ -12,7 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import json
+import pickle
+import queue
+import tempfile
+import threading
+
+import numpy as np
+
+from ... import core
 from ...compiler import CompiledProgram
+from ...executor import global_scope
 
 
 class SerializableBase(object):
@@ -50,18 +61,304 @@ class PaddleModel(SerializableBase):
             filename=self._file_name)
 
 
+def _row_digests(arr):
+    """
+    Return a uint64 digest for every row (the first dim) of arr. The digest
+    is a random linear combination of the row's 64-bit words, computed with
+    wraparound arithmetic, so that it is fully vectorized.
+    """
+    arr = np.ascontiguousarray(arr)
+    rows = arr.shape[0] if arr.ndim > 0 else 1
+    if arr.size == 0:
+        return np.zeros([rows], dtype=np.uint64)
+
+    data = arr.reshape([rows, -1]).view(np.uint8)
+    pad = (-data.shape[1]) % 8
+    if pad:
+        data = np.concatenate(
+            [data, np.zeros(
+                [rows, pad], dtype=np.uint8)], axis=1)
+    words = data.view(np.uint64)
+    coeffs = np.random.RandomState(2021).randint(
+        0, 2**63, size=[words.shape[1]], dtype=np.uint64)
+    coeffs = coeffs * np.uint64(2) + np.uint64(1)
+    return (words * coeffs).sum(axis=1, dtype=np.uint64)
+
+
+class PaddleDeltaModel(PaddleModel):
+    """
+    A PaddleModel which can also be saved as a delta of the state it was
+    last saved to or loaded from. Dirty rows are tracked by row digests, and
+    only the changed rows of each persistable tensor are written, which
+    suits embedding tables of which few rows change between checkpoints.
+    """
+
+    def __init__(self, exe, program, max_dirty_ratio=0.5):
+        super(PaddleDeltaModel, self).__init__(exe, program)
+        self._delta_file_name = "_paddle_fleet_param_delta__"
+        # a tensor is written as a whole when more rows than this are dirty
+        self._max_dirty_ratio = max_dirty_ratio
+        # var name -> (shape, dtype, row digests) of the last saved state
+        self._snapshot = None
+
+    def _dense_vars(self):
+        from ...io import is_persistable
+        return [
+            v for v in self._program.list_vars()
+            if is_persistable(v) and v.type == core.VarDesc.VarType.LOD_TENSOR
+        ]
+
+    def _get_tensor(self, name):
+        var = global_scope().find_var(name)
+        assert var is not None, "can't find var: {}".format(name)
+        return var.get_tensor()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for v in self._dense_vars():
+            arr = np.array(self._get_tensor(v.name))
+            snapshot[v.name] = (arr.shape, arr.dtype, _row_digests(arr))
+        return snapshot
+
+    def serialize(self, path):
+        super(PaddleDeltaModel, self).serialize(path)
+        self._snapshot = self._take_snapshot()
+
+    def deserialize(self, path):
+        super(PaddleDeltaModel, self).deserialize(path)
+        self._snapshot = self._take_snapshot()
+
+    def serialize_delta(self, path):
+        """
+        Write the rows changed since the last serialize, serialize_delta or
+        deserialize to path.
+        """
+        delta = {}
+        snapshot = {}
+        for v in self._dense_vars():
+            arr = np.array(self._get_tensor(v.name))
+            digests = _row_digests(arr)
+            snapshot[v.name] = (arr.shape, arr.dtype, digests)
+
+            last = None if self._snapshot is None else self._snapshot.get(
+                v.name)
+            if last is None or last[0] != arr.shape or last[1] != arr.dtype \
+                    or arr.ndim == 0:
+                delta[v.name] = ("full", arr)
+                continue
+
+            rows = np.nonzero(digests != last[2])[0]
+            if len(rows) == 0:
+                continue
+            if len(rows) > self._max_dirty_ratio * arr.shape[0]:
+                delta[v.name] = ("full", arr)
+            else:
+                delta[v.name] = ("rows", rows, arr[rows])
+
+        file_name = "{}/{}".format(path, self._delta_file_name)
+        with open(file_name, 'wb') as f:
+            pickle.dump(delta, f, protocol=2)
+        self._snapshot = snapshot
+
+    def deserialize_delta(self, path):
+        """
+        Apply the delta written by serialize_delta in path on the current
+        state.
+        """
+        file_name = "{}/{}".format(path, self._delta_file_name)
+        with open(file_name, 'rb') as f:
+            delta = pickle.load(f)
+
+        for name, record in delta.items():
+            t = self._get_tensor(name)
+            if record[0] == "full":
+                arr = record[1]
+            else:
+                arr = np.array(t)
+                arr[record[1]] = record[2]
+            t.set(arr, self._exe.place)
+
+        self._snapshot = self._take_snapshot()
+
+
+class _PipelinedUploader(object):
+    """
+    Upload the files written to a local directory with a pool of threads,
+    while the caller keeps writing the following files. Files larger than
+    part_size are split into parts which are uploaded in parallel, and the
+    caller is blocked while more than max_cache_bytes of local files are
+    waiting for upload. Uploaded local files are deleted.
+    """
+
+    def __init__(self, fs, fs_path, num_threads, part_size, max_cache_bytes):
+        self._fs = fs
+        self._fs_path = fs_path
+        self._part_size = part_size
+        self._max_cache_bytes = max_cache_bytes
+
+        self._queue = queue.Queue()
+        self._cond = threading.Condition()
+        self._pending_bytes = 0
+        self._error = None
+        self._submitted = set()
+        self._remote_dirs = set([""])
+        # relative file path -> number of parts it was split into
+        self._parts = {}
+
+        self._threads = []
+        for i in range(num_threads):
+            t = threading.Thread(target=self._worker)
+            t.daemon = True
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            local_file, fs_file, size = item
+            try:
+                if self._error is None:
+                    self._fs.upload(local_file, fs_file)
+                    os.remove(local_file)
+            except Exception as e:
+                self._error = e
+            finally:
+                with self._cond:
+                    self._pending_bytes -= size
+                    self._cond.notify_all()
+
+    def _reserve(self, size):
+        with self._cond:
+            while self._error is None and self._pending_bytes > 0 and \
+                    self._pending_bytes + size > self._max_cache_bytes:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+            self._pending_bytes += size
+
+    def _submit_file(self, local_file, rel_path):
+        size = os.path.getsize(local_file)
+        if size <= self._part_size:
+            self._reserve(size)
+            self._queue.put((local_file, "{}/{}".format(self._fs_path,
+                                                         rel_path), size))
+            return
+
+        part_no = 0
+        remaining = size
+        with open(local_file, 'rb') as f:
+            while remaining > 0:
+                part_len = min(self._part_size, remaining)
+                # write the next part only when there is room for it
+                self._reserve(part_len)
+                part_file = "{}.part-{:05d}".format(local_file, part_no)
+                self._submitted.add("{}.part-{:05d}".format(rel_path,
+                                                            part_no))
+                with open(part_file, 'wb') as p:
+                    p.write(f.read(part_len))
+                self._queue.put((part_file, "{}/{}.part-{:05d}".format(
+                    self._fs_path, rel_path, part_no), part_len))
+                remaining -= part_len
+                part_no += 1
+        os.remove(local_file)
+        self._parts[rel_path] = part_no
+
+    def submit_dir(self, local_dir):
+        """
+        Submit the files under local_dir which are not submitted yet.
+        """
+        for root, dirs, files in os.walk(local_dir):
+            rel_dir = os.path.relpath(root, local_dir)
+            rel_dir = "" if rel_dir == "." else rel_dir
+            for name in sorted(files):
+                rel_path = os.path.join(rel_dir, name)
+                if rel_path in self._submitted:
+                    continue
+                if rel_dir not in self._remote_dirs:
+                    self._fs.mkdirs("{}/{}".format(self._fs_path, rel_dir))
+                    self._remote_dirs.add(rel_dir)
+                self._submitted.add(rel_path)
+                self._submit_file(os.path.join(root, name), rel_path)
+
+    def finish(self):
+        """
+        Wait for all the uploads, and return the parts of the split files.
+        """
+        for t in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        if self._error is not None:
+            raise self._error
+        return self._parts
+
+
+def _merge_parts(path, parts):
+    """
+    Concatenate the parts of the files split by _PipelinedUploader.
+    """
+    for rel_path, num in parts.items():
+        file_name = os.path.join(path, rel_path)
+        with open(file_name, 'wb') as f:
+            for i in range(num):
+                part_file = "{}.part-{:05d}".format(file_name, i)
+                with open(part_file, 'rb') as p:
+                    while True:
+                        data = p.read(64 * 1024 * 1024)
+                        if not data:
+                            break
+                        f.write(data)
+                os.remove(part_file)
+
+
 class CheckpointSaver(object):
-    def __init__(self, fs):
+    """
+    Save and load checkpoints with the given FS.
+
+    If max_delta_chain is larger than 0, save_checkpoint(delta=True) writes
+    the serializables which support deltas (e.g. PaddleDeltaModel) as a
+    delta of the previous checkpoint, until max_delta_chain deltas follow
+    the last full checkpoint, then the chain is compacted by a full save.
+    Every checkpoint records its chain in a manifest file, so that loading
+    reads at most max_delta_chain + 1 checkpoints.
+
+    If upload_threads is larger than 0 and fs needs upload, the files of a
+    checkpoint are uploaded by upload_threads threads as soon as each object
+    in slists is serialized, files larger than upload_part_size are uploaded
+    as parts in parallel, and at most max_upload_cache_bytes of serialized
+    files wait in the local cache.
+    """
+
+    def __init__(self,
+                 fs,
+                 max_delta_chain=0,
+                 upload_threads=0,
+                 upload_part_size=64 * 1024 * 1024,
+                 max_upload_cache_bytes=1024 * 1024 * 1024):
         self._fs = fs
         self._checkpoint_prefix = "__paddle_checkpoint__"
+        self._manifest_file_name = "_paddle_checkpoint_manifest__"
+        self._max_delta_chain = max_delta_chain
+        self._upload_threads = upload_threads
+        self._upload_part_size = upload_part_size
+        self._max_upload_cache_bytes = max_upload_cache_bytes
+        # root path and checkpoint nos of the chain ending at the checkpoint
+        # saved or loaded last, the first one is a full checkpoint.
+        self._chain_root = None
+        self._chain = None
 
     def save_checkpoint(self,
                         path,
                         slists,
                         trainer_id=None,
-                        local_cache_path=".cache"):
+                        local_cache_path=".cache",
+                        delta=False):
         """
         Serialize objects in slists to path
+        If delta is True, save objects supporting deltas as a delta of the
+        last checkpoint when the chain allows
         Return really saved path and checkpoint_no
         """
         if not self._fs.is_exist(path):
@@ -75,6 +372,10 @@ class CheckpointSaver(object):
             max_no = -1
         max_no += 1
 
+        chain = [max_no]
+        if delta and self._can_append_delta(path, slists, max_no - 1):
+            chain = self._chain + [max_no]
+
         real_path = "{}/{}.{}".format(path, self._checkpoint_prefix, max_no)
         tmp_path = "{}.tmp".format(real_path)
         saved_path = tmp_path
@@ -98,17 +399,109 @@ class CheckpointSaver(object):
 
             saved_path = cache_path
 
-        for s in slists:
-            s.serialize(saved_path)
-
-        if self._fs.need_upload_download():
+        uploader = None
+        if self._fs.need_upload_download() and self._upload_threads > 0:
+            self._fs.delete(tmp_path)
+            self._fs.mkdirs(tmp_path)
+            uploader = _PipelinedUploader(
+                self._fs, tmp_path, self._upload_threads,
+                self._upload_part_size, self._max_upload_cache_bytes)
+
+        parts = {}
+        try:
+            for s in slists:
+                if len(chain) > 1 and hasattr(s, "serialize_delta"):
+                    s.serialize_delta(saved_path)
+                else:
+                    s.serialize(saved_path)
+                if uploader is not None:
+                    uploader.submit_dir(saved_path)
+        finally:
+            if uploader is not None:
+                parts = uploader.finish()
+        self._write_manifest(saved_path, chain, parts)
+
+        if uploader is not None:
+            self._fs.upload("{}/{}".format(cache_path,
+                                           self._manifest_file_name),
+                            "{}/{}".format(tmp_path, self._manifest_file_name))
+            local_fs.delete(cache_path)
+        elif self._fs.need_upload_download():
             self._fs.delete(tmp_path)
             self._fs.upload(cache_path, tmp_path)
             local_fs.delete(cache_path)
         self._fs.mv(tmp_path, real_path)
 
+        self._chain_root = path
+        self._chain = chain
         return real_path, max_no
 
+    def _can_append_delta(self, path, slists, last_no):
+        if self._chain is None or self._chain_root != path:
+            return False
+        # the last checkpoint must be the one this saver wrote or loaded
+        if self._chain[-1] != last_no:
+            return False
+        if len(self._chain) > self._max_delta_chain:
+            return False
+        return any(hasattr(s, "serialize_delta") for s in slists)
+
+    def _write_manifest(self, path, chain, parts):
+        if not os.path.exists(path):
+            os.makedirs(path)
+        file_name = "{}/{}".format(path, self._manifest_file_name)
+        with open(file_name, 'w') as f:
+            f.write(
+                json.dumps({
+                    "checkpoint_no": chain[-1],
+                    "chain": chain,
+                    "parts": parts
+                }))
+
+    def _read_manifest(self, path):
+        """
+        Return the chain recorded in the local checkpoint path, checkpoints
+        without manifest are full ones.
+        """
+        file_name = "{}/{}".format(path, self._manifest_file_name)
+        if not os.path.exists(file_name):
+            return None
+        with open(file_name, 'r') as f:
+            return json.loads(f.read())["chain"]
+
+    def _restore_parts(self, path):
+        """
+        Merge the files uploaded as parts in the downloaded checkpoint path.
+        """
+        file_name = "{}/{}".format(path, self._manifest_file_name)
+        if not os.path.exists(file_name):
+            return
+        with open(file_name, 'r') as f:
+            parts = json.loads(f.read()).get("parts", {})
+        _merge_parts(path, parts)
+
+    def _get_chain(self, root_path, checkpoint_no):
+        if self._chain_root == root_path and self._chain and \
+                self._chain[-1] == checkpoint_no:
+            return self._chain
+
+        real_path = "{}/{}.{}/{}".format(root_path, self._checkpoint_prefix,
+                                         checkpoint_no,
+                                         self._manifest_file_name)
+        if not self._fs.need_upload_download():
+            return self._read_manifest(os.path.dirname(real_path)) or \
+                [checkpoint_no]
+
+        if not self._fs.is_exist(real_path):
+            return [checkpoint_no]
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            self._fs.download(real_path, tmp_dir)
+            return self._read_manifest(tmp_dir) or [checkpoint_no]
+        finally:
+            from paddle.distributed.fleet.utils.fs import LocalFS
+            LocalFS().delete(tmp_dir)
+
     def load_checkpoint(self,
                         path,
                         slists,
@@ -153,16 +546,58 @@ class CheckpointSaver(object):
         load_path = real_path
         if self._fs.need_upload_download():
             self._fs.download(real_path, cache_path)
+            self._restore_parts(cache_path)
             load_path = cache_path
 
-        for s in slists:
-            s.deserialize(load_path)
+        chain = self._read_manifest(load_path) or [checkpoint_no]
+        delta_slists = [s for s in slists if hasattr(s, "deserialize_delta")]
+        if len(chain) > 1 and delta_slists:
+            # rebuild the objects supporting deltas from the base checkpoint
+            # and all the deltas after it.
+            for i, no in enumerate(chain[:-1]):
+                self._load_chained(path, no, delta_slists, i == 0,
+                                   local_cache_path, trainer_id)
+            for s in slists:
+                if hasattr(s, "deserialize_delta"):
+                    s.deserialize_delta(load_path)
+                else:
+                    s.deserialize(load_path)
+        else:
+            for s in slists:
+                s.deserialize(load_path)
 
         if self._fs.need_upload_download() and cache_path:
             local_fs.delete(cache_path)
 
+        self._chain_root = path
+        self._chain = chain
         return real_path
 
+    def _load_chained(self, path, checkpoint_no, slists, is_base,
+                      local_cache_path, trainer_id):
+        real_path = "{}/{}.{}".format(path, self._checkpoint_prefix,
+                                      checkpoint_no)
+        load_path = real_path
+        if self._fs.need_upload_download():
+            from paddle.distributed.fleet.utils.fs import LocalFS
+            local_fs = LocalFS()
+            load_path = "{}/{}.{}.load_cache".format(
+                local_cache_path, self._checkpoint_prefix, checkpoint_no)
+            if trainer_id is not None:
+                load_path = "{}.{}".format(load_path, trainer_id)
+            local_fs.delete(load_path)
+            self._fs.download(real_path, load_path)
+            self._restore_parts(load_path)
+
+        for s in slists:
+            if is_base:
+                s.deserialize(load_path)
+            else:
+                s.deserialize_delta(load_path)
+
+        if self._fs.need_upload_download():
+            local_fs.delete(load_path)
+
     def get_checkpoint_no(self, root_path):
         a = []
         dirs = self._fs.list_dirs(root_path)
@@ -201,6 +636,9 @@ class CheckpointSaver(object):
         s = set(reserved)
         if len(s) == 0:
             s.add(max_no)
+        # keep the base and deltas the reserved checkpoints depend on
+        for no in list(s):
+            s.update(self._get_chain(root_path, no))
 
         dirs = self._fs.list_dirs(root_path)
         for d in dirs:
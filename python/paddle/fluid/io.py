@@ -47,6 +47,7 @@ from . import core
 from .. import compat as cpt
 from paddle.utils import deprecated
 from paddle.fluid.framework import static_only
+from paddle.fluid.data_feeder import convert_dtype
 
 batch = paddle.batch
 
@@ -966,7 +967,8 @@ def load_vars(executor,
                 continue
             var_temp = paddle.fluid.global_scope().find_var(each_var.name)
             assert var_temp != None, "can't not find var: " + each_var.name
-            new_shape = (np.array(var_temp.get_tensor())).shape
+            # read dims from the tensor meta rather than copying its data
+            new_shape = tuple(var_temp.get_tensor().shape())
             assert each_var.name in orig_para_shape, each_var.name + "MUST in var list"
             orig_shape = orig_para_shape.get(each_var.name)
             if new_shape != orig_shape:
@@ -2363,18 +2365,20 @@ def set_program_state(program, state_dict):
             "Variable [ {} ] Not found, Please make sure run startup program".format(para.name)
         if para.name in state_dict:
             # set value from state dict
-            orig_para_np = np.array(var_temp.get_tensor())
+            # compare against the tensor meta, avoid a host copy of the data
+            ten = var_temp.get_tensor()
+            orig_para_shape = tuple(ten.shape())
+            orig_para_dtype = convert_dtype(ten._dtype())
             new_para_np = state_dict[para.name]
-            assert orig_para_np.shape == new_para_np.shape, \
+            assert orig_para_shape == new_para_np.shape, \
                 "Parameter's shape does not match, the Program requires a parameter with the shape of ({}), " \
                 "while the loaded parameter (namely [ {} ]) has a shape of  ({})." \
-                    .format(orig_para_np.shape, para.name, new_para_np.shape)
-            assert orig_para_np.dtype == new_para_np.dtype, \
+                    .format(orig_para_shape, para.name, new_para_np.shape)
+            assert orig_para_dtype == convert_dtype(new_para_np.dtype), \
                 "Parameter's data type does not match, the Program requires a parameter with a dtype of ({}), " \
                 "while the loaded parameter (namely [ {} ]) has a dtype of  ({})." \
-                    .format(orig_para_np.dtype, para.name, new_para_np.dtype)
+                    .format(orig_para_dtype, para.name, new_para_np.dtype)
 
-            ten = var_temp.get_tensor()
             ten_place = ten._place()
 
             #assert ten_place.is_gpu_place() or ten_place.is_cpu_place(), \
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import copy
+import pickle
+import hashlib
 import inspect
+import warnings
 from os import path
 import paddle
 from . import core, unique_name
@@ -64,47 +68,32 @@ def _update_grad_persistable(main_program):
             g_var.persistable = True
 
 
-def apply_build_strategy(main_program, startup_program, build_strategy,
-                         pass_attrs):
-    def update_attr(attrs, attr_types, name, value, typ=None):
-        if name not in attrs:
-            attrs[name] = value
-        if typ:
-            attr_types[name] = typ
-
-    def apply_pass(name):
-        attrs = dict(pass_attrs)
-        attr_types = {}
-        update_attr(attrs, attr_types, "nranks", 1, "size_t")
-        update_attr(attrs, attr_types, "use_cuda", False, "bool")
-        # TODO(zjl): how to skip fetch variables ?
-        update_attr(attrs, attr_types, "mem_opt_skip_vars",
-                    get_data_vars(main_program), "list[str]")
-        _apply_pass(main_program, startup_program, name, attrs, attr_types)
-
-    _update_grad_persistable(main_program)
-    use_cuda = pass_attrs.get("use_cuda", False)
-    build_strategy = build_strategy._copy()
+def _pop_build_strategy_passes(build_strategy, use_cuda):
+    """
+    Return the passes enabled by build_strategy in the order to apply, and
+    turn off the corresponding options of build_strategy.
+    """
+    passes = []
     if build_strategy.sync_batch_norm:
-        apply_pass("sync_batch_norm_pass")
+        passes.append("sync_batch_norm_pass")
         build_strategy.sync_batch_norm = False
     if build_strategy.fuse_relu_depthwise_conv and use_cuda:
-        apply_pass("fuse_relu_depthwise_conv_pass")
+        passes.append("fuse_relu_depthwise_conv_pass")
         build_strategy.fuse_relu_depthwise_conv = False
     if build_strategy.fuse_bn_act_ops and use_cuda:
-        apply_pass("fuse_bn_act_pass")
+        passes.append("fuse_bn_act_pass")
         build_strategy.fuse_bn_act_ops = False
     if build_strategy.fuse_bn_add_act_ops and use_cuda:
-        apply_pass("fuse_bn_add_act_pass")
+        passes.append("fuse_bn_add_act_pass")
         build_strategy.fuse_bn_add_act_ops = False
     if build_strategy.enable_auto_fusion and use_cuda:
-        apply_pass("fusion_group_pass")
+        passes.append("fusion_group_pass")
         build_strategy.enable_auto_fusion = False
     if build_strategy.fuse_elewise_add_act_ops:
-        apply_pass("fuse_elewise_add_act_pass")
+        passes.append("fuse_elewise_add_act_pass")
         build_strategy.fuse_elewise_add_act_ops = False
     if build_strategy.fuse_all_optimizer_ops:
-        apply_pass([
+        passes.append([
             "coalesce_grad_tensor_pass",
             "fuse_adam_op_pass",
             "fuse_sgd_op_pass",
@@ -113,16 +102,122 @@ def apply_build_strategy(main_program, startup_program, build_strategy,
         build_strategy.fuse_all_optimizer_ops = False
     # TODO(zjl): support fuse all reduce ops
     if build_strategy.cache_runtime_context:
-        apply_pass("runtime_context_cache_pass")
+        passes.append("runtime_context_cache_pass")
         build_strategy.cache_runtime_context = False
     if build_strategy.enable_addto and use_cuda:
         # NOTE: how to get fetch vars to skip memory optimization?  
-        apply_pass("inplace_addto_op_pass")
+        passes.append("inplace_addto_op_pass")
         build_strategy.enable_addto = False
     if build_strategy.enable_inplace:
-        apply_pass("buffer_shared_inplace_pass")
+        passes.append("buffer_shared_inplace_pass")
         build_strategy.enable_inplace = False
+    return passes
+
+
+def _get_pass_cache_path(cache_dir, main_desc, startup_desc, passes, attrs):
+    """
+    The cache file of the programs after applying passes, which is keyed by
+    the programs, the passes and their attrs (including the place), and the
+    version of Paddle.
+    """
+    key = hashlib.sha256()
+    key.update(main_desc.serialize_to_string())
+    key.update(startup_desc.serialize_to_string())
+    key.update(
+        repr((passes, sorted((k, repr(v)) for k, v in attrs.items()),
+              paddle.__version__, paddle.__git_commit__)).encode())
+    return path.join(cache_dir, "pass_cache_{}.pkl".format(key.hexdigest()))
+
+
+def _load_pass_cache(cache_path):
+    if not path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        return (core.ProgramDesc(cached["main"]),
+                core.ProgramDesc(cached["startup"]))
+    except Exception as e:
+        warnings.warn("Failed to load the pass cache {}: {}".format(
+            cache_path, e))
+        return None
+
+
+def _save_pass_cache(cache_path, main_desc, startup_desc):
+    cache_dir = path.dirname(cache_path)
+    if not path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    # write to a temp file first, so that a concurrent reader never sees a
+    # partial file
+    tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        pickle.dump({
+            "main": main_desc.serialize_to_string(),
+            "startup": startup_desc.serialize_to_string()
+        }, f)
+    os.replace(tmp_path, cache_path)
+
+
+def apply_build_strategy(main_program,
+                         startup_program,
+                         build_strategy,
+                         pass_attrs,
+                         cache_dir=None):
+    """
+    Apply the passes enabled by build_strategy to main_program and
+    startup_program in place.
+
+    If cache_dir is given, or set by the environment variable
+    `FLAGS_PASS_CACHE_DIR`, the programs after applying passes are saved
+    there, and later calls, e.g. in a restarted process, with the same
+    programs, passes and attrs load them instead of applying the passes.
+    The Operators of the loaded programs are created lazily.
+    """
+
+    def update_attr(attrs, attr_types, name, value, typ=None):
+        if name not in attrs:
+            attrs[name] = value
+        if typ:
+            attr_types[name] = typ
+
+    _update_grad_persistable(main_program)
+    use_cuda = pass_attrs.get("use_cuda", False)
+    build_strategy = build_strategy._copy()
+    passes = _pop_build_strategy_passes(build_strategy, use_cuda)
     build_strategy._clear_finalized()
+    if not passes:
+        return build_strategy
+
+    attrs = dict(pass_attrs)
+    attr_types = {}
+    update_attr(attrs, attr_types, "nranks", 1, "size_t")
+    update_attr(attrs, attr_types, "use_cuda", False, "bool")
+    # TODO(zjl): how to skip fetch variables ?
+    update_attr(attrs, attr_types, "mem_opt_skip_vars",
+                get_data_vars(main_program), "list[str]")
+
+    # apply all passes to the copies of desc and rebuild the programs once
+    main_desc = core.ProgramDesc(main_program.desc)
+    startup_desc = core.ProgramDesc(startup_program.desc)
+    if cache_dir is None:
+        cache_dir = os.environ.get("FLAGS_PASS_CACHE_DIR", None)
+    cache_path = None
+    cached = None
+    if cache_dir:
+        cache_path = _get_pass_cache_path(cache_dir, main_desc, startup_desc,
+                                          passes, attrs)
+        cached = _load_pass_cache(cache_path)
+
+    if cached is not None:
+        main_desc, startup_desc = cached
+    else:
+        for name in passes:
+            core.apply_pass(main_desc, startup_desc, name, attrs, attr_types)
+        if cache_path is not None:
+            _save_pass_cache(cache_path, main_desc, startup_desc)
+
+    main_program._rebuild_from_desc(main_desc)
+    startup_program._rebuild_from_desc(startup_desc)
     return build_strategy
 
 
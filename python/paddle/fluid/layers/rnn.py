@@ -863,6 +863,10 @@ class Decoder(object):
         return False
 
 
+def _is_reorderable(x):
+    return not isinstance(x, Variable) and hasattr(x, "reorder")
+
+
 class BeamSearchDecoder(Decoder):
     """
     Decoder with beam search decoding strategy. It wraps a cell to get probabilities,
@@ -880,6 +884,12 @@ class BeamSearchDecoder(Decoder):
     :code:`BeamSearchDecoder.tile_beam_merge_with_batch` . The most common case
     for this is the encoder output in attention mechanism.
 
+    Besides tensors, the `states` of cell can include objects having `tile` and
+    `reorder` methods, such as `paddle.nn.MultiHeadAttention.KVCache`. They are
+    tiled by :code:`tile(beam_size)` once, kept in the `[batch_size * beam_size, ...]`
+    layout, and reordered in place by :code:`reorder(index)` at each step instead
+    of being gathered.
+
     Returns:
         BeamSearchDecoder: An instance of decoder which can be used in \
             `paddle.nn.dynamic_decode` to implement decoding. 
@@ -983,6 +993,8 @@ class BeamSearchDecoder(Decoder):
             Variable: A tensor with shape `[batch_size, beam_size, ...]`, whose \
                 data type is same as `x`.     
         """
+        if _is_reorderable(x):
+            return x
         check_type(x, 'x', (Variable), 'BeamSearchDecoder._split_batch_beams')
         # TODO: avoid fake shape in compile-time like tile_beam_merge_with_batch
         return nn.reshape(x, shape=[-1, self.beam_size] + list(x.shape[1:]))
@@ -1000,6 +1012,8 @@ class BeamSearchDecoder(Decoder):
             Variable: A tensor with shape `[batch_size * beam_size, ...]`, whose \
                 data type is same as `x`.     
         """
+        if _is_reorderable(x):
+            return x
         check_type(x, 'x', (Variable), 'BeamSearchDecoder._merge_batch_beams')
         # TODO: avoid fake shape in compile-time like tile_beam_merge_with_batch
         return nn.reshape(x, shape=[-1] + list(x.shape[2:]))
@@ -1020,6 +1034,8 @@ class BeamSearchDecoder(Decoder):
             Variable: A tensor with shape `[batch_size, beam_size, ...]`, whose \
                 data type is same as `x`.
         """
+        if _is_reorderable(x):
+            return x.tile(self.beam_size)
         check_type(x, 'x', (Variable), 'BeamSearchDecoder._expand_to_beam_size')
         x = nn.unsqueeze(x, [1])
         expand_times = [1] * len(x.shape)
@@ -1071,7 +1087,6 @@ class BeamSearchDecoder(Decoder):
             Variable: A tensor with the same shape and data type as `x`, \
                 representing the gathered tensor.
         """
-        check_type(x, 'x', (Variable), 'BeamSearchDecoder._gather')
         check_type(indices, 'indices', (Variable), 'BeamSearchDecoder._gather')
         check_type(batch_size, 'batch_size', (Variable),
                    'BeamSearchDecoder._gather')
@@ -1085,6 +1100,10 @@ class BeamSearchDecoder(Decoder):
                 tensor.range(
                     0, batch_size, 1, dtype=indices.dtype), [1]),
             [1, self.beam_size])
+        if _is_reorderable(x):
+            return x.reorder(
+                nn.reshape(batch_pos * self.beam_size + indices, [-1]))
+        check_type(x, 'x', (Variable), 'BeamSearchDecoder._gather')
         topk_coordinates = nn.stack([batch_pos, indices], axis=2)
         topk_coordinates.stop_gradient = True
         return nn.gather_nd(x, topk_coordinates)
@@ -1130,7 +1149,11 @@ class BeamSearchDecoder(Decoder):
                 `finished` is a `bool` tensor filled by False with shape `[batch_size, beam_size]`.
         """
         self.kinf = 1e9
-        state = flatten(initial_cell_states)[0]
+        states = flatten(initial_cell_states)
+        state = ([x for x in states if not _is_reorderable(x)] or [None])[0]
+        if state is None:
+            state = tensor.fill_constant(
+                shape=[states[0].batch_size, 1], dtype="int64", value=0)
         self.batch_size = nn.shape(state)[0]
 
         self.start_token_tensor = tensor.fill_constant(
@@ -1333,6 +1356,62 @@ class BeamSearchDecoder(Decoder):
         return True
 
 
+class _OutputBuffer(object):
+    """
+    Holds the outputs of all decoding steps in a preallocated tensor shaped
+    `[capacity, ...]`, which doubles when full. The outputs of each step are
+    written in place, instead of being stacked after decoding.
+    """
+
+    def __init__(self, x, capacity):
+        self.buffer = paddle.zeros([capacity] + x.shape, dtype=x.dtype)
+        self.size = 0
+        self.append(x)
+
+    def append(self, x):
+        if self.size == self.buffer.shape[0]:
+            self.buffer = tensor.concat(
+                [self.buffer, tensor.zeros_like(self.buffer)], axis=0)
+        self.buffer[self.size] = x
+        self.size += 1
+        return self
+
+    def stack(self, num_steps):
+        return self.buffer[:num_steps]
+
+
+def _stack_outputs(outputs, num_steps):
+    if isinstance(outputs, _OutputBuffer):
+        return outputs.stack(num_steps)
+    return nn.stack(outputs.array[:num_steps], axis=0)
+
+
+def _cast_bool(func, x, *args):
+    # gather and scatter have no kernels for bool
+    if convert_dtype(x.dtype) != "bool":
+        return func(x, *args)
+    args = [
+        tensor.cast(arg, "int32")
+        if isinstance(arg, Variable) and convert_dtype(arg.dtype) == "bool"
+        else arg for arg in args
+    ]
+    return tensor.cast(func(tensor.cast(x, "int32"), *args), "bool")
+
+
+def _gather_batch(x, index):
+    return _cast_bool(paddle.gather, x, index)
+
+
+def _scatter_batch(x, index, updates):
+    return _cast_bool(paddle.scatter, x, index, updates)
+
+
+def _restore_batch(full, part, active_index):
+    # write the entries left in the compacted batch back to the full batch
+    index = tensor.assign(active_index.astype("int64"))
+    return map_structure(lambda x, y: _scatter_batch(x, index, y), full, part)
+
+
 def _dynamic_decode_imperative(decoder,
                                inits=None,
                                max_step_num=None,
@@ -1340,6 +1419,8 @@ def _dynamic_decode_imperative(decoder,
                                impute_finished=False,
                                is_test=False,
                                return_length=False,
+                               finished_check_interval=1,
+                               compact_finished=False,
                                **kwargs):
     def _maybe_copy(state, new_state, step_mask):
         # TODO: use where_op
@@ -1359,19 +1440,98 @@ def _dynamic_decode_imperative(decoder,
             new_state = tensor.cast(new_state, dtype=state_dtype)
         return new_state
 
+    def _freeze(state, new_state, done):
+        # keep the states once all entries have finished
+        if not isinstance(new_state, Variable):
+            return new_state
+        state_dtype = state.dtype
+        if convert_dtype(state_dtype) in ["bool"]:
+            state = tensor.cast(state, dtype="float32")
+            new_state = tensor.cast(new_state, dtype="float32")
+        done = tensor.cast(done, dtype=state.dtype)
+        new_state = new_state + (state - new_state) * done
+        if convert_dtype(state_dtype) in ["bool"]:
+            new_state = tensor.cast(new_state, dtype=state_dtype)
+        return new_state
+
+    def _pad_beam_search_outputs(outputs, active_index, batch_size):
+        # Entries compacted out of the batch emit end tokens from their own
+        # beams, as finished beams do. Scores are dropped by `finalize`.
+        if len(active_index) == batch_size:
+            return outputs
+        index = tensor.assign(active_index.astype("int64"))
+        pads = decoder.OutputWrapper(
+            tensor.zeros_like(outputs.scores),
+            paddle.full_like(outputs.predicted_ids, decoder.end_token),
+            paddle.tile(
+                paddle.arange(
+                    decoder.beam_size, dtype=outputs.parent_ids.dtype),
+                outputs.parent_ids.shape[:2] + [1]))
+
+        def _pad(x, pad):
+            perm = [1, 0] + list(range(2, len(x.shape)))
+            pad = nn.transpose(pad, perm)
+            pad = nn.expand(
+                nn.slice(
+                    pad, axes=[0], starts=[0], ends=[1]),
+                [batch_size] + [1] * (len(x.shape) - 1))
+            return nn.transpose(
+                _scatter_batch(pad, index, nn.transpose(x, perm)), perm)
+
+        return map_structure(_pad, outputs, pads)
+
+    compact_finished = compact_finished and isinstance(
+        decoder, BeamSearchDecoder) and type(
+            decoder).finalize is BeamSearchDecoder.finalize and len(kwargs) == 0
+
     initial_inputs, initial_states, initial_finished = decoder.initialize(inits)
     inputs, states, finished = (initial_inputs, initial_states,
                                 initial_finished)
     cond = control_flow.logical_not((nn.reduce_all(initial_finished)))
     sequence_lengths = tensor.cast(tensor.zeros_like(initial_finished), "int64")
     outputs = None
+    # states updated in place, such as KVCache, could not be compacted
+    compact_finished = compact_finished and all(
+        isinstance(x, Variable) for x in flatten(initial_states))
+
+    # Between two checks of `cond`, the steps taken after all entries have
+    # finished are not counted by `num_steps`, and their outputs are dropped.
+    num_steps = None if finished_check_interval == 1 else tensor.fill_constant(
+        shape=[1], dtype="int64", value=0)
+    batch_size = initial_finished.shape[0]
+    active_index = np.arange(batch_size)
+    full_states = None
+    segments = []
 
     step_idx = 0
     step_idx_tensor = tensor.fill_constant(
         shape=[1], dtype="int64", value=step_idx)
-    while cond.numpy():
+    while step_idx % finished_check_interval != 0 or cond.numpy():
+        if compact_finished and step_idx > 0 and \
+                step_idx % finished_check_interval == 0:
+            entry_finished = nn.reduce_all(states.finished, dim=1).numpy()
+            if entry_finished.any():
+                keep = np.where(np.logical_not(entry_finished))[0]
+                full_states = states if full_states is None else _restore_batch(
+                    full_states, states, active_index)
+                keep_index = tensor.assign(keep.astype("int64"))
+                inputs, states = map_structure(
+                    lambda x: _gather_batch(x, keep_index), (inputs, states))
+                finished = states.finished
+                sequence_lengths = states.lengths
+                decoder.batch_size = nn.shape(finished)[0]
+                segments.append((active_index, outputs))
+                active_index = active_index[keep]
+                outputs = None
+
+        if num_steps is not None:
+            done = control_flow.logical_not(cond)
+            num_steps = num_steps + tensor.cast(cond, "int64")
         (step_outputs, next_states, next_inputs, next_finished) = decoder.step(
             step_idx_tensor, inputs, states, **kwargs)
+        if num_steps is not None:
+            next_states = map_structure(lambda x, y: _freeze(x, y, done),
+                                        states, next_states)
         if not decoder.tracks_own_finished:
             # BeamSearchDecoder would track it own finished, since
             # beams would be reordered and the finished status of each
@@ -1396,10 +1556,18 @@ def _dynamic_decode_imperative(decoder,
             next_sequence_lengths = getattr(next_states, "lengths",
                                             sequence_lengths)
 
-        outputs = map_structure(
-            lambda x: ArrayWrapper(x),
-            step_outputs) if step_idx == 0 else map_structure(
-                lambda x, x_array: x_array.append(x), step_outputs, outputs)
+        if outputs is None:
+            # outputs without gradients are written into preallocated buffers
+            preallocate = not compact_finished and all(
+                x.stop_gradient for x in flatten(step_outputs))
+            capacity = 64 if max_step_num is None else min(64,
+                                                           max_step_num + 1)
+            outputs = map_structure(
+                lambda x: _OutputBuffer(x, capacity)
+                if preallocate else ArrayWrapper(x), step_outputs)
+        else:
+            outputs = map_structure(lambda x, x_array: x_array.append(x),
+                                    step_outputs, outputs)
         inputs, states, finished, sequence_lengths = (
             next_inputs, next_states, next_finished, next_sequence_lengths)
 
@@ -1410,8 +1578,31 @@ def _dynamic_decode_imperative(decoder,
         if max_step_num is not None and step_idx > max_step_num:
             break
 
-    final_outputs = map_structure(lambda x: nn.stack(x.array, axis=0), outputs)
+    if num_steps is None:
+        num_steps = step_idx
+    else:
+        num_steps = int(num_steps.numpy()[0])
+
     final_states = states
+    if len(segments) > 0:
+        segments.append((active_index, outputs))
+        segment_outputs = []
+        for index, segment in segments:
+            segment = map_structure(lambda x: nn.stack(x.array, axis=0),
+                                    segment)
+            segment_outputs.append(
+                _pad_beam_search_outputs(segment, index, batch_size))
+        final_outputs = map_structure(
+            lambda *xs: nn.slice(
+                tensor.concat(list(xs), axis=0),
+                axes=[0], starts=[0], ends=[num_steps]),
+            *segment_outputs)
+        final_states = _restore_batch(full_states, states, active_index)
+        sequence_lengths = final_states.lengths
+        decoder.batch_size = nn.shape(final_states.finished)[0]
+    else:
+        final_outputs = map_structure(lambda x: _stack_outputs(x, num_steps),
+                                      outputs)
 
     try:
         final_outputs, final_states = decoder.finalize(
@@ -1436,6 +1627,8 @@ def _dynamic_decode_declarative(decoder,
                                 impute_finished=False,
                                 is_test=False,
                                 return_length=False,
+                                finished_check_interval=1,
+                                compact_finished=False,
                                 **kwargs):
     initial_inputs, initial_states, initial_finished = decoder.initialize(inits)
     global_inputs, global_states, global_finished = (
@@ -1587,6 +1780,8 @@ def dynamic_decode(decoder,
                    impute_finished=False,
                    is_test=False,
                    return_length=False,
+                   finished_check_interval=1,
+                   compact_finished=False,
                    **kwargs):
     r"""
     Dynamic decoding performs :code:`decoder.step()` repeatedly until the returned
@@ -1622,6 +1817,18 @@ def dynamic_decode(decoder,
         return_length(bool, optional):  A flag indicating whether to return an
             extra Tensor variable in the output tuple, which stores the actual
             lengths of all decoded sequences. Default `False`.
+        finished_check_interval(int, optional): The number of decoding steps
+            between two checks of the finished status in dygraph mode. Each
+            check copies the status to the host and waits for the device,
+            thus a larger interval is faster, while some extra steps might be
+            performed and then dropped. It has no effect in static graph mode,
+            where the status is checked on device. Default `1`.
+        compact_finished(bool, optional): If `True` and `decoder` is a
+            `BeamSearchDecoder`, the batch entries whose beams are all finished
+            are removed from the batch at each check of the finished status in
+            dygraph mode, thus the remaining steps are performed on the
+            unfinished entries only. The final states of the removed entries
+            are the ones at the time of removal. Default `False`.
         **kwargs: Additional keyword arguments. Arguments passed to `decoder.step`. 
 
     Returns:
@@ -1662,14 +1869,22 @@ def dynamic_decode(decoder,
                                     inits=decoder_cell.get_initial_states(encoder_output),
                                     max_step_num=10)
     """
+    check_type(finished_check_interval, 'finished_check_interval', (int),
+               'dynamic_decode')
+    if finished_check_interval < 1:
+        raise ValueError(
+            "finished_check_interval should be a positive integer, but "
+            "received {}.".format(finished_check_interval))
     if in_dygraph_mode():
-        return _dynamic_decode_imperative(decoder, inits, max_step_num,
-                                          output_time_major, impute_finished,
-                                          is_test, return_length, **kwargs)
+        return _dynamic_decode_imperative(
+            decoder, inits, max_step_num, output_time_major, impute_finished,
+            is_test, return_length, finished_check_interval, compact_finished,
+            **kwargs)
     else:
-        return _dynamic_decode_declarative(decoder, inits, max_step_num,
-                                           output_time_major, impute_finished,
-                                           is_test, return_length, **kwargs)
+        return _dynamic_decode_declarative(
+            decoder, inits, max_step_num, output_time_major, impute_finished,
+            is_test, return_length, finished_check_interval, compact_finished,
+            **kwargs)
 
 
 class DecodeHelper(object):
@@ -0,0 +1,42 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of paddle.autograd.jacobian computed row by row and vectorized.
+
+    python benchmark_jacobian.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+
+
+def main():
+    def func(x):
+        return paddle.tanh(paddle.matmul(x, x))
+
+    for size in [8, 16, 32]:
+        x = paddle.rand(shape=[size, size])
+        x.stop_gradient = False
+        for vectorize in [False, True]:
+            begin = time.time()
+            paddle.autograd.jacobian(func, x, vectorize=vectorize)
+            print("jacobian of %d rows, vectorize=%s: %.3f ms" %
+                  (x.size, vectorize, (time.time() - begin) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -122,6 +122,22 @@ class TestHessian(unittest.TestCase):
         triple_grad = paddle.grad(hessian, self.x)
         assert triple_grad is not None
 
+    def test_vectorize(self):
+        def func(x, y):
+            return paddle.sum(paddle.matmul(x, y) * x, axis=[-2, -1])
+
+        self.x.stop_gradient = False
+        self.y.stop_gradient = False
+        hessian = paddle.autograd.hessian(func, [self.x, self.y])
+        for chunk_size in [None, 3]:
+            vectorized_hessian = paddle.autograd.hessian(
+                func, [self.x, self.y], vectorize=True, chunk_size=chunk_size)
+            for i in range(len(hessian)):
+                for j in range(len(hessian[0])):
+                    assert np.allclose(vectorized_hessian[i][j].numpy(),
+                                       hessian[i][j].numpy(), self.rtol,
+                                       self.atol)
+
 
 class TestHessianFloat64(TestHessian):
     @classmethod
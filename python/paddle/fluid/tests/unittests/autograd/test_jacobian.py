@@ -144,6 +144,48 @@ class TestJacobian(unittest.TestCase):
         double_grad = paddle.grad(jacobian[0], [self.x, self.y])
         assert double_grad is not None
 
+    def test_vectorize(self):
+        def func(x, y):
+            return paddle.matmul(x, y), paddle.tanh(x) * y
+
+        self.x.stop_gradient = False
+        self.y.stop_gradient = False
+        jacobian = paddle.autograd.jacobian(func, [self.x, self.y])
+        for chunk_size in [None, 3]:
+            vectorized_jacobian = paddle.autograd.jacobian(
+                func, [self.x, self.y],
+                create_graph=True,
+                vectorize=True,
+                chunk_size=chunk_size)
+            for i in range(len(jacobian)):
+                for j in range(len(jacobian[0])):
+                    assert vectorized_jacobian[i][j].stop_gradient == False
+                    assert np.allclose(vectorized_jacobian[i][j].numpy(),
+                                       jacobian[i][j].numpy(), self.rtol,
+                                       self.atol)
+
+    def test_vectorize_allow_unused(self):
+        def func(x, y):
+            return paddle.matmul(x, x)
+
+        self.x.stop_gradient = False
+        self.y.stop_gradient = False
+        jacobian = paddle.autograd.jacobian(
+            func, [self.x, self.y], allow_unused=True, vectorize=True)
+        assert np.allclose(
+            jacobian[0].numpy(),
+            paddle.autograd.jacobian(func, self.x).numpy(), self.rtol,
+            self.atol)
+        assert jacobian[1] is None
+
+    def test_vectorize_not_batched(self):
+        def func(x):
+            return paddle.sum(x)
+
+        self.x.stop_gradient = False
+        with self.assertRaises(ValueError):
+            paddle.autograd.jacobian(func, self.x, vectorize=True)
+
 
 class TestJacobianFloat64(TestJacobian):
     @classmethod
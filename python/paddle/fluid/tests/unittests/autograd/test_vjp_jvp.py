@@ -310,6 +310,13 @@ class TestJVP(TestAutogradFunctional):
             results_with_v = jvp(f, inputs, v)
             self.check_results(results_omitting_v, results_with_v)
 
+    def test_jvp_single_element_output(self):
+        inputs = self.gen_inputs(['A', 'A'])
+        v = [paddle.ones_like(x) * 2 for x in inputs]
+        _, ys_grad = jvp(lambda x, y: paddle.sum(x * y), inputs, v)
+        ref = paddle.sum(2 * inputs[0] * 2).reshape([1])
+        self.check_results([ref], ys_grad)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,44 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of append_backward on programs where one parameter is used by all
+the layers, so that its gradients of every layer are renamed and
+accumulated.
+
+    python benchmark_backward_scaling.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+import paddle.fluid as fluid
+from test_backward_scaling import _build_shared_weight_net
+
+
+def main():
+    paddle.enable_static()
+    for num_layers in [250, 500, 1000, 2000]:
+        main_program, startup, loss = _build_shared_weight_net(num_layers)
+        num_ops = len(main_program.global_block().ops)
+        with fluid.program_guard(main_program, startup):
+            begin = time.time()
+            fluid.backward.append_backward(loss)
+            cost = time.time() - begin
+        print("%d forward ops, append_backward: %.3f s" % (num_ops, cost))
+
+
+if __name__ == '__main__':
+    main()
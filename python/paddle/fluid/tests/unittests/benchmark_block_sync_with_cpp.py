@@ -0,0 +1,54 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of building a long program, and of inserting ops in the middle of
+it, which keeps Block.ops in sync with the desc on every insert.
+
+    python benchmark_block_sync_with_cpp.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+import paddle.fluid as fluid
+from paddle.fluid.framework import Program, program_guard
+
+
+def main(num_layers=2000, num_inserts=200):
+    paddle.enable_static()
+    begin = time.time()
+    program = Program()
+    with program_guard(program, Program()):
+        x = fluid.data(name='x', shape=[None, 8], dtype='float32')
+        for _ in range(num_layers):
+            x = fluid.layers.scale(x, scale=2.0)
+    build_time = time.time() - begin
+
+    block = program.global_block()
+    begin = time.time()
+    for _ in range(num_inserts):
+        block._insert_op(
+            num_layers // 2,
+            type='scale',
+            inputs={'X': block.var('x')},
+            outputs={'Out': block.var('x')})
+    insert_time = time.time() - begin
+    print("build %d ops: %.3f s, %d synced inserts: %.3f s" %
+          (num_layers, build_time, num_inserts, insert_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Step time of recomputed blocks, keeping their inputs on device, and
+offloading them to host with different prefetch windows.
+
+    python benchmark_dygraph_activation_offload.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+from paddle.distributed.fleet.utils import recompute, offload_activations
+from test_dygraph_activation_offload import _build_blocks
+
+
+def _forward(blocks, x):
+    y = x
+    for block in blocks:
+        y = recompute(block, y, preserve_rng_state=False)
+    return y
+
+
+def main():
+    paddle.set_device('gpu' if paddle.is_compiled_with_cuda() else 'cpu')
+    blocks = _build_blocks(num_blocks=24, hidden_size=512)
+    x = paddle.randn([1024, 512])
+    x.stop_gradient = False
+    num_steps = 5
+    for kwargs in [None, {
+            "prefetch_window": 0
+    }, {
+            "prefetch_window": 2
+    }, {
+            "prefetch_window": 8
+    }]:
+        begin = time.time()
+        for _ in range(num_steps):
+            if kwargs is None:
+                y = _forward(blocks, x)
+                offloaded_bytes = 0
+            else:
+                with offload_activations(**kwargs) as offloader:
+                    y = _forward(blocks, x)
+                offloaded_bytes = offloader.offloaded_bytes
+            paddle.mean(y).backward()
+        cost = (time.time() - begin) / num_steps
+        for block in blocks:
+            block.clear_gradients()
+        print("offload %s: %d bytes offloaded to host, step time %.3f ms" %
+              (kwargs, offloaded_bytes, cost * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Peak memory and step time of the recompute plans under decreasing memory
+budgets, compared with the estimates of the planner.
+
+    python benchmark_dygraph_recompute_planner.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+from paddle.distributed.fleet.utils import plan_recompute
+from test_dygraph_recompute_planner import _build_net
+
+
+def main():
+    net = _build_net(num_blocks=24, hidden_size=256)
+    x = paddle.randn([256, 256])
+    x.stop_gradient = False
+    full_memory = plan_recompute(net, x, 1 << 40).peak_memory
+    num_steps = 5
+    for budget_ratio in [1.0, 0.5, 0.25]:
+        budget = int(full_memory * budget_ratio)
+        plan = plan_recompute(net, x, budget, offload=True)
+        begin = time.time()
+        for _ in range(num_steps):
+            paddle.mean(plan(x)).backward()
+        cost = (time.time() - begin) / num_steps
+        net.clear_gradients()
+        report = plan.report()
+        print("budget %d bytes: peak memory %d bytes, step time %.3f ms "
+              "(estimated %.3f ms), plan %s" %
+              (budget, report['peak_memory'], cost * 1e3,
+               report['step_time'] * 1e3, report['segments']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Tokens per second of beam search by dynamic_decode, checking the finished
+flags in each step, every 8 steps, and every 8 steps while compacting the
+finished batch entries.
+
+    python benchmark_dynamic_decode_check_interval.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+import paddle
+from test_dynamic_decode_check_interval import _build_decoder
+
+
+def main():
+    paddle.set_device('cpu')
+    cell, decoder = _build_decoder()
+    encoder_output = paddle.to_tensor(np.random.randn(32, 16).astype('float32'))
+    for kwargs in [{}, {
+            "finished_check_interval": 8
+    }, {
+            "finished_check_interval": 8,
+            "compact_finished": True
+    }]:
+        begin = time.time()
+        with paddle.no_grad():
+            outputs, _ = paddle.nn.dynamic_decode(
+                decoder,
+                inits=cell.get_initial_states(encoder_output),
+                max_step_num=100,
+                **kwargs)
+        cost = time.time() - begin
+        print("dynamic_decode with %s: %.1f tokens/sec" %
+              (kwargs, np.prod(outputs.shape) / cost))
+
+
+if __name__ == '__main__':
+    main()
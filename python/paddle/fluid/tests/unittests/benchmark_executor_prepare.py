@@ -0,0 +1,66 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Per-call overhead of Executor.run with the program cache against a run
+prepared by Executor.prepare, on a small program.
+
+    python benchmark_executor_prepare.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+import paddle
+import paddle.fluid as fluid
+
+
+def _time(run, iters):
+    run()
+    begin = time.time()
+    for _ in range(iters):
+        run()
+    return (time.time() - begin) / iters
+
+
+def main(iters=200):
+    paddle.enable_static()
+    main_program = fluid.Program()
+    startup_program = fluid.Program()
+    with fluid.program_guard(main_program, startup_program):
+        a = fluid.data(name='a', shape=[None, 8], dtype='float32')
+        b = fluid.data(name='b', shape=[None, 8], dtype='float32')
+        out = fluid.layers.fc(input=a + b, size=4)
+    exe = fluid.Executor(fluid.CPUPlace())
+    exe.run(startup_program)
+
+    a_np = np.random.random([2, 8]).astype('float32')
+    b_np = np.random.random([2, 8]).astype('float32')
+    run_time = _time(
+        lambda: exe.run(main_program,
+                        feed={'a': a_np, 'b': b_np},
+                        fetch_list=[out],
+                        use_program_cache=True),
+        iters)
+
+    prepared = exe.prepare(main_program, ['a', 'b'], fetch_list=[out])
+    prepared_time = _time(lambda: prepared.run([a_np, b_np]), iters)
+    prepared.close()
+    print("Executor.run: %.1f us/call, prepared run: %.1f us/call" %
+          (run_time * 1e6, prepared_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of clipping and clearing the gradients of many small parameters,
+with and without Layer.flatten_parameters.
+
+    python benchmark_layer_flatten_parameters.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+from test_layer_flatten_parameters import _build_net
+
+
+def main():
+    paddle.set_device('cpu')
+    x = paddle.randn([4, 8])
+    num_steps = 20
+    for flatten in [False, True]:
+        net = _build_net(num_layers=100)
+        if flatten:
+            net.flatten_parameters()
+        paddle.mean(net(x)).backward()
+        params_grads = [(p, p._grad_ivar()) for p in net.parameters()]
+        clip = paddle.nn.ClipGradByGlobalNorm(clip_norm=1.0)
+
+        begin = time.time()
+        for _ in range(num_steps):
+            clip(params_grads)
+            net.clear_gradients()
+        cost = (time.time() - begin) / num_steps
+        print("%d parameters, flatten=%s: clip and clear %.3f ms/step" %
+              (len(params_grads), flatten, cost * 1e3))
+
+
+if __name__ == '__main__':
+    main()
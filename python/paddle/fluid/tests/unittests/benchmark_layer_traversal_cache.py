@@ -0,0 +1,46 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of Layer.parameters and Layer.state_dict on a deep net, with and
+without the traversal cache.
+
+    python benchmark_layer_traversal_cache.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+from test_layer_traversal_cache import _build_net
+
+
+def main():
+    net = paddle.nn.Sequential(
+        *[paddle.nn.Sequential(_build_net()) for _ in range(200)])
+    num_calls = 20
+    for cached in [False, True]:
+        begin = time.time()
+        for _ in range(num_calls):
+            if not cached:
+                net._traversal_cache.clear()
+            net.parameters()
+            net.state_dict()
+        cost = (time.time() - begin) / num_calls
+        print("%d sublayers, cached=%s: parameters and state_dict %.3f ms" %
+              (len(net.sublayers()), cached, cost * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of an Adam step on many small parameters, updated one by one, by the
+multi-tensor path, and by the multi-tensor path on flattened parameters.
+
+    python benchmark_multi_tensor_optimizer.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+from test_multi_tensor_optimizer import _build_net
+
+
+def main():
+    paddle.set_device('cpu')
+    x = paddle.randn([4, 8])
+    num_steps = 20
+    for use_multi_tensor, flatten in [(False, False), (True, False),
+                                      (True, True)]:
+        net = _build_net(num_layers=100)
+        if flatten:
+            net.flatten_parameters()
+        opt = paddle.optimizer.Adam(
+            parameters=net.parameters(), use_multi_tensor=use_multi_tensor)
+        paddle.mean(net(x)).backward()
+        opt.step()
+
+        begin = time.time()
+        for _ in range(num_steps):
+            opt.step()
+        cost = (time.time() - begin) / num_steps
+        print("Adam with %d parameters, use_multi_tensor=%s, flatten=%s: "
+              "%.3f ms/step" % (len(net.parameters()), use_multi_tensor,
+                                flatten, cost * 1e3))
+
+
+if __name__ == '__main__':
+    main()
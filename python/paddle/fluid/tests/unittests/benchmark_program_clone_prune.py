@@ -0,0 +1,53 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of Program.clone(for_test=True) and of pruning a program with many
+ops, whose Operators are created lazily.
+
+    python benchmark_program_clone_prune.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+import paddle.fluid as fluid
+from paddle.fluid.framework import Program, program_guard
+
+
+def main(num_layers=500):
+    paddle.enable_static()
+    program = Program()
+    with program_guard(program, Program()):
+        hidden = fluid.data(name='x', shape=[None, 8], dtype='float32')
+        for _ in range(num_layers):
+            hidden = fluid.layers.fc(hidden, size=8)
+            hidden = fluid.layers.dropout(hidden, dropout_prob=0.1)
+        loss = fluid.layers.mean(hidden)
+        fluid.optimizer.SGD(learning_rate=0.01).minimize(loss)
+
+    num_ops = len(program.global_block().ops)
+    begin = time.time()
+    program.clone(for_test=True)
+    clone_time = time.time() - begin
+    begin = time.time()
+    program._prune_with_input(['x'], [loss])
+    prune_time = time.time() - begin
+    print("%d ops, clone(for_test=True): %.3f s, prune: %.3f s" %
+          (num_ops, clone_time, prune_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time per generated token of a transformer decoder with the concatenated
+`MultiHeadAttention.Cache` and with `MultiHeadAttention.KVCache`, with and
+without reordering the batch entries at each step as beam search does, and
+the speedup of KVCache.
+
+    python benchmark_transformer_kv_cache.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+from paddle.nn import MultiHeadAttention
+from test_transformer_kv_cache import TransformerCell
+
+
+def _reorder(states, index):
+    return [
+        state.reorder(index) if isinstance(state, MultiHeadAttention.KVCache)
+        else MultiHeadAttention.Cache(
+            paddle.gather(state.k, index), paddle.gather(state.v, index))
+        for state in states
+    ]
+
+
+def _cost_per_token(cell, memory, length, max_length, reorder):
+    batch_size, _, d_model = memory.shape
+    caches = cell.decoder.gen_cache(memory, max_length=max_length)
+    states = [incremental_cache for incremental_cache, _ in caches]
+    static_caches = [static_cache for _, static_cache in caches]
+    inputs = paddle.randn([batch_size, d_model])
+    indices = [
+        paddle.randint(0, batch_size, [batch_size], dtype='int64')
+        for _ in range(length)
+    ]
+    begin = time.time()
+    with paddle.no_grad():
+        for index in indices:
+            _, states = cell(inputs, states, memory, static_caches)
+            if reorder:
+                states = _reorder(states, index)
+    return (time.time() - begin) / length
+
+
+def main():
+    paddle.set_device('cpu')
+    paddle.seed(2021)
+    batch_size, d_model, nhead = 4, 16, 2
+    decoder = paddle.nn.TransformerDecoder(
+        paddle.nn.TransformerDecoderLayer(
+            d_model, nhead, 4 * d_model, dropout=0.), 2)
+    cell = TransformerCell(decoder,
+                           paddle.nn.Embedding(1000, d_model),
+                           paddle.nn.Linear(d_model, 1000))
+    cell.eval()
+    memory = paddle.randn([batch_size, 16, d_model])
+    for reorder in [False, True]:
+        for length in [32, 128, 512]:
+            cost = _cost_per_token(cell, memory, length, None, reorder)
+            kv_cost = _cost_per_token(cell, memory, length, length + 1,
+                                      reorder)
+            print("generating %d tokens, reorder=%s: %.3f ms/token with "
+                  "Cache, %.3f ms/token with KVCache, %.2fx speedup" %
+                  (length, reorder, cost * 1e3, kv_cost * 1e3,
+                   cost / kv_cost))
+
+
+if __name__ == '__main__':
+    main()
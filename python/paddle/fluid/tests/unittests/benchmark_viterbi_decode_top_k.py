@@ -0,0 +1,56 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Sentences per second of the viterbi_decode op and of the k-best viterbi
+decoding, on a batch of sentences of very different lengths.
+
+    python benchmark_viterbi_decode_top_k.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy as np
+import paddle
+from paddle.text.viterbi_decode import _k_best_viterbi_decode
+
+
+def main():
+    paddle.set_device('cpu')
+    bz, length, ntags = 64, 64, 20
+    potentials = paddle.randn([bz, length, ntags])
+    transitions = paddle.randn([ntags, ntags])
+    # sentences of very different lengths, as in serving
+    lengths = paddle.to_tensor(
+        np.random.randint(1, length + 1, [bz]).astype('int64'))
+    num_runs = 10
+    for name, decode in [
+        ("viterbi_decode op", lambda: paddle.text.viterbi_decode(
+            potentials, transitions, lengths)),
+        ("top_k=1", lambda: _k_best_viterbi_decode(
+            potentials, transitions, lengths, True, 1)),
+        ("top_k=4", lambda: paddle.text.viterbi_decode(
+            potentials, transitions, lengths, top_k=4)),
+    ]:
+        decode()
+        begin = time.time()
+        for _ in range(num_runs):
+            decode()
+        cost = (time.time() - begin) / num_runs
+        print("%s: %.1f sentences/sec" % (name, bz / cost))
+
+
+if __name__ == '__main__':
+    main()
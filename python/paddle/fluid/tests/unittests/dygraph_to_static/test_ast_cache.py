@@ -0,0 +1,80 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import inspect
+import os
+import shutil
+import tempfile
+import unittest
+
+import paddle
+from paddle.fluid.dygraph.dygraph_to_static import DygraphToStaticAst
+from paddle.fluid.dygraph.dygraph_to_static.origin_info import global_origin_info_map
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import FunctionCache
+
+
+def dyfunc_with_if(x):
+    if paddle.mean(x) > 0:
+        y = x + 1
+    else:
+        y = x - 1
+    return y
+
+
+class TestAstCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        os.environ["FLAGS_DY2STATIC_CACHE_DIR"] = self.cache_dir
+
+    def tearDown(self):
+        del os.environ["FLAGS_DY2STATIC_CACHE_DIR"]
+        shutil.rmtree(self.cache_dir)
+
+    def _origin_infos(self, static_func):
+        static_filepath = inspect.getsourcefile(static_func)
+        return sorted((loc[1], info.location.lineno, info.location.col_offset)
+                      for loc, info in global_origin_info_map.items()
+                      if loc[0] == static_filepath)
+
+    def test_reuse(self):
+        static_func = FunctionCache().convert_with_cache(dyfunc_with_if)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        get_static_ast = DygraphToStaticAst.get_static_ast
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("The AST should not be transformed again.")
+
+        # a new FunctionCache acts like a restarted process
+        DygraphToStaticAst.get_static_ast = _fail
+        try:
+            cached_func = FunctionCache().convert_with_cache(dyfunc_with_if)
+        finally:
+            DygraphToStaticAst.get_static_ast = get_static_ast
+
+        self.assertEqual(
+            inspect.getsource(static_func), inspect.getsource(cached_func))
+        self.assertNotEqual(
+            inspect.getsourcefile(static_func),
+            inspect.getsourcefile(cached_func))
+        # the original information is restored for error reporting
+        self.assertTrue(len(self._origin_infos(cached_func)) > 0)
+        self.assertEqual(
+            self._origin_infos(static_func), self._origin_infos(cached_func))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import ProgramCache
+
+
+def add_one(x):
+    return x + 1
+
+
+class TestProgramCacheBound(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def _static_func(self, **kwargs):
+        static_func = paddle.jit.to_static(add_one)
+        static_func._program_cache = ProgramCache(**kwargs)
+        return static_func
+
+    def _check_call(self, static_func, shape):
+        x = np.random.random(shape).astype('float32')
+        out = static_func(paddle.to_tensor(x))
+        self.assertTrue(np.allclose(out.numpy(), x + 1))
+
+    def test_lru(self):
+        static_func = self._static_func(max_size=2)
+        for shape in [[1, 4], [2, 4], [3, 4]]:
+            self._check_call(static_func, shape)
+        stats = static_func.get_cache_stats()
+        self.assertEqual(stats["traced"], 3)
+        self.assertEqual(stats["cached"], 2)
+        self.assertEqual(stats["evicted"], 1)
+        self.assertEqual(static_func.get_traced_count(), 3)
+        # the latest traced program is kept
+        self.assertEqual(
+            static_func.concrete_program.inputs[0].shape, (3, 4))
+
+    def test_guards(self):
+        static_func = self._static_func(max_size=2)
+        for shape in [[1, 4], [2, 4], [1, 4]]:
+            self._check_call(static_func, shape)
+        stats = static_func.get_cache_stats()
+        self.assertEqual(stats["guard_hits"], 1)
+        self.assertEqual(stats["hits"], 0)
+
+        # the guard hit refreshes [1, 4], so [2, 4] is evicted with its guard
+        self._check_call(static_func, [3, 4])
+        stats = static_func.get_cache_stats()
+        self.assertEqual(stats["evicted"], 1)
+        self.assertEqual(stats["guarded"], 2)
+        self._check_call(static_func, [1, 4])
+        stats = static_func.get_cache_stats()
+        self.assertEqual(stats["traced"], 3)
+        self.assertEqual(stats["guard_hits"], 2)
+
+    def test_relax_dim(self):
+        static_func = self._static_func(relax_dim_threshold=2)
+        for shape in [[1, 4], [2, 4], [3, 4], [5, 4], [7, 4]]:
+            self._check_call(static_func, shape)
+        stats = static_func.get_cache_stats()
+        self.assertEqual(stats["traced"], 3)
+        self.assertEqual(stats["relaxed_dims"], 1)
+        self.assertEqual(
+            static_func.concrete_program.inputs[0].shape, (-1, 4))
+
+    def test_default(self):
+        static_func = paddle.jit.to_static(add_one)
+        for shape in [[1, 4], [2, 4], [3, 4]]:
+            self._check_call(static_func, shape)
+        stats = static_func.get_cache_stats()
+        self.assertEqual(stats["cached"], 3)
+        self.assertEqual(stats["evicted"], 0)
+        self.assertEqual(stats["relaxed_dims"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
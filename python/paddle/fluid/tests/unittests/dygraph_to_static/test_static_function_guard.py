@@ -0,0 +1,75 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+from paddle.fluid.dygraph.dygraph_to_static import program_translator
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import StaticFunction
+
+
+class SmallNet(paddle.nn.Layer):
+    def __init__(self):
+        super(SmallNet, self).__init__()
+        self.linear = paddle.nn.Linear(4, 4)
+
+    @paddle.jit.to_static
+    def forward(self, x, scale=1.0):
+        return self.linear(x) * scale
+
+
+class TestStaticFunctionGuard(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.net = SmallNet()
+        self.num_concrete_calls = [0]
+        self.get_concrete_program = StaticFunction.get_concrete_program
+
+        num_concrete_calls = self.num_concrete_calls
+        get_concrete_program = self.get_concrete_program
+
+        def _counted(*args, **kwargs):
+            num_concrete_calls[0] += 1
+            return get_concrete_program(*args, **kwargs)
+
+        StaticFunction.get_concrete_program = _counted
+
+    def tearDown(self):
+        StaticFunction.get_concrete_program = self.get_concrete_program
+
+    def test_guard(self):
+        x = paddle.rand([2, 4])
+        out1 = self.net(x)
+        out2 = self.net(paddle.to_tensor(x.numpy()))
+        self.assertEqual(self.num_concrete_calls[0], 1)
+        self.assertTrue(np.allclose(out1.numpy(), out2.numpy()))
+
+        # new shapes and python values build the CacheKey again
+        self.net(paddle.rand([3, 4]))
+        self.assertEqual(self.num_concrete_calls[0], 2)
+        out3 = self.net(x, scale=2.0)
+        self.assertEqual(self.num_concrete_calls[0], 3)
+        self.assertTrue(np.allclose(out3.numpy(), out1.numpy() * 2.0))
+        self.assertEqual(self.net.forward.get_traced_count(), 3)
+
+        # arbitrary python objects are not guarded
+        self.assertIsNone(
+            program_translator._guard_signature((x, object()), {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
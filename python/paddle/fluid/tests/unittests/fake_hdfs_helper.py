@@ -0,0 +1,105 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+A fake hadoop fs helper process for HDFSSessionClient, which serves the
+`hadoop fs` shell commands on the local file system.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+
+
+def _no_such_file(cmd, path):
+    return 1, ["{}: `{}': No such file or directory".format(cmd, path)]
+
+
+def _ls_line(path):
+    st = os.stat(path)
+    mode = "drwxr-xr-x" if os.path.isdir(path) else "-rw-r--r--"
+    mtime = time.strftime("%Y-%m-%d %H:%M", time.localtime(st.st_mtime))
+    return "{} - user supergroup {} {} {}".format(mode, st.st_size, mtime,
+                                                  path)
+
+
+def run(cmd):
+    args = cmd.split()
+    op, paths = args[0], args[1:]
+
+    if op == "ls":
+        p = paths[0]
+        if not os.path.exists(p):
+            return _no_such_file(op, p)
+        if os.path.isfile(p):
+            return 0, [_ls_line(p)]
+        out = ["Found {} items".format(len(os.listdir(p)))]
+        for name in sorted(os.listdir(p)):
+            out.append(_ls_line(os.path.join(p, name)))
+        return 0, out
+    if op == "test":
+        return (0 if os.path.isdir(paths[1]) else 1), []
+    if op == "mkdir":
+        p = paths[-1]
+        if paths[0] != "-p" and not os.path.exists(os.path.dirname(
+                os.path.abspath(p))):
+            return _no_such_file(op, p)
+        if not os.path.exists(p):
+            os.makedirs(p)
+        return 0, []
+    if op == "mv":
+        if not os.path.exists(paths[0]):
+            return _no_such_file(op, paths[0])
+        shutil.move(paths[0], paths[1])
+        return 0, []
+    if op in ("rmr", "rm"):
+        if not os.path.exists(paths[0]):
+            return _no_such_file(op, paths[0])
+        if os.path.isdir(paths[0]):
+            shutil.rmtree(paths[0])
+        else:
+            os.remove(paths[0])
+        return 0, []
+    if op in ("put", "get"):
+        src, dst = paths
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src.rstrip("/")))
+        if os.path.isdir(src):
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy(src, dst)
+        return 0, []
+    if op == "touchz":
+        open(paths[0], 'a').close()
+        return 0, []
+    if op == "cat":
+        with open(paths[0]) as f:
+            return 0, f.read().splitlines()
+    return 255, ["unknown command {}".format(op)]
+
+
+def main():
+    for line in iter(sys.stdin.readline, ""):
+        req = json.loads(line)
+        try:
+            ret, out = run(req["cmd"])
+        except Exception as e:
+            ret, out = 1, [str(e)]
+        sys.stdout.write(json.dumps({"ret": ret, "out": out}) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
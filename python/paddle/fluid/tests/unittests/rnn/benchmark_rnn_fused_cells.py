@@ -0,0 +1,46 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Time of an LSTM run step by step by paddle.fluid.layers.rnn, and by
+paddle.nn.RNN with the fused rnn op.
+
+    python benchmark_rnn_fused_cells.py
+"""
+
+from __future__ import print_function
+
+import time
+
+import paddle
+from test_rnn_fused_cells import _step_by_step
+
+
+def main():
+    paddle.disable_static(paddle.CPUPlace())
+    cell = paddle.nn.LSTMCell(16, 32)
+    rnn = paddle.nn.RNN(cell)
+    for time_steps in [50, 200, 800]:
+        x = paddle.randn([4, time_steps, 16])
+        begin = time.time()
+        _step_by_step([cell], x, None, False, False)
+        step_cost = time.time() - begin
+        begin = time.time()
+        rnn(x)
+        fused_cost = time.time() - begin
+        print("LSTM with %d time steps: %.3f ms step by step, %.3f ms fused" %
+              (time_steps, step_cost * 1e3, fused_cost * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import paddle
+paddle.set_default_dtype("float64")
+from paddle.fluid.layers.utils import flatten
+from paddle.nn.layer.rnn import _fused_rnn_mode
+
+import numpy as np
+import unittest
+
+
+class CustomLSTMCell(paddle.nn.LSTMCell):
+    def forward(self, inputs, states=None):
+        h, (h, c) = super(CustomLSTMCell, self).forward(inputs, states)
+        return h * 2, (h, c)
+
+
+def _step_by_step(cells, inputs, initial_states, time_major, is_reverse):
+    if len(cells) == 1:
+        return paddle.fluid.layers.rnn(
+            cells[0],
+            inputs,
+            initial_states,
+            time_major=time_major,
+            is_reverse=is_reverse)
+    return paddle.fluid.layers.birnn(
+        cells[0], cells[1], inputs, initial_states, time_major=time_major)
+
+
+class TestFusedRNNCells(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static(paddle.CPUPlace())
+
+    def _check(self, cells, time_major=False, is_reverse=False):
+        x = np.random.randn(4, 12, 16)
+        if time_major:
+            x = np.transpose(x, [1, 0, 2])
+        if len(cells) == 1:
+            rnn = paddle.nn.RNN(cells[0], is_reverse, time_major)
+        else:
+            rnn = paddle.nn.BiRNN(cells[0], cells[1], time_major)
+
+        inputs = [paddle.to_tensor(x, stop_gradient=False) for _ in range(2)]
+        y1, states1 = rnn(inputs[0])
+        y2, states2 = _step_by_step(cells, inputs[1], None, time_major,
+                                    is_reverse)
+        np.testing.assert_allclose(y1.numpy(), y2.numpy(), atol=1e-8)
+        for s1, s2 in zip(flatten(states1), flatten(states2)):
+            np.testing.assert_allclose(s1.numpy(), s2.numpy(), atol=1e-8)
+
+        grads = []
+        for y, x in zip([y1, y2], inputs):
+            params_grads = paddle.grad([paddle.mean(y * y)],
+                                       [x] + rnn.parameters())
+            grads.append([g.numpy() for g in params_grads])
+        for g1, g2 in zip(*grads):
+            np.testing.assert_allclose(g1, g2, atol=1e-8)
+
+    def test_cells(self):
+        for cell_cls in [paddle.nn.LSTMCell, paddle.nn.GRUCell]:
+            self._check([cell_cls(16, 32)])
+            self._check([cell_cls(16, 32)], time_major=True, is_reverse=True)
+            self._check([cell_cls(16, 32), cell_cls(16, 32)])
+        for activation in ["tanh", "relu"]:
+            self._check([paddle.nn.SimpleRNNCell(16, 32, activation)])
+
+    def test_weight_norm(self):
+        # the weights are recomputed by a forward pre-hook of the cell
+        cell = paddle.nn.utils.weight_norm(
+            paddle.nn.LSTMCell(16, 32), name='weight_ih')
+        self.assertIsNone(_fused_rnn_mode(cell, paddle.randn([4, 12, 16])))
+        self._check([cell])
+
+    def test_fused_rnn_mode(self):
+        x = paddle.randn([4, 12, 16])
+        self.assertEqual(
+            _fused_rnn_mode(paddle.nn.LSTMCell(16, 32), x), "LSTM")
+        self.assertEqual(
+            _fused_rnn_mode(paddle.nn.SimpleRNNCell(16, 32, "relu"), x),
+            "RNN_RELU")
+        self.assertIsNone(_fused_rnn_mode(CustomLSTMCell(16, 32), x))
+        self.assertIsNone(
+            _fused_rnn_mode(
+                paddle.nn.GRUCell(
+                    16, 32, bias_ih_attr=False), x))
+        self.assertIsNone(
+            _fused_rnn_mode(paddle.nn.LSTMCell(16, 32), x.astype('int64')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import paddle
+from paddle.fluid import core
+from paddle.fluid.ir import apply_build_strategy
+
+paddle.enable_static()
+
+
+def get_model():
+    main = paddle.static.Program()
+    startup = paddle.static.Program()
+    with paddle.static.program_guard(main, startup):
+        x = paddle.static.data(name='x', shape=[None, 16], dtype='float32')
+        hidden = paddle.static.nn.fc(x, 16, activation='relu')
+        loss = paddle.mean(paddle.static.nn.fc(hidden, 1))
+        paddle.optimizer.SGD(learning_rate=0.01).minimize(loss)
+    return main, startup
+
+
+class TestApplyPassCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.build_strategy = paddle.static.BuildStrategy()
+        self.build_strategy.fuse_elewise_add_act_ops = True
+        self.build_strategy.enable_inplace = True
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def _apply(self):
+        paddle.seed(2021)
+        main, startup = get_model()
+        apply_build_strategy(
+            main,
+            startup,
+            self.build_strategy, {"use_cuda": False},
+            cache_dir=self.cache_dir)
+        return main, startup
+
+    def test_cache(self):
+        main1, startup1 = self._apply()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        num_applied = [0]
+        apply_pass = core.apply_pass
+
+        def _counted_apply_pass(*args):
+            num_applied[0] += 1
+            return apply_pass(*args)
+
+        core.apply_pass = _counted_apply_pass
+        try:
+            main2, startup2 = self._apply()
+        finally:
+            core.apply_pass = apply_pass
+        self.assertEqual(num_applied[0], 0)
+        self.assertEqual(
+            [op.type for op in main1.global_block().ops],
+            [op.type for op in main2.global_block().ops])
+        self.assertIn('fused_elemwise_add_activation',
+                      [op.type for op in main2.global_block().ops])
+
+    def test_key(self):
+        self._apply()
+        self.build_strategy.enable_inplace = False
+        self._apply()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+import paddle.fluid as fluid
+
+paddle.enable_static()
+
+
+def _build_shared_weight_net(num_layers):
+    """
+    out = x * w ** num_layers, the same w is used by all the layers, so its
+    gradient is accumulated from num_layers outputs.
+    """
+    main = fluid.Program()
+    startup = fluid.Program()
+    with fluid.program_guard(main, startup):
+        x = fluid.data(name='x', shape=[None, 4], dtype='float32')
+        w = fluid.layers.create_parameter(
+            shape=[1],
+            dtype='float32',
+            name='w',
+            default_initializer=fluid.initializer.Constant(1.0))
+        hidden = x
+        for _ in range(num_layers):
+            hidden = fluid.layers.elementwise_mul(hidden, w)
+        loss = fluid.layers.mean(hidden)
+    return main, startup, loss
+
+
+class TestAppendBackwardScaling(unittest.TestCase):
+    def test_accumulated_grad(self):
+        num_layers = 10
+        main, startup, loss = _build_shared_weight_net(num_layers)
+        with fluid.program_guard(main, startup):
+            params_grads = fluid.backward.append_backward(loss)
+        w_grad = params_grads[0][1]
+
+        # every renamed gradient is consumed by the accumulation
+        renamed_outputs = set()
+        renamed_inputs = set()
+        for op in main.global_block().ops:
+            renamed_outputs.update(
+                name for name in op.output_arg_names if "@RENAME@" in name)
+            renamed_inputs.update(
+                name for name in op.input_arg_names if "@RENAME@" in name)
+        self.assertEqual(len(renamed_outputs), num_layers)
+        self.assertEqual(renamed_outputs, renamed_inputs)
+
+        exe = fluid.Executor(fluid.CPUPlace())
+        exe.run(startup)
+        x = np.random.random([2, 4]).astype('float32')
+        res, = exe.run(main, feed={'x': x}, fetch_list=[w_grad])
+        self.assertTrue(np.allclose(res, [num_layers * x.mean()], rtol=1e-5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import paddle
+import paddle.fluid as fluid
+from paddle.fluid.framework import Program, program_guard
+
+paddle.enable_static()
+
+
+def _build_program(num_layers):
+    program = Program()
+    with program_guard(program, Program()):
+        x = fluid.data(name='x', shape=[None, 8], dtype='float32')
+        for _ in range(num_layers):
+            x = fluid.layers.scale(x, scale=2.0)
+    return program
+
+
+class TestBlockSyncWithCpp(unittest.TestCase):
+    def _check_synced(self, block):
+        self.assertEqual(len(block.ops), block.desc.op_size())
+        for i, op in enumerate(block.ops):
+            self.assertTrue(op.desc == block.desc.op(i))
+
+    def test_mutators_keep_synced(self):
+        block = _build_program(4).global_block()
+        block._sync_with_cpp()
+        version = block.desc._version()
+
+        block._insert_op(1, type='scale', inputs={'X': block.var('x')},
+                         outputs={'Out': block.var('x')})
+        block._remove_op(0)
+        block.create_var(name='y', shape=[1], dtype='float32')
+        self.assertEqual(block._synced_version, block.desc._version())
+        self.assertGreater(block.desc._version(), version)
+        self._check_synced(block)
+
+    def test_sync_changes_in_cpp(self):
+        block = _build_program(4).global_block()
+        ops = list(block.ops)
+
+        # change the desc behind the Python side
+        block.desc._remove_op(1, 2)
+        op_desc = block.desc._insert_op(2)
+        op_desc.copy_from(ops[0].desc)
+        block.desc.append_op().copy_from(ops[0].desc)
+        block.desc.var(b'z')
+        block.desc._remove_var(b'x')
+
+        block._sync_with_cpp()
+        self._check_synced(block)
+        # the untouched ops keep their Operators
+        self.assertIs(block.ops[0], ops[0])
+        self.assertIs(block.ops[1], ops[2])
+        self.assertTrue(block.has_var('z'))
+        self.assertFalse(block.has_var('x'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import unittest
+import numpy as np
+
+import paddle
+import paddle.fluid as fluid
+from paddle.distributed.fleet.utils.fs import LocalFS
+from paddle.fluid.incubate.checkpoint.checkpoint_saver import CheckpointSaver, PaddleDeltaModel
+
+paddle.enable_static()
+
+
+class CheckpointSaverDeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.dir_path = os.path.abspath("./checkpoint_saver_delta_test")
+        self.fs = LocalFS()
+        self.fs.delete(self.dir_path)
+
+        self.main_prog = fluid.Program()
+        startup_prog = fluid.Program()
+        with fluid.program_guard(self.main_prog, startup_prog):
+            ids = fluid.data(name='ids', shape=[None, 1], dtype='int64')
+            emb = fluid.embedding(
+                input=ids,
+                size=[1000, 16],
+                param_attr=fluid.ParamAttr(name="emb_w"))
+            fluid.layers.fc(input=emb, size=4)
+
+        self.exe = fluid.Executor(fluid.CPUPlace())
+        self.exe.run(startup_prog)
+
+    def tearDown(self):
+        self.fs.delete(self.dir_path)
+
+    def _get(self, name):
+        return np.array(fluid.global_scope().find_var(name).get_tensor())
+
+    def _set(self, name, value):
+        fluid.global_scope().find_var(name).get_tensor().set(
+            value, fluid.CPUPlace())
+
+    def _update_rows(self, rows):
+        emb = self._get("emb_w")
+        emb[rows] += 1.0
+        self._set("emb_w", emb)
+        return emb
+
+    def test_delta_chain(self):
+        saver = CheckpointSaver(self.fs, max_delta_chain=2)
+        model = PaddleDeltaModel(self.exe, self.main_prog)
+
+        _, n0 = saver.save_checkpoint(self.dir_path, [model], delta=True)
+        self._update_rows([1, 7])
+        real_path, n1 = saver.save_checkpoint(
+            self.dir_path, [model], delta=True)
+        self.assertEqual(saver._chain, [n0, n1])
+
+        # only the dirty rows of the embedding are written
+        with open("{}/{}".format(real_path, model._delta_file_name),
+                  'rb') as f:
+            delta = pickle.load(f)
+        self.assertEqual(list(delta.keys()), ["emb_w"])
+        self.assertEqual(delta["emb_w"][0], "rows")
+        self.assertEqual(list(delta["emb_w"][1]), [1, 7])
+
+        expected = self._update_rows([3])
+        _, n2 = saver.save_checkpoint(self.dir_path, [model], delta=True)
+        self.assertEqual(saver._chain, [n0, n1, n2])
+
+        # compacted by a full save once the chain is full
+        _, n3 = saver.save_checkpoint(self.dir_path, [model], delta=True)
+        self.assertEqual(saver._chain, [n3])
+
+        # rebuild from the base and the deltas
+        self._set("emb_w", np.zeros_like(expected))
+        loader = CheckpointSaver(self.fs)
+        loader.load_checkpoint(
+            self.dir_path, [PaddleDeltaModel(self.exe, self.main_prog)],
+            trainer_id=None,
+            checkpoint_no=n2)
+        self.assertEqual(loader._chain, [n0, n1, n2])
+        self.assertTrue(np.array_equal(self._get("emb_w"), expected))
+
+        # the checkpoints n2 depends on are kept
+        saver.clean_redundant_checkpoints(self.dir_path, reserved=[n2])
+        self.assertEqual(saver.get_checkpoint_no(self.dir_path), [n0, n1, n2])
+
+    def test_full_without_delta(self):
+        saver = CheckpointSaver(self.fs, max_delta_chain=2)
+        model = PaddleDeltaModel(self.exe, self.main_prog)
+
+        _, n0 = saver.save_checkpoint(self.dir_path, [model])
+        _, n1 = saver.save_checkpoint(self.dir_path, [model])
+        self.assertEqual(saver._chain, [n1])
+
+
+if __name__ == '__main__':
+    unittest.main()
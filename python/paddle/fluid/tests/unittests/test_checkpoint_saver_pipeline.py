@@ -0,0 +1,126 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import threading
+import unittest
+import numpy as np
+
+import paddle
+import paddle.fluid as fluid
+from paddle.distributed.fleet.utils.fs import LocalFS
+from paddle.fluid.incubate.checkpoint.checkpoint_saver import CheckpointSaver, PaddleModel
+
+paddle.enable_static()
+
+
+class FakeRemoteFS(LocalFS):
+    """
+    A LocalFS which pretends to be remote, so that checkpoints go through
+    the local cache and upload/download.
+    """
+
+    def __init__(self):
+        self.uploaded = []
+        self._lock = threading.Lock()
+
+    def need_upload_download(self):
+        return True
+
+    def upload(self, local_path, fs_path):
+        with self._lock:
+            self.uploaded.append(fs_path)
+        if os.path.isdir(local_path):
+            shutil.copytree(local_path, fs_path)
+        else:
+            shutil.copy(local_path, fs_path)
+
+    def download(self, fs_path, local_path):
+        if os.path.isdir(fs_path):
+            shutil.copytree(fs_path, local_path)
+        else:
+            shutil.copy(fs_path, local_path)
+
+
+class CheckpointSaverPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.dir_path = os.path.abspath("./checkpoint_saver_pipeline_test")
+        self.cache_path = os.path.abspath("./checkpoint_saver_pipeline_cache")
+        LocalFS().delete(self.dir_path)
+
+        self.main_prog = fluid.Program()
+        startup_prog = fluid.Program()
+        with fluid.program_guard(self.main_prog, startup_prog):
+            x = fluid.data(name='x', shape=[None, 256], dtype='float32')
+            fluid.layers.fc(input=x,
+                            size=256,
+                            param_attr=fluid.ParamAttr(name="fc_w"))
+
+        self.exe = fluid.Executor(fluid.CPUPlace())
+        self.exe.run(startup_prog)
+
+    def tearDown(self):
+        LocalFS().delete(self.dir_path)
+        LocalFS().delete(self.cache_path)
+
+    def _get(self, name):
+        return np.array(fluid.global_scope().find_var(name).get_tensor())
+
+    def test_pipelined_upload(self):
+        fs = FakeRemoteFS()
+        # the param file of 256KB is uploaded as parts of 64KB
+        saver = CheckpointSaver(
+            fs,
+            upload_threads=3,
+            upload_part_size=64 * 1024,
+            max_upload_cache_bytes=128 * 1024)
+        model = PaddleModel(self.exe, self.main_prog)
+        expected = self._get("fc_w")
+
+        real_path, n = saver.save_checkpoint(
+            self.dir_path, [model], local_cache_path=self.cache_path)
+        self.assertGreater(
+            len([p for p in fs.uploaded if ".part-" in p]), 1)
+        self.assertFalse(
+            os.path.exists("{}/__paddle_checkpoint__.{}.saved_cache".format(
+                self.cache_path, n)))
+
+        fluid.global_scope().find_var("fc_w").get_tensor().set(
+            np.zeros_like(expected), fluid.CPUPlace())
+        saver.load_checkpoint(
+            self.dir_path, [model],
+            trainer_id=None,
+            local_cache_path=self.cache_path)
+        self.assertTrue(np.array_equal(self._get("fc_w"), expected))
+
+    def test_legacy_upload(self):
+        fs = FakeRemoteFS()
+        saver = CheckpointSaver(fs)
+        model = PaddleModel(self.exe, self.main_prog)
+        expected = self._get("fc_w")
+
+        saver.save_checkpoint(
+            self.dir_path, [model], local_cache_path=self.cache_path)
+        self.assertEqual(len(fs.uploaded), 1)
+
+        saver.load_checkpoint(
+            self.dir_path, [model],
+            trainer_id=None,
+            local_cache_path=self.cache_path)
+        self.assertTrue(np.array_equal(self._get("fc_w"), expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
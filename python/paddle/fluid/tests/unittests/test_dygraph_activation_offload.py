@@ -0,0 +1,128 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+from paddle.autograd import PyLayer
+from paddle.autograd.py_layer import _saved_tensors_hooks
+from paddle.distributed.fleet.utils import recompute, offload_activations
+
+
+class cus_tanh(PyLayer):
+    @staticmethod
+    def forward(ctx, x):
+        y = paddle.tanh(x)
+        ctx.save_for_backward(y)
+        return y
+
+    @staticmethod
+    def backward(ctx, dy):
+        y, = ctx.saved_tensor()
+        return dy * (1 - paddle.square(y))
+
+
+def _build_blocks(num_blocks=4, hidden_size=32):
+    paddle.seed(2021)
+    return [
+        paddle.nn.Sequential(
+            paddle.nn.Linear(hidden_size, hidden_size), paddle.nn.ReLU())
+        for _ in range(num_blocks)
+    ]
+
+
+class TestActivationOffload(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.device = 'gpu' if paddle.is_compiled_with_cuda() else 'cpu'
+        paddle.set_device(self.device)
+        self.x = paddle.to_tensor(np.random.randn(16, 32).astype('float32'))
+        self.x.stop_gradient = False
+
+    def _grads(self, blocks, **kwargs):
+        y = self.x
+        if kwargs:
+            with offload_activations(**kwargs) as offloader:
+                for block in blocks:
+                    # the RNG state could not be preserved on CPU
+                    y = recompute(block, y, preserve_rng_state=False)
+        else:
+            offloader = None
+            for block in blocks:
+                y = block(y)
+        paddle.mean(y).backward()
+        grads = [p.grad.numpy() for block in blocks for p in block.parameters()]
+        grads.append(self.x.grad.numpy())
+        for block in blocks:
+            block.clear_gradients()
+        self.x.clear_gradient()
+        return grads, offloader
+
+    def test_saved_tensors_hooks(self):
+        packed, unpacked = [], []
+
+        def _pack(t):
+            packed.append(t)
+            return len(packed) - 1
+
+        def _unpack(index):
+            unpacked.append(index)
+            return packed[index]
+
+        x = paddle.to_tensor(np.random.randn(4, 8).astype('float32'))
+        x.stop_gradient = False
+        with _saved_tensors_hooks(_pack, _unpack):
+            y = x
+            for _ in range(3):
+                y = cus_tanh.apply(y)
+        paddle.sum(y).backward()
+        self.assertEqual(unpacked, [2, 1, 0])
+
+        x2 = paddle.to_tensor(x.numpy())
+        x2.stop_gradient = False
+        paddle.sum(paddle.tanh(paddle.tanh(paddle.tanh(x2)))).backward()
+        self.assertTrue(np.allclose(x.grad.numpy(), x2.grad.numpy()))
+
+    def test_recompute(self):
+        blocks = _build_blocks()
+        expected, _ = self._grads(blocks)
+        for prefetch_window in [0, 1, 2, 8]:
+            grads, offloader = self._grads(
+                blocks, prefetch_window=prefetch_window)
+            for g1, g2 in zip(expected, grads):
+                self.assertTrue(np.allclose(g1, g2, atol=1e-6))
+            # tensors in host memory are kept as is
+            if self.device == 'cpu':
+                self.assertEqual(offloader.offloaded_bytes, 0)
+            else:
+                self.assertEqual(offloader.offloaded_bytes,
+                                 4 * 16 * 32 * len(blocks))
+
+    def test_min_bytes(self):
+        grads, offloader = self._grads(_build_blocks(), min_bytes=1 << 20)
+        self.assertEqual(offloader.offloaded_bytes, 0)
+
+    def test_invalid_window(self):
+        def _offload():
+            with offload_activations(prefetch_window=-1):
+                pass
+
+        self.assertRaises(ValueError, _offload)
+
+
+if __name__ == '__main__':
+    unittest.main()
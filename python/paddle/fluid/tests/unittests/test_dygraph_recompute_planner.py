@@ -0,0 +1,125 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+from paddle.distributed.fleet.utils import plan_recompute
+
+
+def _build_net(num_blocks=6, hidden_size=32, dropout_block=None):
+    paddle.seed(2021)
+    blocks = []
+    for i in range(num_blocks):
+        layers = [paddle.nn.Linear(hidden_size, hidden_size), paddle.nn.ReLU()]
+        if i == dropout_block:
+            layers.append(paddle.nn.Dropout(0.5))
+        blocks.append(paddle.nn.Sequential(*layers))
+    return paddle.nn.Sequential(*blocks)
+
+
+class TestRecomputePlanner(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        self.x = paddle.to_tensor(np.random.randn(16, 32).astype('float32'))
+        self.x.stop_gradient = False
+
+    def _grads(self, net):
+        paddle.mean(net(self.x)).backward()
+        grads = [p.grad.numpy() for p in net.parameters()]
+        grads.append(self.x.grad.numpy())
+        net.clear_gradients()
+        self.x.clear_gradient()
+        return grads
+
+    def _check(self, budget_ratio, offload=False):
+        net = _build_net()
+        full_plan = plan_recompute(net, self.x, 1 << 40)
+        self.assertEqual(full_plan.segments, [(0, 6, 'keep')])
+
+        budget = int(full_plan.peak_memory * budget_ratio)
+        plan = plan_recompute(net, self.x, budget, offload=offload)
+        report = plan.report()
+        self.assertLessEqual(report['peak_memory'], budget)
+        self.assertGreater(report['step_time'], 0)
+        self.assertTrue(any(strategy != 'keep'
+                            for _, _, strategy in report['segments']))
+
+        for g1, g2 in zip(self._grads(net), self._grads(plan)):
+            self.assertTrue(np.allclose(g1, g2, atol=1e-6))
+        return plan
+
+    def test_recompute(self):
+        self._check(0.6)
+
+    def test_offload(self):
+        plan = self._check(0.3, offload=True)
+        self.assertTrue(any(strategy == 'offload'
+                            for _, _, strategy in plan.segments))
+        self.assertRaises(ValueError, plan_recompute,
+                          _build_net(), self.x, 1)
+
+    def _full_memory(self, net, x):
+        return plan_recompute(net, x, 1 << 40).peak_memory
+
+    def test_no_grad_input(self):
+        net = _build_net()
+        x = paddle.to_tensor(np.random.randn(16, 32).astype('float32'))
+        plan = plan_recompute(
+            net, x, self._full_memory(net, x) // 3, offload=True)
+        # the outputs of PyLayer need no grad if its inputs need no grad
+        self.assertEqual(plan.segments[0][2], 'keep')
+
+    def test_data_input(self):
+        # planned on an input needing grad, run on data needing no grad
+        net = _build_net()
+        plan = plan_recompute(net, self.x, self._full_memory(net, self.x) // 3)
+        self.assertTrue(any(strategy != 'keep'
+                            for _, _, strategy in plan.segments))
+        x = paddle.to_tensor(self.x.numpy())
+        grads = []
+        for model in [net, plan]:
+            paddle.mean(model(x)).backward()
+            grads.append([p.grad.numpy() for p in net.parameters()])
+            net.clear_gradients()
+        for g1, g2 in zip(*grads):
+            self.assertTrue(np.allclose(g1, g2, atol=1e-6))
+
+    def test_dropout(self):
+        # the RNG state could not be preserved on CPU
+        net = _build_net(dropout_block=2)
+        plan = plan_recompute(
+            net, self.x, self._full_memory(net, self.x) // 2, offload=True)
+        self.assertTrue(any(strategy != 'keep'
+                            for _, _, strategy in plan.segments))
+        for start, end, strategy in plan.segments:
+            if start <= 2 < end:
+                self.assertEqual(strategy, 'keep')
+
+    def test_no_side_effects(self):
+        net = paddle.nn.Sequential(
+            paddle.nn.Linear(32, 32), paddle.nn.BatchNorm1D(32),
+            paddle.nn.Dropout(0.5), paddle.nn.Linear(32, 32))
+        mean = net[1]._mean.numpy()
+        plan_recompute(net, self.x, 1 << 40)
+        self.assertTrue(np.array_equal(mean, net[1]._mean.numpy()))
+        self.assertTrue(all(layer.training for layer in net.sublayers()))
+
+
+if __name__ == '__main__':
+    unittest.main()
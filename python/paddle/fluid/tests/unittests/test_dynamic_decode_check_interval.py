@@ -0,0 +1,88 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+
+
+def _build_decoder(vocab_size=8, hidden_size=16, beam_size=4):
+    paddle.seed(2021)
+    embedder = paddle.nn.Embedding(vocab_size, hidden_size)
+    output_layer = paddle.nn.Linear(hidden_size, vocab_size)
+    cell = paddle.nn.GRUCell(hidden_size, hidden_size)
+    decoder = paddle.nn.BeamSearchDecoder(
+        cell,
+        start_token=0,
+        end_token=1,
+        beam_size=beam_size,
+        embedding_fn=embedder,
+        output_fn=output_layer)
+    return cell, decoder
+
+
+class TestDynamicDecodeCheckInterval(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        np.random.seed(2021)
+        self.cell, self.decoder = _build_decoder()
+
+    def _decode(self, encoder_output, max_step_num=20, **kwargs):
+        with paddle.no_grad():
+            return paddle.nn.dynamic_decode(
+                self.decoder,
+                inits=self.cell.get_initial_states(encoder_output),
+                max_step_num=max_step_num,
+                return_length=True,
+                **kwargs)
+
+    def _check(self, max_step_num=20, **kwargs):
+        encoder_output = paddle.to_tensor(
+            np.random.randn(8, 16).astype('float32'))
+        outputs, states, lengths = self._decode(encoder_output, max_step_num)
+        outputs2, states2, lengths2 = self._decode(encoder_output,
+                                                   max_step_num, **kwargs)
+        self.assertTrue(np.array_equal(outputs.numpy(), outputs2.numpy()))
+        self.assertTrue(np.array_equal(lengths.numpy(), lengths2.numpy()))
+        self.assertTrue(
+            np.array_equal(states.finished.numpy(),
+                           states2.finished.numpy()))
+        self.assertTrue(
+            np.allclose(states.log_probs.numpy(), states2.log_probs.numpy()))
+        return outputs2, states2
+
+    def test_check_interval(self):
+        for interval in [2, 3, 4, 7]:
+            self._check(finished_check_interval=interval)
+            self._check(max_step_num=5, finished_check_interval=interval)
+
+    def test_compact_finished(self):
+        self._check(compact_finished=True)
+        self._check(finished_check_interval=3, compact_finished=True)
+
+    def test_invalid_interval(self):
+        encoder_output = paddle.ones([2, 16])
+        self.assertRaises(
+            ValueError,
+            self._decode,
+            encoder_output,
+            finished_check_interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
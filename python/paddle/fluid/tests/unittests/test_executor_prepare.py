@@ -0,0 +1,75 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+import paddle.fluid as fluid
+
+paddle.enable_static()
+
+
+class TestExecutorPrepare(unittest.TestCase):
+    def setUp(self):
+        self.main_program = fluid.Program()
+        startup_program = fluid.Program()
+        with fluid.program_guard(self.main_program, startup_program):
+            a = fluid.data(name='a', shape=[None, 8], dtype='float32')
+            b = fluid.data(name='b', shape=[None, 8], dtype='float32')
+            self.out = fluid.layers.fc(input=a + b, size=4)
+        self.exe = fluid.Executor(fluid.CPUPlace())
+        self.exe.run(startup_program)
+
+        self.a = np.random.random([2, 8]).astype('float32')
+        self.b = np.random.random([2, 8]).astype('float32')
+
+    def _run(self):
+        return self.exe.run(self.main_program,
+                            feed={'a': self.a,
+                                  'b': self.b},
+                            fetch_list=[self.out],
+                            use_program_cache=True)
+
+    def test_run(self):
+        expected, = self._run()
+        prepared = self.exe.prepare(
+            self.main_program, ['a', 'b'], fetch_list=[self.out])
+        for _ in range(3):
+            res, = prepared.run({'a': self.a, 'b': self.b})
+            self.assertTrue(np.allclose(res, expected))
+            res, = prepared.run([self.a, self.b])
+            self.assertTrue(np.allclose(res, expected))
+
+        # a batch of another size is written into the same tensors
+        res, = prepared.run([self.a[:1], self.b[:1]])
+        self.assertTrue(np.allclose(res, expected[:1]))
+        prepared.close()
+
+    def test_check_feed(self):
+        prepared = self.exe.prepare(
+            self.main_program, ['a', 'b'], fetch_list=[self.out])
+        with self.assertRaises(ValueError):
+            prepared.run([self.a.astype('float64'), self.b])
+        with self.assertRaises(ValueError):
+            prepared.run([np.ones([2, 3], dtype='float32'), self.b])
+        with self.assertRaises(ValueError):
+            prepared.run({'a': self.a})
+        prepared.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import gc
+import os
+import unittest
+import weakref
+
+import numpy as np
+import paddle
+import paddle.fluid as fluid
+from paddle.fluid.executor import _LRUCache, _get_program_cache_key
+
+paddle.enable_static()
+
+
+def _build_program():
+    main_program = fluid.Program()
+    with fluid.program_guard(main_program, fluid.Program()):
+        a = fluid.data(name='a', shape=[None, 4], dtype='float32')
+        out = fluid.layers.scale(a, scale=2.0)
+    return main_program, out
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evict_least_recently_used(self):
+        evicted = []
+        cache = _LRUCache(2, lambda key, value: evicted.append(key))
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(cache.get('a'), 1)
+        cache['c'] = 3
+        self.assertEqual(evicted, ['b'])
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_feed_fetch_names_not_collide(self):
+        self.assertNotEqual(
+            _get_program_cache_key({'a': None}, ['b']),
+            _get_program_cache_key({
+                'a': None,
+                'b': None
+            }, []))
+
+
+class TestExecutorProgramCache(unittest.TestCase):
+    def setUp(self):
+        os.environ['FLAGS_EXECUTOR_CACHE_CAPACITY'] = '2'
+        self.exe = fluid.Executor(fluid.CPUPlace())
+        self.feed = {'a': np.ones([2, 4], dtype='float32')}
+
+    def tearDown(self):
+        del os.environ['FLAGS_EXECUTOR_CACHE_CAPACITY']
+
+    def _run(self, program, out):
+        res, = self.exe.run(program,
+                            feed=self.feed,
+                            fetch_list=[out],
+                            use_program_cache=True)
+        self.assertTrue(np.allclose(res, self.feed['a'] * 2))
+
+    def test_bounded(self):
+        scope = fluid.global_scope()
+        num_kids = len(scope._kids())
+        programs = [_build_program() for _ in range(4)]
+        for program, out in programs:
+            self._run(program, out)
+        stats = self.exe._cache_stats()
+        self.assertEqual(stats['program_caches']['size'], 2)
+        self.assertEqual(stats['program_caches']['evictions'], 2)
+        self.assertEqual(len(self.exe.ctx_caches), 2)
+        self.assertEqual(len(self.exe.scope_caches), 2)
+        self.assertEqual(len(scope._kids()), num_kids + 2)
+
+        # the evicted program is cached again
+        self._run(*programs[0])
+        self._run(*programs[0])
+        self.assertEqual(self.exe._cache_stats()['program_caches']['hits'], 1)
+
+    def test_evict_collected_program(self):
+        program, out = _build_program()
+        self._run(program, out)
+        self.assertEqual(len(self.exe.program_caches), 1)
+        del program, out
+        gc.collect()
+        self.assertEqual(len(self.exe.program_caches), 0)
+        self.assertEqual(len(self.exe.scope_caches), 0)
+
+    def test_no_reference_cycle(self):
+        program, out = _build_program()
+        self._run(program, out)
+        exe_ref = weakref.ref(self.exe)
+        gc.disable()
+        try:
+            # freed by reference counting, without the cycle collector
+            del self.exe
+            self.assertIsNone(exe_ref())
+        finally:
+            gc.enable()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import unittest
+
+from paddle.distributed.fleet.utils.fs import LocalFS, HDFSSessionClient, FSFileExistsError, FSFileNotExistsError
+from paddle.fluid.incubate.checkpoint.checkpoint_saver import CheckpointSaver
+
+
+class CountedHDFSSessionClient(HDFSSessionClient):
+    def __init__(self, *args, **kwargs):
+        super(CountedHDFSSessionClient, self).__init__(*args, **kwargs)
+        self.num_cmds = 0
+        self.num_sent = 0
+
+    def _run_cmds(self, cmds, redirect_stderr=False, retry_times=5):
+        self.num_cmds += len(cmds)
+        return super(CountedHDFSSessionClient, self)._run_cmds(
+            cmds, redirect_stderr, retry_times)
+
+    def _send_cmds(self, cmds, redirect_stderr):
+        self.num_sent += len(cmds)
+        return super(CountedHDFSSessionClient, self)._send_cmds(
+            cmds, redirect_stderr)
+
+
+class HDFSSessionClientTest(unittest.TestCase):
+    def setUp(self):
+        helper = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "fake_hdfs_helper.py")
+        self.fs = CountedHDFSSessionClient(
+            "/usr/local/hadoop-2.7.7",
+            None,
+            time_out=6 * 1000,
+            sleep_inter=100,
+            helper_cmd=[sys.executable, helper],
+            meta_ttl=60)
+        self.dir_path = os.path.abspath("./test_hdfs_session_dir")
+        LocalFS().delete(self.dir_path)
+
+    def tearDown(self):
+        self.fs.close()
+        LocalFS().delete(self.dir_path)
+
+    def test_dirs_and_files(self):
+        fs = self.fs
+        self.assertFalse(fs.is_exist(self.dir_path))
+
+        fs.mkdirs(self.dir_path + "/a/b")
+        self.assertTrue(fs.is_dir(self.dir_path + "/a"))
+        self.assertTrue(fs.is_dir(self.dir_path + "/a/b"))
+
+        file_path = self.dir_path + "/a/f"
+        fs.touch(file_path)
+        self.assertTrue(fs.is_file(file_path))
+        self.assertEqual(fs.ls_dir(self.dir_path + "/a"), (["b"], ["f"]))
+
+        fs.mv(file_path, self.dir_path + "/g")
+        self.assertFalse(fs.is_exist(file_path))
+        self.assertTrue(fs.is_file(self.dir_path + "/g"))
+        try:
+            fs.mv(file_path, self.dir_path + "/h")
+            self.assertFalse(True)
+        except FSFileNotExistsError:
+            pass
+        try:
+            fs.touch(self.dir_path + "/g", exist_ok=False)
+            self.assertFalse(True)
+        except FSFileExistsError:
+            pass
+
+        fs.delete(self.dir_path + "/a")
+        self.assertFalse(fs.is_exist(self.dir_path + "/a/b"))
+        self.assertEqual(fs.list_dirs(self.dir_path), [])
+
+    def test_retry(self):
+        # failed commands are retried over the helper as HDFSClient does
+        fs = self.fs
+        self.assertFalse(fs.is_exist(self.dir_path))
+        self.assertEqual(fs.num_cmds, 1)
+        self.assertEqual(fs.num_sent, 6)
+
+        fs.num_sent = 0
+        paths = [self.dir_path, os.path.dirname(self.dir_path)]
+        self.assertEqual(fs.batch_is_exist(paths), [False, True])
+        # only the failed command is retried
+        self.assertEqual(fs.num_sent, 2 + 5)
+
+    def test_metadata_cache(self):
+        fs = self.fs
+        for i in range(5):
+            fs.mkdirs("{}/__paddle_checkpoint__.{}".format(self.dir_path, i))
+
+        saver = CheckpointSaver(fs)
+        fs.num_cmds = 0
+        self.assertEqual(saver._get_last_checkpoint_no(self.dir_path), 4)
+        self.assertEqual(fs.num_cmds, 1)
+
+        # answered from the listing of the parent
+        fs.num_cmds = 0
+        for i in range(5):
+            path = "{}/__paddle_checkpoint__.{}".format(self.dir_path, i)
+            self.assertTrue(fs.is_exist(path))
+            self.assertTrue(fs.is_dir(path))
+        self.assertFalse(fs.is_exist(self.dir_path + "/not_exist"))
+        self.assertEqual(fs.num_cmds, 0)
+
+        # pipelined in one batch
+        paths = ["{}/__paddle_checkpoint__.{}/x".format(self.dir_path, i)
+                 for i in range(5)]
+        self.assertEqual(fs.batch_is_exist(paths), [False] * 5)
+        self.assertEqual(fs.num_cmds, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
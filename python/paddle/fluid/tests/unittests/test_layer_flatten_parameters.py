@@ -0,0 +1,125 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+
+
+def _build_net(num_layers=3, hidden_size=8):
+    paddle.seed(2021)
+    layers = []
+    for _ in range(num_layers):
+        layers.append(paddle.nn.Linear(hidden_size, hidden_size))
+        layers.append(paddle.nn.Tanh())
+    return paddle.nn.Sequential(*layers)
+
+
+def _flat_numpy(tensors):
+    return np.concatenate([t.numpy().flatten() for t in tensors])
+
+
+class TestLayerFlattenParameters(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        self.x = paddle.to_tensor(
+            np.random.random([4, 8]).astype('float32'))
+
+    def test_views(self):
+        net = _build_net()
+        values = [p.numpy() for p in net.parameters()]
+        net.flatten_parameters()
+
+        storage = net.parameters()[0]._flat_storage
+        self.assertTrue(
+            all(p1 is p2 for p1, p2 in zip(storage.params, net.parameters())))
+        for p, value in zip(net.parameters(), values):
+            self.assertTrue(np.array_equal(p.numpy(), value))
+        self.assertTrue(
+            np.array_equal(storage.flat_param.numpy(), _flat_numpy(values)))
+
+        # writing the flat parameter writes the parameters
+        storage.flat_param.set_value(
+            np.ones([storage.numel], dtype='float32'))
+        for p in net.parameters():
+            self.assertTrue(np.array_equal(p.numpy(), np.ones(p.shape)))
+
+    def test_grads(self):
+        net = _build_net()
+        flat_net = _build_net()
+        flat_net.flatten_parameters()
+        storage = flat_net.parameters()[0]._flat_storage
+
+        for _ in range(2):
+            for model in [net, flat_net]:
+                paddle.mean(model(self.x)).backward()
+            for p1, p2 in zip(net.parameters(), flat_net.parameters()):
+                self.assertTrue(
+                    np.allclose(p1.grad.numpy(), p2.grad.numpy()))
+            self.assertTrue(
+                np.array_equal(storage.flat_grad.numpy(),
+                               _flat_numpy(
+                                   [p._grad_ivar()
+                                    for p in flat_net.parameters()])))
+            net.clear_gradients()
+            flat_net.clear_gradients()
+            self.assertFalse(storage.flat_grad.numpy().any())
+
+    def test_clip_and_step(self):
+        nets = [_build_net(), _build_net()]
+        nets[1].flatten_parameters()
+        for net in nets:
+            clip = paddle.nn.ClipGradByGlobalNorm(clip_norm=1e-3)
+            opt = paddle.optimizer.Adam(
+                learning_rate=0.1,
+                parameters=net.parameters(),
+                grad_clip=clip)
+            for _ in range(3):
+                paddle.mean(net(self.x)).backward()
+                opt.step()
+                opt.clear_grad()
+        for p1, p2 in zip(nets[0].parameters(), nets[1].parameters()):
+            self.assertTrue(np.allclose(p1.numpy(), p2.numpy(), atol=1e-6))
+
+    def test_clear_gradient(self):
+        # Tensor.clear_gradient, as called by the optimizers of fluid, makes
+        # the next backward replace the views of the flat gradient
+        nets = [_build_net(), _build_net()]
+        nets[1].flatten_parameters()
+        storage = nets[1].parameters()[0]._flat_storage
+        for net in nets:
+            clip = paddle.nn.ClipGradByGlobalNorm(clip_norm=1e-3)
+            opt = paddle.optimizer.SGD(
+                learning_rate=0.1,
+                parameters=net.parameters(),
+                grad_clip=clip)
+            for _ in range(3):
+                paddle.mean(net(self.x)).backward()
+                opt.step()
+                for p in net.parameters():
+                    p.clear_gradient()
+        paddle.mean(nets[1](self.x)).backward()
+        self.assertFalse(
+            storage.holds_grads(
+                [p._grad_ivar() for p in nets[1].parameters()]))
+        for p1, p2 in zip(nets[0].parameters(), nets[1].parameters()):
+            self.assertTrue(np.allclose(p1.numpy(), p2.numpy(), atol=1e-6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import copy
+import unittest
+
+import numpy as np
+import paddle
+
+
+def _build_net(num_layers=4, hidden_size=4):
+    layers = []
+    for _ in range(num_layers):
+        layers.append(paddle.nn.Linear(hidden_size, hidden_size))
+        layers.append(paddle.nn.Tanh())
+    return paddle.nn.Sequential(*layers)
+
+
+def _same(tensors1, tensors2):
+    return len(tensors1) == len(tensors2) and all(
+        t1 is t2 for t1, t2 in zip(tensors1, tensors2))
+
+
+class TestLayerTraversalCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_parameters(self):
+        net = _build_net()
+        params = net.parameters()
+        self.assertEqual(len(params), 8)
+        self.assertTrue(_same(params, net.parameters()))
+
+        # the returned list is a copy
+        params.pop()
+        self.assertEqual(len(net.parameters()), 8)
+
+        # modifying a sublayer invalidates the cache of its parents
+        linear = net[0]
+        linear.extra = paddle.nn.Linear(4, 2)
+        self.assertEqual(len(net.parameters()), 10)
+        linear.bias = None
+        self.assertEqual(len(net.parameters()), 9)
+        del linear.extra
+        self.assertEqual(len(net.parameters()), 7)
+        weight = linear.create_parameter([2, 2])
+        linear.add_parameter('new_weight', weight)
+        self.assertTrue(net.parameters()[1] is weight)
+
+        names = [name for name, _ in net.named_parameters(prefix='net')]
+        self.assertEqual(names[:2], ['net.0.weight', 'net.0.new_weight'])
+
+    def test_sublayers(self):
+        net = paddle.nn.LayerList([paddle.nn.Linear(2, 2) for _ in range(3)])
+        self.assertEqual(len(net.sublayers()), 3)
+        del net[0]
+        self.assertEqual(len(net.sublayers()), 2)
+        self.assertEqual(len(net.parameters()), 4)
+        net.append(paddle.nn.Linear(2, 2))
+        self.assertEqual(
+            [name for name, _ in net.named_sublayers()], ['0', '1', '2'])
+
+    def test_buffers_and_state_dict(self):
+        net = _build_net()
+        num_buffers = len(net.buffers())
+        state_dict = net.state_dict()
+
+        buffer = paddle.to_tensor(np.zeros([1], dtype='float32'))
+        net[0].register_buffer('persistable_buf', buffer)
+        self.assertEqual(len(net.buffers()), num_buffers + 1)
+        self.assertTrue(net.buffers()[0] is buffer)
+        self.assertTrue(net.state_dict()['0.persistable_buf'] is buffer)
+        self.assertEqual(len(net.state_dict()), len(state_dict) + 1)
+
+        net[0].register_buffer('persistable_buf', buffer, persistable=False)
+        self.assertFalse('0.persistable_buf' in net.state_dict())
+        self.assertTrue('0.persistable_buf' in net.to_static_state_dict())
+
+    def test_state_dict_hook(self):
+        net = _build_net()
+        state_dict = net.state_dict()
+
+        def hook(destination):
+            destination['extra'] = None
+            return destination
+
+        helper = net[1].register_state_dict_hook(hook)
+        self.assertTrue('extra' in net.state_dict())
+        self.assertTrue('extra' in net.state_dict())
+        helper.remove()
+        self.assertEqual(
+            list(net.state_dict().keys()), list(state_dict.keys()))
+
+    def test_deepcopy(self):
+        net = _build_net()
+        net.parameters()
+        copied_net = copy.deepcopy(net)
+        for p1, p2 in zip(net.parameters(), copied_net.parameters()):
+            self.assertFalse(p1 is p2)
+            self.assertTrue(np.array_equal(p1.numpy(), p2.numpy()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import paddle
+import paddle.fluid as fluid
+from paddle.static import InputSpec
+
+
+def _build_program(size):
+    main_program = fluid.Program()
+    startup_program = fluid.Program()
+    with fluid.unique_name.guard():
+        with fluid.program_guard(main_program, startup_program):
+            x = paddle.static.data('x', [None, 4], 'float32')
+            paddle.static.nn.fc(x, size)
+    return main_program, startup_program
+
+
+def _scope_values(program):
+    scope = fluid.global_scope()
+    return {
+        p.name: np.array(scope.find_var(p.name).get_tensor())
+        for p in program.all_parameters()
+    }
+
+
+class TestStaticLoadMetaCheck(unittest.TestCase):
+    def setUp(self):
+        paddle.enable_static()
+        self.exe = fluid.Executor(fluid.CPUPlace())
+        self.main_program, startup_program = _build_program(3)
+        self.exe.run(startup_program)
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+        paddle.disable_static()
+
+    def test_set_program_state(self):
+        state = {
+            name: np.random.random(value.shape).astype(value.dtype)
+            for name, value in _scope_values(self.main_program).items()
+        }
+        fluid.io.set_program_state(self.main_program, state)
+        for name, value in _scope_values(self.main_program).items():
+            self.assertTrue(np.array_equal(value, state[name]))
+
+        name = self.main_program.all_parameters()[0].name
+        bad_shape = dict(state)
+        bad_shape[name] = np.zeros([2, 2], dtype='float32')
+        self.assertRaises(AssertionError, fluid.io.set_program_state,
+                          self.main_program, bad_shape)
+        bad_dtype = dict(state)
+        bad_dtype[name] = state[name].astype('float64')
+        self.assertRaises(AssertionError, fluid.io.set_program_state,
+                          self.main_program, bad_dtype)
+
+    def test_load_params(self):
+        values = _scope_values(self.main_program)
+        fluid.io.save_params(self.exe, self.dirname, self.main_program)
+        for name in values:
+            fluid.global_scope().find_var(name).get_tensor().set(
+                np.zeros_like(values[name]), fluid.CPUPlace())
+        fluid.io.load_params(self.exe, self.dirname, self.main_program)
+        for name, value in _scope_values(self.main_program).items():
+            self.assertTrue(np.array_equal(value, values[name]))
+
+        # the same names with another shape
+        other_program, other_startup = _build_program(5)
+        self.exe.run(other_startup)
+        self.assertRaises(RuntimeError, fluid.io.load_params, self.exe,
+                          self.dirname, other_program)
+
+
+class TestModelLoadMetaCheck(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.path = os.path.join(tempfile.mkdtemp(), 'model')
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.path))
+
+    def _model(self, size):
+        return paddle.Model(
+            paddle.nn.Linear(4, size), inputs=[InputSpec([None, 4])])
+
+    def test_load(self):
+        model = self._model(3)
+        model.save(self.path)
+        values = [p.numpy() for p in model.network.parameters()]
+
+        loaded = self._model(3)
+        loaded.load(self.path)
+        for p, value in zip(loaded.network.parameters(), values):
+            self.assertTrue(np.array_equal(p.numpy(), value))
+
+        self.assertRaises(ValueError, self._model(5).load, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
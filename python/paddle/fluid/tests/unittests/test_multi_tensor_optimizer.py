@@ -0,0 +1,169 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+
+
+def _build_net(num_layers=4, hidden_size=8):
+    paddle.seed(2021)
+    layers = []
+    for _ in range(num_layers):
+        layers.append(paddle.nn.Linear(hidden_size, hidden_size))
+        layers.append(paddle.nn.Tanh())
+    return paddle.nn.Sequential(*layers)
+
+
+def _train(net, opt, x, num_steps=5):
+    for _ in range(num_steps):
+        loss = paddle.mean(net(x))
+        loss.backward()
+        opt.step()
+        opt.clear_grad()
+
+
+class TestMultiTensorOptimizer(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        self.x = paddle.to_tensor(
+            np.random.random([4, 8]).astype('float32'))
+
+    def _check(self, opt_class, num_groups=1, **kwargs):
+        net = _build_net()
+        opt = opt_class(parameters=net.parameters(), **kwargs)
+        _train(net, opt, self.x)
+
+        multi_tensor_net = _build_net()
+        multi_tensor_opt = opt_class(
+            parameters=multi_tensor_net.parameters(),
+            use_multi_tensor=True,
+            **kwargs)
+        _train(multi_tensor_net, multi_tensor_opt, self.x)
+
+        self.assertEqual(
+            len(multi_tensor_opt._multi_tensor_groups), num_groups)
+        for p1, p2 in zip(net.parameters(), multi_tensor_net.parameters()):
+            self.assertTrue(np.allclose(p1.numpy(), p2.numpy(), atol=1e-6))
+
+        # the flat accumulators are not saved
+        state_dict = opt.state_dict()
+        multi_tensor_state_dict = multi_tensor_opt.state_dict()
+        self.assertEqual(
+            len(state_dict.keys()), len(multi_tensor_state_dict.keys()))
+        for name, accumulators in opt._accumulators.items():
+            multi_tensor_accumulators = multi_tensor_opt._accumulators[name]
+            for p1, p2 in zip(net.parameters(),
+                              multi_tensor_net.parameters()):
+                self.assertTrue(
+                    np.allclose(
+                        accumulators[p1.name].numpy(),
+                        multi_tensor_accumulators[p2.name].numpy(),
+                        atol=1e-6))
+
+        # the groups are coalesced again after loading a state dict
+        multi_tensor_opt.set_state_dict(multi_tensor_state_dict)
+        self.assertEqual(len(multi_tensor_opt._multi_tensor_groups), 0)
+        _train(net, opt, self.x, num_steps=1)
+        _train(multi_tensor_net, multi_tensor_opt, self.x, num_steps=1)
+        for p1, p2 in zip(net.parameters(), multi_tensor_net.parameters()):
+            self.assertTrue(np.allclose(p1.numpy(), p2.numpy(), atol=1e-6))
+
+    def test_sgd(self):
+        self._check(paddle.optimizer.SGD, learning_rate=0.1)
+
+    def test_momentum(self):
+        self._check(
+            paddle.optimizer.Momentum, learning_rate=0.1, weight_decay=0.01)
+
+    def test_adam(self):
+        self._check(paddle.optimizer.Adam, learning_rate=0.1)
+
+    def test_adamw(self):
+        self._check(
+            paddle.optimizer.AdamW,
+            num_groups=2,
+            learning_rate=0.1,
+            apply_decay_param_fun=lambda name: 'bias' not in name)
+
+    def test_param_groups(self):
+        net = _build_net()
+        params = net.parameters()
+        opt = paddle.optimizer.Adam(
+            learning_rate=0.1,
+            parameters=[{
+                'params': params[:4]
+            }, {
+                'params': params[4:],
+                'learning_rate': 0.1
+            }],
+            use_multi_tensor=True)
+        _train(net, opt, self.x)
+        self.assertEqual(len(opt._multi_tensor_groups), 2)
+
+    def test_frozen_parameters(self):
+        nets, opts = [], []
+        for use_multi_tensor in [False, True]:
+            nets.append(_build_net())
+            opts.append(
+                paddle.optimizer.Adam(
+                    learning_rate=0.1,
+                    parameters=nets[-1].parameters(),
+                    use_multi_tensor=use_multi_tensor))
+        num_params = len(nets[0].parameters())
+        # some parameters frozen, all but one frozen, and none frozen
+        for frozen in [[], [2], [i for i in range(num_params) if i != 1], []]:
+            for net, opt in zip(nets, opts):
+                for i, param in enumerate(net.parameters()):
+                    param.stop_gradient = i in frozen
+                _train(net, opt, self.x, num_steps=2)
+            for p1, p2 in zip(nets[0].parameters(), nets[1].parameters()):
+                self.assertTrue(
+                    np.allclose(p1.numpy(), p2.numpy(), atol=1e-6))
+
+    def _check_flattened(self, grad_clip=None):
+        net = _build_net()
+        opt = paddle.optimizer.Adam(
+            learning_rate=0.1,
+            parameters=net.parameters(),
+            grad_clip=grad_clip)
+        _train(net, opt, self.x)
+
+        flat_net = _build_net()
+        flat_net.flatten_parameters()
+        flat_opt = paddle.optimizer.Adam(
+            learning_rate=0.1,
+            parameters=flat_net.parameters(),
+            grad_clip=grad_clip,
+            use_multi_tensor=True)
+        _train(flat_net, flat_opt, self.x)
+        for p1, p2 in zip(net.parameters(), flat_net.parameters()):
+            self.assertTrue(np.allclose(p1.numpy(), p2.numpy(), atol=1e-6))
+        group, = flat_opt._multi_tensor_groups.values()
+        return group.flat_grad.value().get_tensor()._is_initialized()
+
+    def test_flattened_parameters(self):
+        # the flat gradient of the storage is updated directly
+        self.assertFalse(self._check_flattened())
+        # the clipped gradients are new tensors, which are copied
+        self.assertTrue(
+            self._check_flattened(paddle.nn.ClipGradByGlobalNorm(1e-3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import paddle
+import paddle.fluid as fluid
+from paddle.fluid.framework import Program, program_guard
+
+paddle.enable_static()
+
+
+def _build_program(num_layers):
+    program = Program()
+    with program_guard(program, Program()):
+        x = fluid.data(name='x', shape=[None, 8], dtype='float32')
+        hidden = x
+        for _ in range(num_layers):
+            hidden = fluid.layers.fc(hidden, size=8)
+            hidden = fluid.layers.dropout(hidden, dropout_prob=0.1)
+        loss = fluid.layers.mean(hidden)
+        fluid.optimizer.SGD(learning_rate=0.01).minimize(loss)
+    return program, loss
+
+
+class TestProgramCloneLazy(unittest.TestCase):
+    def test_clone_defers_ops(self):
+        program, loss = _build_program(4)
+        cloned = program.clone()
+        block = cloned.global_block()
+        self.assertIsNotNone(block._deferred_op_descs)
+
+        # the op of a var is set once the ops are created
+        self.assertEqual(block.var(loss.name).op.type, 'mean')
+        self.assertIsNone(block._deferred_op_descs)
+        self.assertEqual([op.type for op in block.ops],
+                         [op.type for op in program.global_block().ops])
+
+    def test_clone_for_test(self):
+        program, loss = _build_program(4)
+        test_program = program.clone(for_test=True)
+        ops = test_program.global_block().ops
+        self.assertEqual(ops[-1].type, 'mean')
+        for op in ops:
+            if op.has_attr('is_test'):
+                self.assertTrue(op.attr('is_test'))
+
+    def test_append_after_clone(self):
+        program, loss = _build_program(2)
+        cloned = program.clone()
+        block = cloned.global_block()
+        num_ops = block.desc.op_size()
+        block.append_op(
+            type='scale',
+            inputs={'X': block.var(loss.name)},
+            outputs={'Out': block.var(loss.name)})
+        self.assertEqual(len(block.ops), num_ops + 1)
+        self.assertEqual(block.ops[-1].type, 'scale')
+
+    def _check_remove_op(self, program):
+        block = program.global_block()
+        op_types = [block.desc.op(i).type()
+                    for i in range(block.desc.op_size())]
+        self.assertIsNotNone(block._deferred_op_descs)
+        block._remove_op(1)
+        del op_types[1]
+        self.assertEqual([op.type for op in block.ops], op_types)
+        for i, op in enumerate(block.ops):
+            self.assertTrue(op.desc == block.desc.op(i))
+        block._sync_with_cpp()
+        self.assertEqual([op.type for op in block.ops], op_types)
+
+    def test_remove_op_after_clone(self):
+        program, loss = _build_program(2)
+        self._check_remove_op(program.clone())
+
+    def test_remove_op_after_prune(self):
+        program, loss = _build_program(2)
+        self._check_remove_op(program._prune_with_input(['x'], [loss]))
+
+    def test_prune(self):
+        program, loss = _build_program(4)
+        pruned = program._prune_with_input(['x'], [loss])
+        op_types = [op.type for op in pruned.global_block().ops]
+        self.assertEqual(op_types[-1], 'mean')
+        self.assertNotIn('sgd', op_types)
+        self.assertNotIn('mean_grad', op_types)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+import paddle
+from paddle.nn import MultiHeadAttention
+
+
+class TransformerCell(paddle.nn.Layer):
+    def __init__(self, decoder, embedder, output_layer):
+        super(TransformerCell, self).__init__()
+        self.decoder = decoder
+        self.embedder = embedder
+        self.output_layer = output_layer
+
+    def forward(self, inputs, states, memory, static_caches):
+        outputs, new_states = self.decoder(
+            paddle.unsqueeze(inputs, [1]),
+            memory,
+            cache=[(state, static_cache)
+                   for state, static_cache in zip(states, static_caches)])
+        return (self.output_layer(paddle.squeeze(outputs, [1])),
+                [state for state, _ in new_states])
+
+
+class TestTransformerKVCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        paddle.seed(2021)
+        np.random.seed(2021)
+        self.batch_size, self.d_model, self.nhead = 4, 16, 2
+
+    def _rand(self, *shape):
+        return paddle.to_tensor(np.random.randn(*shape).astype('float32'))
+
+    def test_attention(self):
+        attn = MultiHeadAttention(self.d_model, self.nhead)
+        query = self._rand(self.batch_size, 1, self.d_model)
+        cache = attn.gen_cache(query, type=attn.Cache)
+        kv_cache = attn.gen_cache(query, type=attn.KVCache, max_length=2)
+        for step in range(5):
+            query = self._rand(self.batch_size, 1, self.d_model)
+            out, cache = attn(query, cache=cache)
+            kv_out, kv_cache2 = attn(query, cache=kv_cache)
+            self.assertTrue(kv_cache2 is kv_cache)
+            self.assertTrue(np.allclose(out.numpy(), kv_out.numpy(), atol=1e-6))
+
+            # reordering the entries, as beam search does
+            index = paddle.to_tensor(
+                np.random.randint(0, self.batch_size, [self.batch_size]))
+            cache = attn.Cache(
+                paddle.gather(cache.k, index), paddle.gather(cache.v, index))
+            k_buffer = kv_cache.k_buffer
+            kv_cache.reorder(index)
+            kv_cache.reorder(paddle.arange(self.batch_size, dtype='int64'))
+            # the reorders are applied to the buffers when they are read
+            self.assertTrue(kv_cache.k_buffer is k_buffer)
+            for x, y in zip(cache, kv_cache.keys_values()):
+                self.assertTrue(np.array_equal(x.numpy(), y.numpy()))
+
+        self.assertEqual(kv_cache.length, 5)
+        self.assertEqual(kv_cache.capacity, 8)
+        self.assertEqual(kv_cache.memory_size(),
+                         2 * 8 * self.batch_size * self.d_model * 4)
+
+        tiled_cache = kv_cache.tile(3)
+        self.assertEqual(tiled_cache.batch_size, self.batch_size * 3)
+        k = kv_cache.keys_values()[0].numpy()
+        tiled_k = tiled_cache.keys_values()[0].numpy()
+        self.assertTrue(np.array_equal(np.repeat(k, 3, axis=0), tiled_k))
+
+    def _beam_search(self, cell, memory, max_length, beam_size=3):
+        tile = paddle.nn.BeamSearchDecoder.tile_beam_merge_with_batch
+        decoder = paddle.nn.BeamSearchDecoder(
+            cell,
+            start_token=0,
+            end_token=1,
+            beam_size=beam_size,
+            embedding_fn=cell.embedder)
+        # a first position shared by both kinds of caches
+        prefix = self._rand(self.batch_size, self.nhead, 1,
+                            self.d_model // self.nhead)
+        caches = cell.decoder.gen_cache(memory, max_length=max_length)
+        initial_states = [
+            layer.self_attn.gen_cache(
+                prefix,
+                prefix,
+                type=type(incremental_cache),
+                max_length=max_length)
+            for layer, (incremental_cache, _) in zip(cell.decoder.layers,
+                                                     caches)
+        ]
+        static_caches = [
+            layer.cross_attn.gen_cache(
+                tile(memory, beam_size),
+                tile(memory, beam_size),
+                type=layer.cross_attn.StaticCache)
+            for layer in cell.decoder.layers
+        ]
+        with paddle.no_grad():
+            outputs, _ = paddle.nn.dynamic_decode(
+                decoder,
+                inits=initial_states,
+                max_step_num=20,
+                memory=tile(memory, beam_size),
+                static_caches=static_caches)
+        return outputs
+
+    def _build_cell(self, vocab_size=10, num_layers=2):
+        decoder = paddle.nn.TransformerDecoder(
+            paddle.nn.TransformerDecoderLayer(
+                self.d_model, self.nhead, 4 * self.d_model, dropout=0.),
+            num_layers)
+        return TransformerCell(decoder,
+                               paddle.nn.Embedding(vocab_size, self.d_model),
+                               paddle.nn.Linear(self.d_model, vocab_size))
+
+    def test_beam_search(self):
+        cell = self._build_cell()
+        cell.eval()
+        memory = self._rand(self.batch_size, 6, self.d_model)
+        outputs = self._beam_search(cell, memory, None)
+        kv_outputs = self._beam_search(cell, memory, 4)
+        self.assertTrue(np.array_equal(outputs.numpy(), kv_outputs.numpy()))
+
+
+if __name__ == '__main__':
+    unittest.main()
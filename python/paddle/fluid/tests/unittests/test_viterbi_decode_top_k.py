@@ -0,0 +1,110 @@
+#   Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import print_function
+
+import itertools
+import unittest
+
+import numpy as np
+import paddle
+from paddle.text.viterbi_decode import _k_best_viterbi_decode
+
+
+def k_best_paths(potentials, transitions, length, use_tag, top_k,
+                 allowed=None):
+    # enumerate all paths of a sequence
+    num_tags = potentials.shape[1]
+    results = []
+    for path in itertools.product(range(num_tags), repeat=length):
+        transits = list(zip(path[:-1], path[1:]))
+        if use_tag:
+            transits += [(-1, path[0]), (-2, path[-1])]
+        if allowed is not None and not all(allowed[i, j] for i, j in transits):
+            continue
+        score = sum(potentials[t, tag] for t, tag in enumerate(path)) + sum(
+            transitions[i, j] for i, j in transits)
+        results.append((score, path))
+    results.sort(key=lambda result: -result[0])
+    return results[:top_k]
+
+
+class TestViterbiDecodeTopK(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        np.random.seed(2021)
+        self.bz, self.len, self.ntags = 6, 4, 4
+
+    def _check(self, use_tag, top_k, allowed=None):
+        potentials = np.random.randn(self.bz, self.len,
+                                     self.ntags).astype('float64')
+        transitions = np.random.randn(self.ntags, self.ntags).astype('float64')
+        lengths = np.random.randint(1, self.len + 1, [self.bz]).astype('int64')
+        scores, paths = paddle.text.viterbi_decode(
+            paddle.to_tensor(potentials),
+            paddle.to_tensor(transitions),
+            paddle.to_tensor(lengths),
+            use_tag,
+            top_k=top_k,
+            allowed_transitions=None
+            if allowed is None else paddle.to_tensor(allowed))
+        scores, paths = scores.numpy(), paths.numpy()
+        if top_k == 1:
+            scores, paths = scores[:, None], paths[:, None]
+        self.assertEqual(paths.shape[-1], lengths.max())
+        for i in range(self.bz):
+            expected = k_best_paths(potentials[i], transitions, lengths[i],
+                                    use_tag, top_k, allowed)
+            for k, (score, path) in enumerate(expected):
+                self.assertAlmostEqual(scores[i, k], score)
+                self.assertEqual(tuple(paths[i, k, :lengths[i]]), path)
+
+    def test_top_k(self):
+        for use_tag in [True, False]:
+            self._check(use_tag, top_k=3)
+            self._check(use_tag, top_k=1)
+
+    def test_allowed_transitions(self):
+        allowed = np.ones([self.ntags, self.ntags], dtype='bool')
+        allowed[0, 1] = allowed[2, 0] = allowed[-1, 2] = False
+        for top_k in [1, 3]:
+            self._check(True, top_k, allowed)
+
+    def test_same_as_op(self):
+        potentials = paddle.randn([self.bz, self.len, self.ntags])
+        transitions = paddle.randn([self.ntags, self.ntags])
+        lengths = paddle.to_tensor(
+            np.random.randint(1, self.len + 1, [self.bz]).astype('int64'))
+        scores, paths = paddle.text.viterbi_decode(potentials, transitions,
+                                                   lengths)
+        k_best_scores, k_best_paths = _k_best_viterbi_decode(
+            potentials, transitions, lengths, True, 1)
+        self.assertTrue(
+            np.allclose(scores.numpy(), k_best_scores.numpy()[:, 0]))
+        self.assertTrue(
+            np.array_equal(paths.numpy(), k_best_paths.numpy()[:, 0]))
+
+    def test_static_mode(self):
+        paddle.enable_static()
+        potentials = paddle.static.data('potentials', [2, 3, 4], 'float32')
+        transitions = paddle.static.data('transitions', [4, 4], 'float32')
+        lengths = paddle.static.data('lengths', [2], 'int64')
+        self.assertRaises(ValueError, paddle.text.viterbi_decode, potentials,
+                          transitions, lengths, True, 2)
+        paddle.disable_static()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,11 +17,13 @@ import warnings
 import paddle.nn as nn
 import numpy as np
 from .static_flops import static_flops, Table
+from .shape_analysis import shape_analysis, print_shape_analysis
 
 __all__ = []
 
 
-def flops(net, input_size, custom_ops=None, print_detail=False):
+def flops(net, input_size, custom_ops=None, print_detail=False,
+          symbolic=False):
     """Print a table about the FLOPs of network.
 
     Args:
@@ -34,6 +36,11 @@ def flops(net, input_size, custom_ops=None, print_detail=False):
                     in following example code. Default is None.
         print_detail (bool, optional): Whether to print the detail information, like FLOPs per layer, about the net FLOPs.
                     Default is False.
+        symbolic (bool, optional): Whether to count by propagating input_size through the shape rules of
+                    `paddle.hapi.shape_analysis`, without creating any tensor or running the forward. It only
+                    works when argument 'net' is an instance of paddle.nn.Layer composed of `nn.Sequential`
+                    and layers with shape rules, and the values of `custom_ops` are taken as shape rules
+                    `rule(layer, input_shape)` returning the output shape and FLOPs. Default is False.
 
     Returns:
         Int: A number about the FLOPs of total network.
@@ -99,7 +106,12 @@ def flops(net, input_size, custom_ops=None, print_detail=False):
             #+--------------+-----------------+-----------------+--------+--------+
             #Total Flops: 347560     Total Params: 61610
     """
-    if isinstance(net, nn.Layer):
+    if isinstance(net, nn.Layer) and symbolic:
+        rows, total = shape_analysis(
+            net, input_size, custom_rules=custom_ops)
+        print_shape_analysis(rows, total, print_detail=print_detail)
+        return total['total_flops']
+    elif isinstance(net, nn.Layer):
         inputs = paddle.randn(input_size)
         return dynamic_flops(
             net,
@@ -348,7 +348,10 @@ class StaticGraphAdapter(object):
         fluid.core._create_loaded_parameter(
             [param for param, state in param_state_pairs],
             global_scope(), executor)
-        for param, state in param_state_pairs:
+        # release each loaded array right after it is copied into the scope,
+        # so that no parameter is held twice while loading
+        while param_state_pairs:
+            param, state = param_state_pairs.pop()
             self._set_var(param, state)
 
         # restore optimizer states
@@ -812,7 +815,10 @@ class DynamicGraphAdapter(object):
 
     def load(self, param_state_pairs, optim_state):
         # restore parameter states
-        for param, state in param_state_pairs:
+        # release each loaded array right after it is set to the parameter,
+        # so that no parameter is held twice while loading
+        while param_state_pairs:
+            param, state = param_state_pairs.pop()
             param.set_value(state)
 
         # resotre optimizer states
@@ -1295,10 +1301,13 @@ class Model(object):
                 return pickle.load(f, encoding='latin1')
 
         def _check_match(key, param):
-            state = param_state.get(key, None)
+            # pop the state so that each loaded array is only referenced by
+            # `matched_param_state` and can be released once it is set
+            state = param_state.pop(key, None)
             if state is None:
                 raise ValueError(
                     "{} is not found in the providing file.".format(key))
+            # only compare shape metas, never convert the parameter to numpy
             if list(state.shape) != list(param.shape):
                 raise ValueError(
                     "{} receives a shape {}, but the expected shape is {}.".
@@ -19,13 +19,14 @@ import numbers
 import paddle
 import paddle.nn as nn
 from paddle.static import InputSpec
+from .shape_analysis import shape_analysis, print_shape_analysis
 
 from collections import OrderedDict
 
 __all__ = []
 
 
-def summary(net, input_size=None, dtypes=None, input=None):
+def summary(net, input_size=None, dtypes=None, input=None, symbolic=False):
     """Prints a string summary of the network.
 
     Args:
@@ -38,6 +39,10 @@ def summary(net, input_size=None, dtypes=None, input=None):
                     input_size and input cannot be None at the same time.
         dtypes (str, optional): if dtypes is None, 'float32' will be used, Default: None.
         input: the input tensor. if input is given, input_size and dtype will be ignored, Default: None.
+        symbolic (bool, optional): if symbolic is True, propagate input_size through the shape rules
+                    of `paddle.hapi.shape_analysis` instead of running the forward, which also reports
+                    FLOPs and activation memory. Only `nn.Sequential` and layers with shape rules are
+                    supported, and input_size and dtypes must be a single shape and dtype. Default: False.
 
     Returns:
         Dict: a summary of the network including total params and total trainable params.
@@ -136,6 +141,25 @@ def summary(net, input_size=None, dtypes=None, input=None):
     if input_size is None and input is None:
         raise ValueError("input_size and input cannot be None at the same time")
 
+    if symbolic:
+        assert input_size is not None, \
+            "input_size must be given when symbolic is True"
+        dtype = dtypes
+        if isinstance(dtypes, (list, tuple)):
+            if len(dtypes) != 1:
+                raise ValueError(
+                    "dtypes must be a single dtype when symbolic is True, "
+                    "but received {}".format(dtypes))
+            dtype = dtypes[0]
+        rows, total = shape_analysis(net, input_size, dtype=dtype or 'float32')
+        print_shape_analysis(rows, total, print_detail=True)
+        trainable_params = sum(
+            int(np.prod(p.shape)) for p in net.parameters() if p.trainable)
+        return {
+            'total_params': total['total_params'],
+            'trainable_params': trainable_params
+        }
+
     if input_size is None and input is not None:
         if paddle.is_tensor(input):
             input_size = tuple(input.shape)
@@ -0,0 +1,299 @@
+# Copyright (c) 2021 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+import paddle.nn as nn
+from paddle.static import InputSpec
+from .static_flops import Table
+
+__all__ = []
+
+# (rule, layer type, layer signature, input shape) -> (output shape, flops)
+_rule_cache = {}
+
+
+def _spatial_dims(shape, data_format):
+    if data_format is not None and data_format[-1] == 'C':
+        return 1, len(shape) - 1
+    return 2, len(shape)
+
+
+def _padding_pairs(padding, dims):
+    """
+    Return the (before, after) padding of every spatial dim, or 'SAME'.
+    """
+    if isinstance(padding, str):
+        if padding.upper() == 'SAME':
+            return 'SAME'
+        return [(0, 0)] * dims
+    if isinstance(padding, int):
+        return [(padding, padding)] * dims
+    padding = list(padding)
+    if len(padding) == dims and isinstance(padding[0], int):
+        return [(p, p) for p in padding]
+    if len(padding) == 2 * dims and isinstance(padding[0], int):
+        return [(padding[2 * i], padding[2 * i + 1]) for i in range(dims)]
+    raise ValueError("Unsupported padding {} in shape analysis.".format(
+        padding))
+
+
+def _to_list(value, dims):
+    if isinstance(value, int):
+        return [value] * dims
+    return list(value)
+
+
+def _conv_rule(layer, shape):
+    start, end = _spatial_dims(shape, layer._data_format)
+    dims = end - start
+    transposed = isinstance(layer, (nn.Conv1DTranspose, nn.Conv2DTranspose,
+                                    nn.Conv3DTranspose))
+    pads = _padding_pairs(layer._padding, dims)
+    output_padding = _to_list(layer.output_padding or 0, dims)
+
+    out = list(shape)
+    for i in range(dims):
+        size = shape[start + i]
+        k = layer._kernel_size[i]
+        s = layer._stride[i]
+        d = layer._dilation[i]
+        if transposed:
+            if pads == 'SAME':
+                out[start + i] = size * s
+            else:
+                out[start + i] = (size - 1) * s - sum(pads[i]) + d * (
+                    k - 1) + 1 + output_padding[i]
+        elif pads == 'SAME':
+            out[start + i] = (size + s - 1) // s
+        else:
+            out[start + i] = (size + sum(pads[i]) - (d * (k - 1) + 1)
+                              ) // s + 1
+    channel_dim = layer._channel_dim
+    out[channel_dim] = layer._out_channels
+
+    kernel_ops = np.product(layer._kernel_size)
+    bias_ops = 1 if layer.bias is not None else 0
+    flops = int(np.product(out)) * (
+        shape[channel_dim] / layer._groups * kernel_ops + bias_ops)
+    return out, abs(int(flops))
+
+
+def _pool_rule(layer, shape):
+    data_format = getattr(layer, 'data_format', None)
+    start, end = _spatial_dims(shape, data_format)
+    dims = end - start
+    ksize = _to_list(getattr(layer, 'ksize', getattr(layer, 'kernel_size', 1)),
+                     dims)
+    stride = ksize if layer.stride is None else _to_list(layer.stride, dims)
+    pads = _padding_pairs(layer.padding, dims)
+
+    out = list(shape)
+    for i in range(dims):
+        size = shape[start + i]
+        if pads == 'SAME':
+            out[start + i] = (size + stride[i] - 1) // stride[i]
+        elif layer.ceil_mode:
+            out[start + i] = (size + sum(pads[i]) - ksize[i] + stride[i] - 1
+                              ) // stride[i] + 1
+        else:
+            out[start + i] = (size + sum(pads[i]) - ksize[i]) // stride[i] + 1
+
+    flops = 0
+    if isinstance(layer, (nn.AvgPool1D, nn.AvgPool2D, nn.AvgPool3D)):
+        flops = int(np.product(out))
+    return out, flops
+
+
+def _adaptive_pool_rule(layer, shape):
+    output_size = getattr(layer, '_output_size', None)
+    if output_size is None:
+        output_size = layer.output_size
+    data_format = getattr(layer, '_data_format', None)
+    start, end = _spatial_dims(shape, data_format)
+    dims = end - start
+    output_size = _to_list(output_size, dims)
+
+    out = list(shape)
+    for i in range(dims):
+        if output_size[i] is not None:
+            out[start + i] = output_size[i]
+
+    flops = 0
+    if isinstance(layer, (nn.AdaptiveAvgPool1D, nn.AdaptiveAvgPool2D,
+                          nn.AdaptiveAvgPool3D)):
+        kernel = np.array(shape[start:end]) // np.array(out[start:end])
+        flops = abs(int((np.product(kernel) + 1) * np.product(out)))
+    return out, flops
+
+
+def _linear_rule(layer, shape):
+    out = list(shape[:-1]) + [layer.weight.shape[1]]
+    return out, abs(int(layer.weight.shape[0] * np.product(out)))
+
+
+def _bn_rule(layer, shape):
+    return list(shape), 2 * int(np.product(shape))
+
+
+def _leaky_relu_rule(layer, shape):
+    return list(shape), int(np.product(shape))
+
+
+def _zero_flops_rule(layer, shape):
+    return list(shape), 0
+
+
+def _flatten_rule(layer, shape):
+    ndim = len(shape)
+    start = layer.start_axis % ndim
+    stop = layer.stop_axis % ndim
+    out = list(shape[:start]) + [int(np.product(shape[start:stop + 1]))
+                                 ] + list(shape[stop + 1:])
+    return out, 0
+
+
+# rules follow the counting of `dynamic_flops.register_hooks`
+shape_rules = {
+    nn.Conv1D: _conv_rule,
+    nn.Conv2D: _conv_rule,
+    nn.Conv3D: _conv_rule,
+    nn.Conv1DTranspose: _conv_rule,
+    nn.Conv2DTranspose: _conv_rule,
+    nn.Conv3DTranspose: _conv_rule,
+    nn.layer.norm.BatchNorm1D: _bn_rule,
+    nn.layer.norm.BatchNorm2D: _bn_rule,
+    nn.layer.norm.BatchNorm3D: _bn_rule,
+    nn.BatchNorm: _bn_rule,
+    nn.ReLU: _zero_flops_rule,
+    nn.ReLU6: _zero_flops_rule,
+    nn.Sigmoid: _zero_flops_rule,
+    nn.Tanh: _zero_flops_rule,
+    nn.Softmax: _zero_flops_rule,
+    nn.LeakyReLU: _leaky_relu_rule,
+    nn.Linear: _linear_rule,
+    nn.Dropout: _zero_flops_rule,
+    nn.Flatten: _flatten_rule,
+    nn.AvgPool1D: _pool_rule,
+    nn.AvgPool2D: _pool_rule,
+    nn.AvgPool3D: _pool_rule,
+    nn.MaxPool1D: _pool_rule,
+    nn.MaxPool2D: _pool_rule,
+    nn.MaxPool3D: _pool_rule,
+    nn.AdaptiveAvgPool1D: _adaptive_pool_rule,
+    nn.AdaptiveAvgPool2D: _adaptive_pool_rule,
+    nn.AdaptiveAvgPool3D: _adaptive_pool_rule,
+    nn.AdaptiveMaxPool1D: _adaptive_pool_rule,
+    nn.AdaptiveMaxPool2D: _adaptive_pool_rule,
+    nn.AdaptiveMaxPool3D: _adaptive_pool_rule,
+}
+
+
+def _layer_signature(layer):
+    param_shapes = tuple(
+        tuple(p.shape) for p in layer.parameters(include_sublayers=False))
+    return layer.extra_repr(), param_shapes
+
+
+def _num_params(layer):
+    return int(
+        sum(
+            np.product(p.shape)
+            for p in layer.parameters(include_sublayers=False)))
+
+
+def shape_analysis(net, input_size, custom_rules=None, dtype='float32'):
+    """
+    Propagate the input shape through the layers of `net` by shape rules,
+    without creating any tensor or running the forward, and count the
+    parameters, FLOPs and activation memory of every layer.
+
+    Only `paddle.nn.Sequential` containers and the layers with a rule in
+    `shape_rules` or `custom_rules` are supported, since the forward of
+    other layers can not be analyzed without running it. The results of
+    the rules are cached by layer type, layer config and input shape, so
+    repeated blocks are analyzed once.
+
+    Args:
+        net (paddle.nn.Layer): The network to analyze.
+        input_size (list|tuple|InputSpec): The input shape, the dim of
+            batch size can be None or -1, which is taken as 1.
+        custom_rules (dict, optional): A dict which maps the layer type to a
+            function `rule(layer, input_shape)` returning the output shape
+            and FLOPs of the layer. Default is None.
+        dtype (str, optional): The dtype of activations. Default is 'float32'.
+
+    Returns:
+        Tuple: a list of rows `(layer name, input shape, output shape,
+        params, flops, activation bytes)` of the leaf layers, and a dict
+        with keys 'total_params', 'total_flops' and 'activation_bytes'.
+    """
+    if isinstance(input_size, InputSpec):
+        input_size = input_size.shape
+    shape = [1 if s is None or s == -1 else int(s) for s in input_size]
+    rules = dict(shape_rules)
+    if custom_rules is not None:
+        rules.update(custom_rules)
+    itemsize = np.dtype(dtype).itemsize
+
+    rows = []
+
+    def _analyze(layer, shape):
+        if isinstance(layer, nn.Sequential):
+            for sublayer in layer.children():
+                shape = _analyze(sublayer, shape)
+            return shape
+
+        rule = rules.get(type(layer), None)
+        if rule is None:
+            raise ValueError(
+                "Can't analyze the shape of {}, since it has no shape rule, "
+                "please provide one in custom_rules.".format(type(layer)))
+
+        key = (rule, type(layer), _layer_signature(layer), tuple(shape))
+        if key in _rule_cache:
+            out_shape, flops = _rule_cache[key]
+        else:
+            out_shape, flops = rule(layer, shape)
+            _rule_cache[key] = (list(out_shape), flops)
+
+        rows.append((layer.full_name(), list(shape), list(out_shape),
+                     _num_params(layer), int(flops),
+                     int(np.product(out_shape)) * itemsize))
+        return list(out_shape)
+
+    _analyze(net, shape)
+    total = {
+        'total_params': sum(r[3] for r in rows),
+        'total_flops': sum(r[4] for r in rows),
+        'activation_bytes': sum(r[5] for r in rows),
+    }
+    return rows, total
+
+
+def print_shape_analysis(rows, total, print_detail=False):
+    if print_detail:
+        table = Table([
+            "Layer Name", "Input Shape", "Output Shape", "Params", "Flops",
+            "Activation (MB)"
+        ])
+        for name, in_shape, out_shape, params, flops, act_bytes in rows:
+            table.add_row([
+                name, in_shape, out_shape, params, flops,
+                "%0.2f" % (act_bytes / (1024**2.))
+            ])
+        table.print_table()
+    print('Total Flops: {}     Total Params: {}     Activation (MB): {:.2f}'.
+          format(total['total_flops'], total['total_params'], total[
+              'activation_bytes'] / (1024**2.)))
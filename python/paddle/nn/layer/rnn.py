@@ -699,6 +699,104 @@ class GRUCell(RNNCellBase):
         return '{input_size}, {hidden_size}'.format(**self.__dict__)
 
 
+def _could_use_fused_rnn(inputs, sequence_length, kwargs):
+    # `rnn` op does not output the cell outputs at padded steps, which are
+    # kept by the step by step computation
+    return fluid.framework.in_dygraph_mode() and isinstance(
+        inputs, paddle.Tensor) and sequence_length is None and len(kwargs) == 0
+
+
+def _fused_rnn_mode(cell, inputs):
+    r"""
+    Returns the mode of the `rnn` op that computes `cell` over a whole
+    sequence, or None if `cell` is not a standard SimpleRNNCell, LSTMCell or
+    GRUCell, or the `rnn` op has no kernel for `inputs`.
+    """
+    # the `rnn` op never calls the cell, whose hooks, such as those of
+    # weight_norm and spectral_norm recomputing the weights, would be skipped
+    if cell._forward_pre_hooks or cell._forward_post_hooks:
+        return None
+    forward = type(cell).forward
+    if isinstance(cell, LSTMCell) and forward is LSTMCell.forward:
+        mode = "LSTM"
+    elif isinstance(cell, GRUCell) and forward is GRUCell.forward:
+        mode = "GRU"
+    elif isinstance(cell,
+                    SimpleRNNCell) and forward is SimpleRNNCell.forward:
+        mode = "RNN_" + cell.activation.upper()
+    else:
+        return None
+
+    if mode.startswith("RNN_"):
+        activation = paddle.tanh if cell.activation == "tanh" else F.relu
+        if cell._activation_fn is not activation:
+            return None
+    elif cell._gate_activation is not F.sigmoid or \
+            cell._activation is not paddle.tanh:
+        return None
+    if cell.bias_ih is None or cell.bias_hh is None:
+        return None
+
+    dtype = convert_dtype(inputs.dtype)
+    if inputs.place.is_cpu_place():
+        dtypes = ["float32", "float64"]
+    elif inputs.place.is_gpu_place():
+        dtypes = ["float32"]
+    else:
+        return None
+    if dtype not in dtypes or any(
+            convert_dtype(param.dtype) != dtype
+            for param in cell.parameters()):
+        return None
+    return mode
+
+
+def _fused_rnn(mode, cells, inputs, initial_states, time_major, is_reverse,
+               training, dropout_state):
+    r"""
+    Computes `cells` over the whole sequence with one `rnn` op, which is
+    bidirectional if there are two cells.
+    """
+    state_components = 2 if mode == "LSTM" else 1
+    if not time_major:
+        inputs = paddle.tensor.transpose(inputs, [1, 0, 2])
+    if is_reverse:
+        inputs = paddle.flip(inputs, axis=[0])
+
+    # all weights followed by all biases, see `RNNBase.flatten_parameters`
+    weights = [w for cell in cells for w in (cell.weight_ih, cell.weight_hh)]
+    weights += [b for cell in cells for b in (cell.bias_ih, cell.bias_hh)]
+    flat_states = [flatten(states) for states in initial_states]
+    pre_states = [
+        paddle.stack(
+            [states[i] for states in flat_states], axis=0)
+        for i in range(state_components)
+    ]
+
+    _, _, out, state = _C_ops.rnn(
+        inputs, pre_states, weights, None, dropout_state, state_components,
+        'dropout_prob', 0., 'is_bidirec', len(cells) == 2, 'input_size',
+        cells[0].input_size, 'hidden_size', cells[0].hidden_size,
+        'num_layers', 1, 'mode', mode, 'is_test', not training)
+
+    if is_reverse:
+        out = paddle.flip(out, axis=[0])
+    if not time_major:
+        out = paddle.tensor.transpose(out, [1, 0, 2])
+    final_states = [
+        tuple(s[i] for s in state) if state_components > 1 else state[0][i]
+        for i in range(len(cells))
+    ]
+    return out, final_states
+
+
+def _dropout_state(layer, holder):
+    if len(holder) == 0:
+        holder.append(
+            layer.create_variable(dtype=fluid.core.VarDesc.VarType.UINT8))
+    return holder[0]
+
+
 class RNN(Layer):
     r"""
     Wrapper for RNN, which creates a recurrent neural network with an RNN cell. 
@@ -728,6 +826,10 @@ class RNN(Layer):
         passed to the `forward` method, make sure that it satisfies the 
         requirements of the cell.
 
+        In dygraph mode, `SimpleRNNCell`, `LSTMCell` and `GRUCell` with biases
+        are computed over the whole sequence with one fused kernel, unless
+        `sequence_length` or `kwargs` is given.
+
     Examples:
 
         .. code-block:: python
@@ -757,12 +859,27 @@ class RNN(Layer):
             self.cell.call = self.cell.forward
         self.is_reverse = is_reverse
         self.time_major = time_major
+        # Wrap using a list to avoid registering it as a buffer
+        self._dropout_state = []
 
     def forward(self,
                 inputs,
                 initial_states=None,
                 sequence_length=None,
                 **kwargs):
+        mode = _fused_rnn_mode(
+            self.cell, inputs) if _could_use_fused_rnn(
+                inputs, sequence_length, kwargs) else None
+        if mode is not None:
+            if initial_states is None:
+                initial_states = self.cell.get_initial_states(
+                    batch_ref=inputs, batch_dim_idx=1 if self.time_major else 0)
+            outputs, final_states = _fused_rnn(
+                mode, [self.cell], inputs, [initial_states], self.time_major,
+                self.is_reverse, self.training,
+                _dropout_state(self, self._dropout_state))
+            return outputs, final_states[0]
+
         final_outputs, final_states = paddle.fluid.layers.rnn(
             self.cell,
             inputs,
@@ -837,6 +954,8 @@ class BiRNN(Layer):
                 # for non-dygraph mode, `rnn` api uses cell.call
                 cell.call = cell.forward
         self.time_major = time_major
+        # Wrap using a list to avoid registering it as a buffer
+        self._dropout_state = []
 
     def forward(self,
                 inputs,
@@ -847,6 +966,25 @@ class BiRNN(Layer):
             assert len(initial_states) == 2, \
                 "length of initial_states should be 2 when it is a list/tuple"
 
+        mode = _fused_rnn_mode(
+            self.cell_fw, inputs) if _could_use_fused_rnn(
+                inputs, sequence_length, kwargs) else None
+        if mode is not None and mode == _fused_rnn_mode(
+                self.cell_bw, inputs
+        ) and self.cell_fw.hidden_size == self.cell_bw.hidden_size:
+            if initial_states is None:
+                initial_states = [
+                    cell.get_initial_states(
+                        batch_ref=inputs,
+                        batch_dim_idx=1 if self.time_major else 0)
+                    for cell in [self.cell_fw, self.cell_bw]
+                ]
+            outputs, final_states = _fused_rnn(
+                mode, [self.cell_fw, self.cell_bw], inputs, initial_states,
+                self.time_major, False, self.training,
+                _dropout_state(self, self._dropout_state))
+            return outputs, tuple(final_states)
+
         outputs, final_states = paddle.fluid.layers.birnn(
             self.cell_fw, self.cell_bw, inputs, initial_states, sequence_length,
             self.time_major, **kwargs)
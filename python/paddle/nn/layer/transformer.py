@@ -151,6 +151,132 @@ class MultiHeadAttention(Layer):
     Cache = collections.namedtuple("Cache", ["k", "v"])
     StaticCache = collections.namedtuple("StaticCache", ["k", "v"])
 
+    class KVCache(object):
+        """
+        An incremental cache of keys and values for decoder self attention in
+        dygraph mode inference. Unlike `Cache`, whose tensors are concatenated
+        with the new keys and values at each decoding step, `KVCache` holds
+        them in buffers shaped `[batch_size, num_heads, capacity, head_dim]`
+        which are written in place and double when full, so that reading the
+        cached positions is a single slice.
+
+        Reordering the batch entries, as beam search does at each step, is
+        deferred: the reorders are composed into one index, by which the
+        buffers are gathered once before the next write or read.
+
+        Parameters:
+            batch_size (int): The number of entries in the cache.
+            num_heads (int): The number of heads in multi-head attention.
+            head_dim (int): The feature size of each head.
+            capacity (int, optional): The number of positions preallocated.
+                Default 64.
+            dtype (str, optional): The data type of keys and values. If None,
+                use the default data type. Default None.
+        """
+
+        def __init__(self,
+                     batch_size,
+                     num_heads,
+                     head_dim,
+                     capacity=64,
+                     dtype=None):
+            dtype = paddle.get_default_dtype() if dtype is None else dtype
+            shape = [batch_size, num_heads, capacity, head_dim]
+            self.k_buffer = paddle.zeros(shape, dtype=dtype)
+            self.v_buffer = paddle.zeros(shape, dtype=dtype)
+            self.batch_size = batch_size
+            self.length = 0
+            # entry i is the entry index[i] of buffers, None if not reordered
+            self._index = None
+
+        @property
+        def capacity(self):
+            return self.k_buffer.shape[2]
+
+        def memory_size(self):
+            """
+            Returns:
+                int: The number of bytes allocated by the cache.
+            """
+            return sum(
+                int(np.prod(x.shape)) * np.dtype(convert_dtype(x.dtype))
+                .itemsize for x in [self.k_buffer, self.v_buffer])
+
+        def _apply_reorder(self):
+            if self._index is not None:
+                self.k_buffer = tensor.gather(self.k_buffer, self._index)
+                self.v_buffer = tensor.gather(self.v_buffer, self._index)
+                self._index = None
+
+        def _grow(self):
+            self.k_buffer = tensor.concat(
+                [self.k_buffer, paddle.zeros_like(self.k_buffer)], axis=2)
+            self.v_buffer = tensor.concat(
+                [self.v_buffer, paddle.zeros_like(self.v_buffer)], axis=2)
+
+        def append(self, k, v):
+            """
+            Writes keys and values of new positions into the cache in place.
+
+            Parameters:
+                k (Tensor): The keys shaped `[batch_size, num_heads, length, head_dim]`.
+                v (Tensor): The values shaped `[batch_size, num_heads, length, head_dim]`.
+
+            Returns:
+                MultiHeadAttention.KVCache: The cache itself.
+            """
+            self._apply_reorder()
+            end = self.length + k.shape[2]
+            while end > self.capacity:
+                self._grow()
+            self.k_buffer[:, :, self.length:end] = k
+            self.v_buffer[:, :, self.length:end] = v
+            self.length = end
+            return self
+
+        def reorder(self, index):
+            """
+            Reorders the batch entries, making entry `i` be the former entry
+            `index[i]`. The keys and values are not copied until they are
+            read or written.
+
+            Parameters:
+                index (Tensor): An int64 tensor shaped `[batch_size]`.
+
+            Returns:
+                MultiHeadAttention.KVCache: The cache itself.
+            """
+            if self.length > 0:
+                self._index = index if self._index is None else \
+                    tensor.gather(self._index, index)
+            return self
+
+        def tile(self, repeat_times):
+            """
+            Returns a new cache repeating each batch entry `repeat_times`
+            times, as `BeamSearchDecoder` expands the entries to beams.
+            """
+            index = paddle.arange(
+                self.batch_size * repeat_times, dtype="int64") // repeat_times
+            if self._index is not None:
+                index = tensor.gather(self._index, index)
+            cache = copy.copy(self)
+            cache.batch_size = self.batch_size * repeat_times
+            cache.k_buffer = tensor.gather(self.k_buffer, index)
+            cache.v_buffer = tensor.gather(self.v_buffer, index)
+            cache._index = None
+            return cache
+
+        def keys_values(self):
+            """
+            Returns:
+                tuple: The keys and values of all cached positions, both \
+                    shaped `[batch_size, num_heads, length, head_dim]`.
+            """
+            self._apply_reorder()
+            return (self.k_buffer[:, :, :self.length],
+                    self.v_buffer[:, :, :self.length])
+
     def __init__(self,
                  embed_dim,
                  num_heads,
@@ -238,6 +364,9 @@ class MultiHeadAttention(Layer):
             k = tensor.concat([cache.k, k], axis=2)
             v = tensor.concat([cache.v, v], axis=2)
             cache = self.Cache(k, v)
+        elif isinstance(cache, self.KVCache):
+            # for decoder self-attention in inference, written in place
+            k, v = cache.append(k, v).keys_values()
 
         return (q, k, v) if cache is None else (q, k, v, cache)
 
@@ -273,11 +402,12 @@ class MultiHeadAttention(Layer):
         v = tensor.transpose(x=v, perm=[0, 2, 1, 3])
         return k, v
 
-    def gen_cache(self, key, value=None, type=Cache):
+    def gen_cache(self, key, value=None, type=Cache, max_length=None):
         """
         Generates cache for `forward` usage in inference accroding to arguments.
-        The generated cache is an instance of `MultiHeadAttention.Cache` or an
-        instance of `MultiHeadAttention.StaticCache`.
+        The generated cache is an instance of `MultiHeadAttention.Cache`, an
+        instance of `MultiHeadAttention.StaticCache` or an instance of
+        `MultiHeadAttention.KVCache`.
 
         `Cache` or `StaticCache` is namedtuple with `k` and `v` as fields,
         and it stores tensors shaped `[batch_size, num_heads, length, embed_dim]`
@@ -307,6 +437,10 @@ class MultiHeadAttention(Layer):
         3. If `type` is `Cache` and `value` is not None, use `key`, `value` to create
         an instance of `Cache`.
 
+        4. If `type` is `KVCache`, create an instance of `KVCache` with `max_length`
+        positions preallocated, and if `value` is not None, append `key`, `value`
+        to it as in 3.
+
         Parameters:
             key (Tensor): The keys for multi-head attention. It is
                 a tensor with shape `[batch_size, key_length, kdim]`. The
@@ -316,15 +450,27 @@ class MultiHeadAttention(Layer):
                 is a tensor with shape `[batch_size, value_length, vdim]`.
                 The data type should be float32 or float64. If None, `key` is only
                 for batch size reference. Default None.
-            type (type): It should be `MultiHeadAttention.StaticCache` or
-                `MultiHeadAttention.Cache` to indicate the cache type to generate.
+            type (type): It should be `MultiHeadAttention.StaticCache`,
+                `MultiHeadAttention.Cache` or `MultiHeadAttention.KVCache` to
+                indicate the cache type to generate.
+            max_length (int, optional): The number of positions preallocated
+                in `KVCache`. If None, use 64. Default None.
         
         Returns:
-            namedtuple: an instance of `Cache` or `StaticCache` accordingly.
+            namedtuple|KVCache: an instance of `Cache`, `StaticCache` or \
+                `KVCache` accordingly.
         """
         if type == MultiHeadAttention.StaticCache:  # static_kv
             k, v = self.compute_kv(key, value)
             return self.StaticCache(k, v)
+        elif type == MultiHeadAttention.KVCache:
+            cache = self.KVCache(
+                key.shape[0],
+                self.num_heads,
+                self.head_dim,
+                capacity=64 if max_length is None else max_length,
+                dtype=key.dtype)
+            return cache if value is None else cache.append(key, value)
         elif value is None:  # incremental_state
             k = layers.fill_constant_batch_size_like(
                 input=key,
@@ -378,8 +524,9 @@ class MultiHeadAttention(Layer):
                 `StaticCache`, `key` and `value` args would be ignored, `k` and
                 `v` fields would be used as calculated results on `key` and
                 `value`, which mostly used for decoder-encoder cross attention.
-                It is only used for inference and should be None for training.
-                Default None.
+                It can also be an instance of `KVCache`, which is used as `Cache`
+                but updated in place. It is only used for inference and should
+                be None for training. Default None.
 
         Returns:
             Tensor|tuple: It is a tensor that has the same shape and data type \
@@ -937,7 +1084,7 @@ class TransformerDecoderLayer(Layer):
         return tgt if cache is None else (tgt, (incremental_cache,
                                                 static_cache))
 
-    def gen_cache(self, memory):
+    def gen_cache(self, memory, max_length=None):
         r"""
         Generates cache for `forward` usage. The generated cache is a tuple
         composed of an instance of `MultiHeadAttention.Cache` and an instance
@@ -947,6 +1094,9 @@ class TransformerDecoderLayer(Layer):
             memory (Tensor): The output of Transformer encoder. It is a tensor
                 with shape `[batch_size, source_length, d_model]`. The data type
                 should be float32 or float64.
+            max_length (int, optional): If provided, `incremental_cache` is an
+                instance of `MultiHeadAttention.KVCache` with `max_length`
+                positions preallocated instead. Default None.
 
         Returns:
             tuple: It is a tuple( :code:`(incremental_cache, static_cache)` ). \
@@ -959,8 +1109,12 @@ class TransformerDecoderLayer(Layer):
                 See `MultiHeadAttention.gen_cache` and `MultiHeadAttention.forward` \
                 for more details.
         """
-        incremental_cache = self.self_attn.gen_cache(
-            memory, type=self.self_attn.Cache)
+        if max_length is None:
+            incremental_cache = self.self_attn.gen_cache(
+                memory, type=self.self_attn.Cache)
+        else:
+            incremental_cache = self.self_attn.gen_cache(
+                memory, type=self.self_attn.KVCache, max_length=max_length)
         static_cache = self.cross_attn.gen_cache(
             memory, memory, type=self.cross_attn.StaticCache)
         return incremental_cache, static_cache
@@ -1081,7 +1235,7 @@ class TransformerDecoder(Layer):
 
         return output if cache is None else (output, new_caches)
 
-    def gen_cache(self, memory, do_zip=False):
+    def gen_cache(self, memory, do_zip=False, max_length=None):
         r"""
         Generates cache for `forward` usage. The generated cache is a list, and
         each element in it is a tuple( :code:`(incremental_cache, static_cache)` )
@@ -1096,6 +1250,10 @@ class TransformerDecoder(Layer):
                 should be float32 or float64.
             do_zip (bool, optional): Indicate whether to apply `zip` on the tuples.
                 If True, return a list with two elements. Default False
+            max_length (int, optional): If provided, use `MultiHeadAttention.KVCache`
+                with `max_length` positions preallocated as incremental caches.
+                See `TransformerDecoderLayer.gen_cache` for more details.
+                Default None.
 
         Returns:
             list: It is a list, and each element in the list is a tuple produced \
@@ -1103,7 +1261,7 @@ class TransformerDecoder(Layer):
                 for more details. If `do_zip` is True, apply `zip` on these tuples \
                 and return a list with two elements.
         """
-        cache = [layer.gen_cache(memory) for layer in self.layers]
+        cache = [layer.gen_cache(memory, max_length) for layer in self.layers]
         if do_zip:
             cache = list(zip(*cache))
         return cache
@@ -92,6 +92,10 @@ class Adam(Optimizer):
             different semantics with the original Adam algorithm and may lead to different result.
             The default value is False.
         multi_precision (bool, optional): Whether to use multi-precision during weight updating. Default is false.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing dtype, place and
+            hyperparameters with one optimize op in dygraph mode. The parameters and their moments
+            are coalesced into contiguous tensors in the first step, and the parameters become
+            views of them. Default is False.
         name (str, optional): Normally there is no need for user to set this property.
             For more information, please refer to :ref:`api_guide_Name`.
             The default value is None.
@@ -161,6 +165,7 @@ class Adam(Optimizer):
     _moment2_acc_str = "moment2"
     _beta1_pow_acc_str = "beta1_pow_acc"
     _beta2_pow_acc_str = "beta2_pow_acc"
+    _multi_tensor_shared_acc_strs = (_beta1_pow_acc_str, _beta2_pow_acc_str)
 
     def __init__(self,
                  learning_rate=0.001,
@@ -172,6 +177,7 @@ class Adam(Optimizer):
                  grad_clip=None,
                  lazy_mode=False,
                  multi_precision=False,
+                 use_multi_tensor=False,
                  name=None):
         assert learning_rate is not None
         assert beta1 is not None
@@ -201,6 +207,7 @@ class Adam(Optimizer):
         self._epsilon = epsilon
         self._lazy_mode = lazy_mode
         self._multi_precision = multi_precision
+        self._use_multi_tensor = use_multi_tensor
         self._master_weights = {}
         self._default_dict = {
             'beta1': beta1,
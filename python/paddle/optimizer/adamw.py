@@ -84,6 +84,10 @@ class AdamW(Adam):
             different semantics with the original Adam algorithm and may lead to different result.
             The default value is False.
         multi_precision (bool, optional): Whether to use multi-precision during weight updating. Default is false.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing dtype, place and
+            hyperparameters with one optimize op in dygraph mode. The parameters and their moments
+            are coalesced into contiguous tensors in the first step, and the parameters become
+            views of them. Default is False.
         name (str, optional): Normally there is no need for user to set this property.
             For more information, please refer to :ref:`api_guide_Name`.
             The default value is None.
@@ -150,6 +154,7 @@ class AdamW(Adam):
                  grad_clip=None,
                  lazy_mode=False,
                  multi_precision=False,
+                 use_multi_tensor=False,
                  name=None):
         assert learning_rate is not None
         assert beta1 is not None
@@ -185,7 +190,8 @@ class AdamW(Adam):
             grad_clip=grad_clip,
             name=name,
             lazy_mode=lazy_mode,
-            multi_precision=multi_precision)
+            multi_precision=multi_precision,
+            use_multi_tensor=use_multi_tensor)
         self._default_dict = {'coeff': coeff}
 
         self.type = "adamw"
@@ -260,11 +266,14 @@ class AdamW(Adam):
         if isinstance(param_and_grad, dict):
             param_and_grad = self._update_param_group(param_and_grad)
         param, grad = param_and_grad
+        # The first parameter stands for a multi-tensor group, since they
+        # have the same decay settings.
+        origin_param = self._get_multi_tensor_origin(param)
 
         # Whether we should do weight decay for the parameter.
         with_decay = True
         if self._apply_decay_param_fun is not None \
-                and not self._apply_decay_param_fun(param.name):
+                and not self._apply_decay_param_fun(origin_param.name):
             with_decay = False
 
         moment1 = self._get_accumulator(self._moment1_acc_str,
@@ -284,7 +293,7 @@ class AdamW(Adam):
         # create the adamw optimize op
         if framework.in_dygraph_mode():
             lr_ratio_ = 1. if self._lr_ratio is None else self._lr_ratio(
-                param_and_grad[0])
+                origin_param)
 
             _beta1 = self._beta1 if not isinstance(
                 self._beta1, Variable) else self._beta1.numpy().item(0)
@@ -361,6 +370,12 @@ class AdamW(Adam):
 
         return adamw_op
 
+    def _multi_tensor_key(self, param):
+        with_decay = self._apply_decay_param_fun is None or \
+                self._apply_decay_param_fun(param.name)
+        lr_ratio = 1. if self._lr_ratio is None else self._lr_ratio(param)
+        return (with_decay, lr_ratio)
+
     def _create_optimization_pass(self, parameters_and_grads):
         optimize_ops = super(
             AdamW, self)._create_optimization_pass(parameters_and_grads)
@@ -72,6 +72,10 @@ class Momentum(Optimizer):
             ( :ref:`api_fluid_clip_GradientClipByGlobalNorm` , :ref:`api_fluid_clip_GradientClipByNorm` ,
             :ref:`api_fluid_clip_GradientClipByValue` ). Default None, meaning there is no gradient clipping.
         multi_precision (bool, optional): Whether to use multi-precision during weight updating. Default is false.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing dtype, place and
+            hyperparameters with one optimize op in dygraph mode. The parameters and their velocities
+            are coalesced into contiguous tensors in the first step, and the parameters become
+            views of them. Default is False.
         rescale_grad (float, optional): Multiply the gradient with `rescale_grad` before updating. \
             Often choose to be ``1.0/batch_size``.
         name (str, optional): The default value is None. Normally there is no need for user
@@ -129,6 +133,7 @@ class Momentum(Optimizer):
                  grad_clip=None,
                  multi_precision=False,
                  rescale_grad=1.0,
+                 use_multi_tensor=False,
                  name=None):
         if learning_rate is None:
             raise ValueError("learning_rate is not set")
@@ -161,6 +166,7 @@ class Momentum(Optimizer):
             weight_decay)
         self._multi_precision = multi_precision
         self._rescale_grad = rescale_grad
+        self._use_multi_tensor = use_multi_tensor
         self._master_weights = {}
 
         self._default_dict = {
@@ -17,7 +17,7 @@ from __future__ import print_function
 import numpy as np
 import six
 import logging
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 import paddle
 from paddle.fluid.distribute_lookup_table import find_distributed_lookup_table
@@ -34,6 +34,7 @@ from ..fluid.layer_helper import LayerHelper
 from ..fluid.layers import ops
 from ..fluid.dygraph import base as imperative_base
 from ..fluid.dygraph import no_grad
+from ..fluid.dygraph.layers import _clear_gradients
 from paddle.fluid import core
 from paddle.fluid.layers import tensor
 from functools import reduce
@@ -46,6 +47,27 @@ from paddle import _C_ops
 __all__ = []
 
 
+class _MultiTensorGroup(object):
+    """
+    The parameters updated by one optimize op in multi-tensor mode. The
+    parameters are views of flat_param, and their accumulators are views of
+    the accumulators of flat_param, except the shared accumulators.
+    """
+
+    def __init__(self, params, flat_param, flat_grad):
+        self.params = params
+        self.flat_param = flat_param
+        self.flat_grad = flat_grad
+        # The gradients are copied into flat_grad through these views, so
+        # that the gradients of the parameters are not rebound.
+        self.grad_views = [
+            framework._varbase_creator(dtype=flat_grad.dtype) for _ in params
+        ]
+        # {accumulator name : accumulators of params}, the accumulator of
+        # the first parameter is used by the whole group.
+        self.shared_accumulators = dict()
+
+
 class Optimizer(object):
     r"""Optimizer Base class.
 
@@ -120,6 +142,11 @@ class Optimizer(object):
 
     """
 
+    # Accumulators which hold one value for all the elements of a parameter,
+    # such as beta1_pow_acc of Adam. They are shared by a multi-tensor group
+    # instead of being coalesced.
+    _multi_tensor_shared_acc_strs = ()
+
     @imperative_base.no_grad
     def __init__(self,
                  learning_rate,
@@ -204,6 +231,13 @@ class Optimizer(object):
         self._opti_name_list = []
         self._accumulators_holder = {}
         self._param_device_map = dict()
+        # Multi-tensor mode is enabled by the subclasses which support it,
+        # see _append_multi_tensor_optimize_ops.
+        self._use_multi_tensor = False
+        # {tuple of parameter names : _MultiTensorGroup}
+        self._multi_tensor_groups = dict()
+        # {parameter name : key of the group the parameter belongs to}
+        self._multi_tensor_param_keys = dict()
         self.clear_gradients = self.clear_grad
         self._default_dict = {
             'weight_decay': self.regularization,
@@ -240,8 +274,14 @@ class Optimizer(object):
 
         '''
         state_dict = {}
+        fused_param_names = set()
+        for group in self._multi_tensor_groups.values():
+            self._sync_multi_tensor_group(group)
+            fused_param_names.add(group.flat_param.name)
         for k, v in self._accumulators.items():
             for para_name, var_tmp in v.items():
+                if para_name in fused_param_names:
+                    continue
                 state_dict[var_tmp.name] = var_tmp
         # global step if use lr decay
         if isinstance(self._learning_rate, LRScheduler):
@@ -292,6 +332,9 @@ class Optimizer(object):
         if "LR_Scheduler" in state_dict:
             state_dict.pop("LR_Scheduler")
         self._accumulators_holder = state_dict
+        # The groups are coalesced again from the loaded tensors in next step.
+        for key in list(self._multi_tensor_groups.keys()):
+            self._remove_multi_tensor_group(key)
         for k, v in self._accumulators.items():
             for para_name, var_tmp in v.items():
                 assert var_tmp.name in state_dict, \
@@ -688,7 +731,10 @@ class Optimizer(object):
 
         if framework.in_dygraph_mode():
 
-            if isinstance(parameters_and_grads, list):
+            if self._use_multi_tensor:
+                self._append_multi_tensor_optimize_ops(target_block,
+                                                       parameters_and_grads)
+            elif isinstance(parameters_and_grads, list):
                 for param_and_grad in parameters_and_grads:
                     if param_and_grad[1] is None:
                         continue
@@ -727,6 +773,236 @@ class Optimizer(object):
         end = len(target_block.ops)
         return target_block._slice_ops(start, end)
 
+    def _multi_tensor_key(self, param):
+        """
+        Returns the hyperparameters of param which must be the same for the
+        parameters updated by one optimize op. Used by subclasses whose
+        update depends on the parameter.
+        """
+        return ()
+
+    def _get_multi_tensor_key(self, param, grad):
+        # Returns None if param can not be updated together with others.
+        if grad._is_sparse() or grad.dtype != param.dtype:
+            return None
+        if param.dtype not in (core.VarDesc.VarType.FP32,
+                               core.VarDesc.VarType.FP64,
+                               core.VarDesc.VarType.FP16):
+            return None
+        if param.dtype == core.VarDesc.VarType.FP16:
+            # coalesce_tensor has no float16 kernel on CPU
+            if getattr(self, '_multi_precision',
+                       False) or not param.place.is_gpu_place():
+                return None
+        if not param.place._equals(framework._current_expected_place()):
+            return None
+
+        param_lr = 1.0
+        if hasattr(param, 'optimize_attr'):
+            param_lr = param.optimize_attr['learning_rate']
+            if isinstance(param_lr, Variable):
+                return None
+        regularizer = getattr(param, 'regularizer', None)
+        # The parameters flattened by Layer.flatten_parameters are only
+        # grouped with the parameters of the same storage.
+        flat_storage = getattr(param, '_flat_storage', None)
+        return (param.dtype, param_lr, type(regularizer), getattr(
+            regularizer, '_regularization_coeff', None), id(flat_storage)
+                ) + tuple(self._multi_tensor_key(param))
+
+    def _get_multi_tensor_origin(self, param):
+        """
+        Returns the first parameter of the group if param is the flat
+        parameter of a multi-tensor group, otherwise returns param.
+        """
+        key = self._multi_tensor_param_keys.get(param.name)
+        if key is None or self._multi_tensor_groups[
+                key].flat_param is not param:
+            return param
+        return self._multi_tensor_groups[key].params[0]
+
+    @staticmethod
+    def _coalesce_tensors(inputs, outputs, fused_output):
+        framework._dygraph_tracer().trace_op(
+            type='coalesce_tensor',
+            inputs={'Input': inputs},
+            outputs={'Output': outputs,
+                     'FusedOutput': fused_output},
+            attrs={
+                'copy_data': True,
+                'use_align': False,
+                'dtype': inputs[0].dtype
+            },
+            stop_gradient=True)
+
+    def _get_multi_tensor_group(self, params):
+        # Returns None if params can not be coalesced.
+        key = tuple(param.name for param in params)
+        group = self._multi_tensor_groups.get(key, None)
+        if group is not None:
+            return group
+
+        first_param = params[0]
+        flat_storage = getattr(first_param, '_flat_storage', None)
+        if flat_storage is not None and (
+                len(flat_storage.params) != len(params) or
+                any(p1 is not p2
+                    for p1, p2 in zip(flat_storage.params, params))):
+            # coalescing would take the parameters out of their storage
+            return None
+
+        # A parameter can only be a view of one flat parameter, so the groups
+        # changed by the new one are dropped.
+        for param in params:
+            if param.name in self._multi_tensor_param_keys:
+                self._remove_multi_tensor_group(
+                    self._multi_tensor_param_keys[param.name])
+
+        # The parameters updated apart before, e.g. while the others were
+        # frozen, could not share the accumulators.
+        shared_acc_strs = set(
+            name if self._name is None else self._name + "_" + name
+            for name in self._multi_tensor_shared_acc_strs)
+        for name, accumulators in self._accumulators.items():
+            if name not in shared_acc_strs or \
+                    first_param.name not in accumulators:
+                continue
+            value = accumulators[first_param.name].numpy()
+            if any(not np.array_equal(accumulators[param.name].numpy(), value)
+                   for param in params[1:]):
+                return None
+
+        optimize_attr = getattr(first_param, 'optimize_attr',
+                                {'learning_rate': 1.0})
+        regularizer = getattr(first_param, 'regularizer', None)
+        if flat_storage is not None:
+            flat_param = flat_storage.flat_param
+            flat_param.optimize_attr = optimize_attr
+            flat_param.regularizer = regularizer
+        else:
+            numel = sum(int(np.prod(param.shape)) for param in params)
+            flat_param = framework.ParamBase(
+                shape=[numel],
+                dtype=first_param.dtype,
+                name=unique_name.generate(first_param.name + "_multi_tensor"),
+                optimize_attr=optimize_attr,
+                regularizer=regularizer)
+            self._coalesce_tensors(params, params, flat_param)
+        flat_grad = framework._varbase_creator(
+            name=unique_name.generate(flat_param.name + "_grad"),
+            dtype=first_param.dtype,
+            persistable=True)
+
+        group = _MultiTensorGroup(params, flat_param, flat_grad)
+        for name, accumulators in self._accumulators.items():
+            if first_param.name not in accumulators:
+                continue
+            param_accs = [accumulators[param.name] for param in params]
+            if name in shared_acc_strs:
+                flat_acc = param_accs[0]
+                group.shared_accumulators[name] = param_accs
+            else:
+                flat_acc = framework._varbase_creator(
+                    name=unique_name.generate(flat_param.name + "_" + name),
+                    dtype=param_accs[0].dtype,
+                    persistable=True)
+                self._coalesce_tensors(param_accs, param_accs, flat_acc)
+            accumulators[flat_param.name] = flat_acc
+
+        self._multi_tensor_groups[key] = group
+        for param in params:
+            self._multi_tensor_param_keys[param.name] = key
+        self._multi_tensor_param_keys[flat_param.name] = key
+        return group
+
+    def _sync_multi_tensor_group(self, group):
+        # Only the shared accumulators of the first parameter are updated in
+        # multi-tensor mode, the others get their values here.
+        for param_accs in group.shared_accumulators.values():
+            for acc in param_accs[1:]:
+                acc.set_value(param_accs[0])
+
+    def _remove_multi_tensor_group(self, key):
+        group = self._multi_tensor_groups.pop(key)
+        self._sync_multi_tensor_group(group)
+        for accumulators in self._accumulators.values():
+            accumulators.pop(group.flat_param.name, None)
+        for param in group.params:
+            self._multi_tensor_param_keys.pop(param.name, None)
+        self._multi_tensor_param_keys.pop(group.flat_param.name, None)
+
+    def _append_multi_tensor_optimize_ops(self, target_block,
+                                          parameters_and_grads):
+        """
+        Updates the parameters with one optimize op for each group of
+        parameters sharing dtype, place and hyperparameters. Only used in
+        dygraph mode.
+
+        The parameters of a group and their accumulators are coalesced into
+        flat tensors the first time the group is updated, and the parameters
+        become views of the flat tensors. The parameters flattened by
+        Layer.flatten_parameters already are, and the optimize op takes
+        their flat gradient directly while the gradients are still its views.
+        Otherwise the gradients are copied into a flat gradient in each step.
+        A parameter updated alone, e.g. while the others of its group are
+        frozen, leaves the group.
+        """
+        options = None
+        if isinstance(parameters_and_grads, dict):
+            options = {
+                k: v
+                for k, v in parameters_and_grads.items() if k != 'params'
+            }
+            parameters_and_grads = parameters_and_grads['params']
+
+        def _append_optimize_op(param_and_grad):
+            if options is None:
+                self._append_optimize_op(target_block, param_and_grad)
+            else:
+                param_grad_dict = dict(options)
+                param_grad_dict['params'] = param_and_grad
+                self._append_optimize_op(target_block, param_grad_dict)
+
+        def _append_single_optimize_op(param_and_grad):
+            # The shared accumulators of a group are only updated for its
+            # first parameter, so the group of a parameter updated alone is
+            # dropped, which gives the others their values.
+            key = self._multi_tensor_param_keys.get(param_and_grad[0].name)
+            if key is not None:
+                self._remove_multi_tensor_group(key)
+            _append_optimize_op(param_and_grad)
+
+        params_grads_groups = OrderedDict()
+        for param, grad in parameters_and_grads:
+            if grad is None or param.stop_gradient:
+                continue
+            key = self._get_multi_tensor_key(param, grad)
+            if key is None:
+                _append_single_optimize_op((param, grad))
+            else:
+                params_grads_groups.setdefault(key, []).append((param, grad))
+
+        for params_grads in params_grads_groups.values():
+            if len(params_grads) == 1:
+                _append_single_optimize_op(params_grads[0])
+                continue
+            group = self._get_multi_tensor_group(
+                [param for param, _ in params_grads])
+            if group is None:
+                for param_and_grad in params_grads:
+                    _append_single_optimize_op(param_and_grad)
+                continue
+            grads = [grad for _, grad in params_grads]
+            flat_storage = getattr(group.params[0], '_flat_storage', None)
+            if flat_storage is not None and \
+                    flat_storage.flat_param is group.flat_param and \
+                    flat_storage.holds_grads(grads):
+                # the gradients are views of the flat gradient of the storage
+                _append_optimize_op((group.flat_param, flat_storage.flat_grad))
+                continue
+            self._coalesce_tensors(grads, group.grad_views, group.flat_grad)
+            _append_optimize_op((group.flat_param, group.flat_grad))
+
     def _append_dgc_ops(self, param_and_grad):
         pass
 
@@ -1021,16 +1297,18 @@ class Optimizer(object):
                 adam.clear_grad()
 
         """
+        params = []
         if self._parameter_list is None or not isinstance(
                 self._parameter_list[0], dict):
             for p in self._parameter_list:
                 if not p.stop_gradient:
-                    p.clear_gradient()
+                    params.append(p)
         else:
             for param_group in self._param_groups:
                 for p in param_group['params']:
                     if not p.stop_gradient:
-                        p.clear_gradient()
+                        params.append(p)
+        _clear_gradients(params)
 
     @imperative_base.no_grad
     def minimize(self,
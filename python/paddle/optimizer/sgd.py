@@ -47,6 +47,9 @@ class SGD(Optimizer):
             some derived class of ``GradientClipBase`` . There are three cliping strategies
             ( :ref:`api_fluid_clip_GradientClipByGlobalNorm` , :ref:`api_fluid_clip_GradientClipByNorm` ,
             :ref:`api_fluid_clip_GradientClipByValue` ). Default None, meaning there is no gradient clipping.
+        use_multi_tensor (bool, optional): Whether to update the parameters sharing dtype, place and
+            learning rate with one optimize op in dygraph mode. The parameters are coalesced into
+            contiguous tensors in the first step, and become views of them. Default is False.
         name (str, optional): The default value is None. Normally there is no need for user
                 to set this property. For more information, please refer to
                 :ref:`api_guide_Name` . 
@@ -75,6 +78,7 @@ class SGD(Optimizer):
                  parameters=None,
                  weight_decay=None,
                  grad_clip=None,
+                 use_multi_tensor=False,
                  name=None):
         if learning_rate is None:
             raise ValueError("learning_rate is not set")
@@ -85,6 +89,7 @@ class SGD(Optimizer):
             grad_clip=grad_clip,
             name=name)
         self.type = "sgd"
+        self._use_multi_tensor = use_multi_tensor
 
     @no_grad
     def _append_optimize_op(self, block, param_and_grad):
@@ -654,7 +654,8 @@ def deserialize_persistables(program, data, executor):
             continue
         var_tmp = paddle.fluid.global_scope().find_var(var.name)
         assert var_tmp != None, "can't not find var: " + var.name
-        new_shape = (np.array(var_tmp.get_tensor())).shape
+        # read dims from the tensor meta rather than copying its data
+        new_shape = tuple(var_tmp.get_tensor().shape())
         assert var.name in origin_shape_map, var.name + " MUST in var list."
         origin_shape = origin_shape_map.get(var.name)
         if new_shape != origin_shape:
@@ -719,6 +719,40 @@ class TestModelFunction(unittest.TestCase):
             custom_ops={paddle.nn.Dropout: customize_dropout},
             print_detail=True)
 
+    def test_symbolic_flops(self):
+        paddle.disable_static()
+        net = paddle.nn.Sequential(
+            paddle.nn.Conv2D(
+                1, 6, 3, stride=1, padding=1),
+            paddle.nn.ReLU(),
+            paddle.nn.MaxPool2D(2, 2),
+            paddle.nn.Conv2D(
+                6, 16, 5, stride=1, padding=0),
+            paddle.nn.BatchNorm2D(16),
+            paddle.nn.AvgPool2D(2, 2),
+            paddle.nn.Flatten(),
+            paddle.nn.Linear(400, 120), paddle.nn.Linear(120, 10))
+
+        dynamic = paddle.flops(net, [1, 1, 28, 28])
+        symbolic = paddle.flops(
+            net, [1, 1, 28, 28], print_detail=True, symbolic=True)
+        self.assertEqual(dynamic, symbolic)
+
+        params_info = paddle.summary(net, (None, 1, 28, 28), symbolic=True)
+        gt_params = sum(np.prod(p.shape) for p in net.parameters())
+        self.assertEqual(params_info['total_params'], gt_params)
+        params_info = paddle.summary(
+            net, (None, 1, 28, 28), dtypes=['float32'], symbolic=True)
+        self.assertEqual(params_info['total_params'], gt_params)
+
+        with self.assertRaises(ValueError):
+            paddle.summary(
+                net, (None, 1, 28, 28),
+                dtypes=['float32', 'float32'],
+                symbolic=True)
+        with self.assertRaises(ValueError):
+            paddle.flops(MyModel(), [1, 20], symbolic=True)
+
     def test_export_deploy_model(self):
         self.set_seed()
         np.random.seed(201)
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
+import paddle
 from ..nn import Layer
 from ..fluid.framework import core, in_dygraph_mode
 from ..fluid.layer_helper import LayerHelper
@@ -19,11 +22,90 @@ from ..fluid.data_feeder import check_variable_and_dtype, check_type
 
 __all__ = ['viterbi_decode', 'ViterbiDecoder']
 
+# the score of transitions not allowed, as in BeamSearchDecoder
+_DISALLOWED_SCORE = -1e9
+
+
+def _k_best_viterbi_decode(potentials, transition_params, lengths,
+                           include_bos_eos_tag, top_k):
+    # The sequences are sorted by length in descending order, thus the ones
+    # still being decoded at each step are a prefix of the batch, and only the
+    # prefix is computed. The backtrace is done for all of them at once.
+    batch_size, _, num_tags = potentials.shape
+    lengths = lengths.numpy()
+    order = np.argsort(-lengths, kind='stable')
+    max_len = int(lengths.max())
+    # num_active[t] is the number of sequences longer than t
+    num_active = [int(np.sum(lengths > t)) for t in range(max_len)] + [0]
+    potentials = paddle.transpose(
+        paddle.gather(potentials, paddle.to_tensor(order)), [1, 0, 2])
+    start_trans = paddle.unsqueeze(transition_params[-1], [1])
+    stop_trans = paddle.unsqueeze(transition_params[-2], [1])
+    # broadcasted to scores shaped [batch_size, num_tags, top_k, num_tags]
+    trans = paddle.unsqueeze(transition_params, [1])
+
+    # alpha[i, j, k] is the score of the k-th best path ending with tag j
+    alpha = paddle.unsqueeze(potentials[0], [2])
+    if include_bos_eos_tag:
+        alpha = alpha + start_trans
+    if top_k > 1:
+        alpha = paddle.concat(
+            [
+                alpha, paddle.full([batch_size, num_tags, top_k - 1],
+                                   _DISALLOWED_SCORE, alpha.dtype)
+            ],
+            axis=2)
+    histories, final_scores, final_ids = [], [], []
+    for t in range(max_len):
+        num, end = num_active[t], num_active[t + 1]
+        if t > 0:
+            scores = paddle.unsqueeze(alpha[:num], [3]) + trans
+            scores = paddle.transpose(
+                paddle.reshape(scores, [num, num_tags * top_k, num_tags]),
+                [0, 2, 1])
+            alpha, history = paddle.topk(scores, top_k, axis=2)
+            alpha = alpha + paddle.unsqueeze(potentials[t, :num], [2])
+            histories.append(history)
+        if end < num:
+            final = alpha[end:num]
+            if include_bos_eos_tag:
+                final = final + stop_trans
+            scores, ids = paddle.topk(
+                paddle.reshape(final, [num - end, num_tags * top_k]), top_k)
+            final_scores.append(scores)
+            final_ids.append(ids)
+
+    paths = []
+    for t in reversed(range(max_len)):
+        num, end = num_active[t], num_active[t + 1]
+        if end < num:
+            ids = final_ids.pop()
+            tags = ids // top_k if end == 0 else paddle.concat(
+                [tags, ids // top_k])
+            ks = ids % top_k if end == 0 else paddle.concat([ks, ids % top_k])
+        paths.append(tags if num == batch_size else paddle.concat(
+            [tags, paddle.zeros([batch_size - num, top_k], 'int64')]))
+        if t > 0:
+            index = paddle.unsqueeze(paddle.arange(num, dtype='int64'), [1])
+            index = (index * num_tags + tags) * top_k + ks
+            ids = paddle.gather(
+                paddle.reshape(histories[t - 1], [-1]),
+                paddle.reshape(index, [-1]))
+            ids = paddle.reshape(ids, [num, top_k])
+            tags, ks = ids // top_k, ids % top_k
+
+    inverse = paddle.to_tensor(np.argsort(order))
+    scores = paddle.gather(paddle.concat(final_scores[::-1]), inverse)
+    paths = paddle.gather(paddle.stack(paths[::-1], axis=2), inverse)
+    return scores, paths
+
 
 def viterbi_decode(potentials,
                    transition_params,
                    lengths,
                    include_bos_eos_tag=True,
+                   top_k=1,
+                   allowed_transitions=None,
                    name=None):
     """
     Decode the highest scoring sequence of tags computed by transitions and potentials and get the viterbi path.
@@ -36,14 +118,18 @@ def viterbi_decode(potentials,
         lengths (Tensor):  The input tensor of length of each sequence. This is a 1-D tensor with shape of [batch_size]. The data type is int64. 
         include_bos_eos_tag (`bool`, optional): If set to True, the last row and the last column of transitions will be considered
             as start tag, the second to last row and the second to last column of transitions will be considered as stop tag. Defaults to ``True``.
+        top_k (int, optional): The number of highest scoring sequences to decode. If greater than 1, the sequences are decoded
+            in dygraph mode, where only the sequences not ended are computed at each step. Defaults to 1.
+        allowed_transitions (Tensor, optional): A 2-D bool tensor with shape of [num_tags, num_tags]. If provided, the transitions
+            with `False` values are not allowed in the decoded sequences. Defaults to None.
         name (str, optional): The default value is None. Normally there is no need for user to set this property. For more information, please
             refer to :ref:`api_guide_Name`.
 
     Returns:
         scores(Tensor): The output tensor containing the score for the Viterbi sequence. The shape is [batch_size]
-            and the data type is float32 or float64.
+            and the data type is float32 or float64. If `top_k` is greater than 1, the shape is [batch_size, top_k].
         paths(Tensor): The output tensor containing the highest scoring tag indices.  The shape is [batch_size, sequence_length]
-            and  the data type is int64.
+            and  the data type is int64. If `top_k` is greater than 1, the shape is [batch_size, top_k, sequence_length].
 
     Example:
         .. code-block:: python
@@ -57,6 +143,16 @@ def viterbi_decode(potentials,
             transition = paddle.rand((num_tags, num_tags), dtype='float32')
             scores, path = paddle.text.viterbi_decode(emission, transition, length, False) # scores: [3.37089300, 1.56825531], path: [[1, 0, 0], [1, 1, 0]]
     """
+    if allowed_transitions is not None:
+        transition_params = paddle.where(
+            allowed_transitions, transition_params,
+            paddle.full_like(transition_params, _DISALLOWED_SCORE))
+    if top_k > 1:
+        if not in_dygraph_mode():
+            raise ValueError(
+                "viterbi_decode only supports top_k > 1 in dygraph mode.")
+        return _k_best_viterbi_decode(potentials, transition_params, lengths,
+                                      include_bos_eos_tag, top_k)
     if in_dygraph_mode():
         return core.ops.viterbi_decode(potentials, transition_params, lengths,
                                        'include_bos_eos_tag',
@@ -92,6 +188,9 @@ class ViterbiDecoder(Layer):
         transitions (`Tensor`): The transition matrix.  Its dtype is float32 and has a shape of `[num_tags, num_tags]`.
         include_bos_eos_tag (`bool`, optional): If set to True, the last row and the last column of transitions will be considered
             as start tag, the second to last row and the second to last column of transitions will be considered as stop tag. Defaults to ``True``.
+        top_k (int, optional): The number of highest scoring sequences to decode. Defaults to 1.
+        allowed_transitions (Tensor, optional): A 2-D bool tensor with shape of [num_tags, num_tags]. If provided, the transitions
+            with `False` values are not allowed in the decoded sequences. Defaults to None.
         name (str, optional): The default value is None. Normally there is no need for user to set this property. For more information, please
             refer to :ref:`api_guide_Name`.
 
@@ -103,9 +202,9 @@ class ViterbiDecoder(Layer):
 
     Returns:
         scores(Tensor): The output tensor containing the score for the Viterbi sequence. The shape is [batch_size]
-            and the data type is float32 or float64.
+            and the data type is float32 or float64. If `top_k` is greater than 1, the shape is [batch_size, top_k].
         paths(Tensor): The output tensor containing the highest scoring tag indices.  The shape is [batch_size, sequence_length]
-            and the data type is int64.
+            and the data type is int64. If `top_k` is greater than 1, the shape is [batch_size, top_k, sequence_length].
 
     Example:
         .. code-block:: python
@@ -121,12 +220,20 @@ class ViterbiDecoder(Layer):
             scores, path = decoder(emission, length) # scores: [3.37089300, 1.56825531], path: [[1, 0, 0], [1, 1, 0]]
     """
 
-    def __init__(self, transitions, include_bos_eos_tag=True, name=None):
+    def __init__(self,
+                 transitions,
+                 include_bos_eos_tag=True,
+                 top_k=1,
+                 allowed_transitions=None,
+                 name=None):
         super(ViterbiDecoder, self).__init__()
         self.transitions = transitions
         self.include_bos_eos_tag = include_bos_eos_tag
+        self.top_k = top_k
+        self.allowed_transitions = allowed_transitions
         self.name = name
 
     def forward(self, potentials, lengths):
         return viterbi_decode(potentials, self.transitions, lengths,
-                              self.include_bos_eos_tag, self.name)
+                              self.include_bos_eos_tag, self.top_k,
+                              self.allowed_transitions, self.name)